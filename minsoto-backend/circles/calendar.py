@@ -0,0 +1,64 @@
+# circles/calendar.py
+from datetime import date, timedelta
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from .models import HabitEntry
+
+
+def get_calendar_days(request):
+    """Window length requested with ?days=, limited to HABIT_CALENDAR_WINDOWS"""
+    days = settings.HABIT_CALENDAR_WINDOWS[0]
+    if request is not None and 'days' in request.query_params:
+        try:
+            days = int(request.query_params['days'])
+        except ValueError:
+            days = None
+        if days not in settings.HABIT_CALENDAR_WINDOWS:
+            raise ValidationError({'days': f'Must be one of {list(settings.HABIT_CALENDAR_WINDOWS)}'})
+    return days
+
+
+def build_habit_calendars(habit_ids, days, end_date=None):
+    """Completion calendars for many habits with a single query.
+
+    Each calendar covers the `days` days ending at end_date (today by
+    default) as a string of '0'/'1' flags, oldest first, so a year of data
+    is 365 bytes instead of a dict of 365 date keys.
+    """
+    start_date, end_date = _calendar_window(days, end_date)
+    entries = _completed_entries(habit_ids, start_date, end_date)
+    return _render_calendars(habit_ids, days, start_date, entries)
+
+
+async def abuild_habit_calendars(habit_ids, days, end_date=None):
+    """build_habit_calendars on the async ORM"""
+    start_date, end_date = _calendar_window(days, end_date)
+    # Iterated whole rather than with aiterator(): values_list() iterables
+    # run their query eagerly, which aiterator() does not expect
+    entries = [entry async for entry in _completed_entries(habit_ids, start_date, end_date)]
+    return _render_calendars(habit_ids, days, start_date, entries)
+
+
+def _calendar_window(days, end_date):
+    end_date = end_date or date.today()
+    return end_date - timedelta(days=days - 1), end_date
+
+
+def _completed_entries(habit_ids, start_date, end_date):
+    return HabitEntry.objects.filter(
+        habit_id__in=habit_ids,
+        date__gte=start_date,
+        date__lte=end_date,
+        completed=True
+    ).values_list('habit_id', 'date')
+
+
+def _render_calendars(habit_ids, days, start_date, entries):
+    flags = {habit_id: bytearray(b'0' * days) for habit_id in habit_ids}
+    for habit_id, day in entries:
+        flags[habit_id][(day - start_date).days] = ord('1')
+
+    return {
+        habit_id: {'start': start_date.isoformat(), 'days': days, 'completed': bits.decode('ascii')}
+        for habit_id, bits in flags.items()
+    }
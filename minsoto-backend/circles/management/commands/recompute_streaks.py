@@ -0,0 +1,28 @@
+# circles/management/commands/recompute_streaks.py
+from django.core.management.base import BaseCommand
+from circles.models import Habit
+from circles.streaks import recompute_streaks
+
+class Command(BaseCommand):
+    help = ('Rebuild current streaks for every habit from its entries. Best streaks are '
+            'records and only ever grow, unless --reset-best takes them from the entries alone.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--reset-best', action='store_true',
+                            help='Set best_streak to the longest run left in the entries, even if lower')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        count = 0
+
+        while True:
+            habits = list(Habit.objects.filter(pk__gt=last_id).order_by('pk')[:batch_size])
+            if not habits:
+                break
+            recompute_streaks(habits, reset_best=options['reset_best'])
+            count += len(habits)
+            last_id = habits[-1].pk
+
+        self.stdout.write(self.style.SUCCESS(f'Recomputed streaks for {count} habits'))
@@ -0,0 +1,96 @@
+# circles/management/commands/stress_circle_joins.py
+import threading
+import uuid
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from circles.models import Circle, CircleFull, CircleMembership
+from users.models import CustomUser
+
+class Command(BaseCommand):
+    help = ('Race many concurrent joins and leaves against one circle and check that '
+            'member_count never exceeds max_members or drifts from the memberships. '
+            'Creates throwaway users and a circle, and deletes them afterwards. '
+            'Meant for PostgreSQL; SQLite serializes writers, so it proves little there.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--joiners', type=int, default=50)
+        parser.add_argument('--capacity', type=int, default=20)
+        parser.add_argument('--rounds', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if connection.vendor == 'sqlite':
+            self.stderr.write(self.style.WARNING('Running on SQLite: writes are serialized, expect no contention'))
+
+        run = uuid.uuid4().hex[:8]
+        users = CustomUser.objects.bulk_create([
+            CustomUser(username=f'stress-{run}-{i}', email=f'stress-{run}-{i}@example.invalid')
+            for i in range(options['joiners'] + 1)
+        ])
+        if users[0].pk is None:  # Backends without RETURNING
+            users = list(CustomUser.objects.filter(username__startswith=f'stress-{run}-'))
+        creator, joiners = users[0], users[1:]
+        circle = Circle.objects.create(
+            name=f'Stress {run}', description='Concurrency check', circle_type='social',
+            creator=creator, max_members=options['capacity']
+        )
+
+        try:
+            CircleMembership.objects.create(user=creator, circle=circle, role='creator')
+            for round_number in range(1, options['rounds'] + 1):
+                joined = self.race(joiners, lambda user: self.join(user, circle))
+                self.verify(circle, f'round {round_number}: {joined} joined')
+                left = self.race(joiners, lambda user: self.leave(user, circle))
+                self.verify(circle, f'round {round_number}: {left} left')
+        finally:
+            circle.delete()
+            CustomUser.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+        self.stdout.write(self.style.SUCCESS('member_count stayed consistent and within capacity'))
+
+    def race(self, users, action):
+        """Run action(user) for every user at once; returns how many succeeded"""
+        barrier = threading.Barrier(len(users))
+        results = []
+
+        def worker(user):
+            try:
+                barrier.wait()
+                results.append(action(user))
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return sum(results)
+
+    def join(self, user, circle):
+        membership = CircleMembership.objects.filter(user=user, circle=circle).first()
+        try:
+            if membership is None:
+                CircleMembership.objects.create(user=user, circle=circle)
+            else:
+                membership.is_active = True
+                membership.save()
+        except CircleFull:
+            return False
+        return True
+
+    def leave(self, user, circle):
+        membership = CircleMembership.objects.filter(user=user, circle=circle, is_active=True).first()
+        if membership is None:
+            return False
+        membership.is_active = False
+        membership.save()
+        return True
+
+    def verify(self, circle, label):
+        circle.refresh_from_db(fields=['member_count', 'max_members'])
+        active = CircleMembership.objects.filter(circle=circle, is_active=True).count()
+        self.stdout.write(f'{label}; member_count={circle.member_count} active={active}')
+        if circle.member_count != active:
+            raise CommandError(f'member_count drifted: {circle.member_count} stored, {active} active')
+        if active > circle.max_members:
+            raise CommandError(f'Over capacity: {active} members, max {circle.max_members}')
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0002_alter_circle_options_alter_habitentry_options_and_more'),
+        ('connections', '0003_connection_connections_conn_user1_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='circle',
+            index=models.Index(fields=['-created_at', '-id'], name='circles_circle_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='habit',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='circles_habit_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 18:57
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_member_count(apps, schema_editor):
+    Circle = apps.get_model('circles', 'Circle')
+    CircleMembership = apps.get_model('circles', 'CircleMembership')
+
+    Circle.objects.update(member_count=Coalesce(Subquery(
+        CircleMembership.objects.filter(circle=OuterRef('pk'), is_active=True)
+        .order_by().values('circle').annotate(total=Count('pk')).values('total')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0003_circle_circles_circle_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='circle',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_member_count, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,13 @@
 # circles/models.py
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from datetime import date, timedelta
 from users.models import CustomUser
 from connections.models import Interest
+from .versions import bump_habits_version
+
+class CircleFull(Exception):
+    """Raised when activating a membership in a circle with no free seats"""
 
 class Circle(models.Model):
     CIRCLE_TYPES = [
@@ -22,6 +26,8 @@ class Circle(models.Model):
     interests = models.ManyToManyField(Interest, blank=True)
     is_private = models.BooleanField(default=False)
     max_members = models.IntegerField(default=10)
+    # Active memberships, kept by CircleMembership.save() and circles/signals.py
+    member_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -31,13 +37,30 @@ class Circle(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='circles_circle_created_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} ({self.circle_type})"
     
-    @property
-    def member_count(self):
-        return self.members.count()
+    @staticmethod
+    def reserve_seat(circle_id):
+        """Take a seat with UPDATE ... WHERE member_count < max_members.
+        
+        The check and the increment are one statement, so concurrent joins
+        cannot overfill the circle and only the circle's row is locked.
+        Returns False when the circle is full.
+        """
+        return Circle.objects.filter(
+            pk=circle_id, member_count__lt=models.F('max_members')
+        ).update(member_count=models.F('member_count') + 1) == 1
+    
+    @staticmethod
+    def release_seat(circle_id):
+        Circle.objects.filter(
+            pk=circle_id, member_count__gt=0
+        ).update(member_count=models.F('member_count') - 1)
 
 class CircleMembership(models.Model):
     ROLES = [
@@ -54,6 +77,24 @@ class CircleMembership(models.Model):
     
     class Meta:
         unique_together = ['user', 'circle']
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so save() knows whether a seat changes hands
+        instance._persisted_active = instance.is_active
+        return instance
+    
+    def save(self, *args, **kwargs):
+        was_active = getattr(self, '_persisted_active', False)
+        with transaction.atomic():
+            if self.is_active and not was_active:
+                if not Circle.reserve_seat(self.circle_id):
+                    raise CircleFull(f'Circle {self.circle_id} is full')
+            elif was_active and not self.is_active:
+                Circle.release_seat(self.circle_id)
+            super().save(*args, **kwargs)
+        self._persisted_active = self.is_active
 
 class Habit(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='habits')
@@ -65,47 +106,71 @@ class Habit(models.Model):
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
-    # Streak tracking
+    # Streak tracking. best_streak is the longest run ever reached: un-checking
+    # days shortens current_streak but never takes the record back
     current_streak = models.IntegerField(default=0)
     best_streak = models.IntegerField(default=0)
     last_completed = models.DateField(null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='circles_habit_user_created_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.user.username}'s {self.name}"
     
-    def update_streak(self, completion_date=None):
-        """Update streak based on habit entries"""
-        if completion_date is None:
-            completion_date = date.today()
+    def record_entry(self, entry_date, completed, was_completed):
+        """Fold one entry change into the stored streak.
         
-        # Get recent entries
-        recent_entries = self.entries.filter(
-            date__lte=completion_date,
-            completed=True
-        ).order_by('-date')
-        
-        if not recent_entries:
-            self.current_streak = 0
-            self.save()
+        Checking in the day after last_completed (the usual case) needs no
+        queries; back-dated or un-toggled entries only walk the affected run.
+        current_streak is the run of completed days ending at last_completed.
+        """
+        if completed == was_completed:
             return
         
-        # Calculate current streak
-        streak = 0
-        check_date = completion_date
-        
-        for entry in recent_entries:
-            if entry.date == check_date:
-                streak += 1
-                check_date -= timedelta(days=1)
+        last = self.last_completed
+        if completed:
+            if last is None or entry_date > last:
+                self.current_streak = self.current_streak + 1 if last == entry_date - timedelta(days=1) else 1
+                self.last_completed = entry_date
+                run = self.current_streak
             else:
-                break
+                # Back-dated: may bridge into the current run or join older ones
+                before = self._completed_run(entry_date - timedelta(days=1), step=-1)
+                after = self._completed_run(entry_date + timedelta(days=1), step=1)
+                run = before + 1 + after
+                if entry_date + timedelta(days=after) == last:
+                    self.current_streak = run
+            self.best_streak = max(self.best_streak, run)
+        elif last is not None and entry_date == last:
+            previous = self.entries.filter(
+                completed=True, date__lt=entry_date
+            ).order_by('-date').values_list('date', flat=True).first()
+            self.last_completed = previous
+            self.current_streak = self._completed_run(previous, step=-1) if previous else 0
+        elif last is not None and last - timedelta(days=self.current_streak) < entry_date < last:
+            # Un-toggling inside the current run cuts it short
+            self.current_streak = (last - entry_date).days
         
-        self.current_streak = streak
-        if streak > self.best_streak:
-            self.best_streak = streak
+        self.save(update_fields=['current_streak', 'best_streak', 'last_completed'])
+    
+    def _completed_run(self, start, step):
+        """Count consecutive completed days from `start`, walking by `step` days"""
+        if step < 0:
+            dates = self.entries.filter(completed=True, date__lte=start).order_by('-date')
+        else:
+            dates = self.entries.filter(completed=True, date__gte=start).order_by('date')
         
-        self.last_completed = completion_date
-        self.save()
+        run = 0
+        expected = start
+        for day in dates.values_list('date', flat=True).iterator(chunk_size=64):
+            if day != expected:
+                break
+            run += 1
+            expected += timedelta(days=step)
+        return run
 
 class HabitEntry(models.Model):
     habit = models.ForeignKey(Habit, on_delete=models.CASCADE, related_name='entries')
@@ -121,7 +186,24 @@ class HabitEntry(models.Model):
     def __str__(self):
         return f"{self.habit.name} - {self.date} ({'✓' if self.completed else '✗'})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored state so save() can pass the habit a delta
+        instance._persisted_completed = instance.completed
+        return instance
+    
     def save(self, *args, **kwargs):
+        was_completed = getattr(self, '_persisted_completed', False)
         super().save(*args, **kwargs)
+        self._persisted_completed = self.completed
         # Update streak when entry is saved
-        self.habit.update_streak(self.date)
+        self.habit.record_entry(self.date, self.completed, was_completed)
+        bump_habits_version(self.habit.user_id)
+    
+    def delete(self, *args, **kwargs):
+        was_completed = getattr(self, '_persisted_completed', False)
+        result = super().delete(*args, **kwargs)
+        self.habit.record_entry(self.date, False, was_completed)
+        bump_habits_version(self.habit.user_id)
+        return result
@@ -0,0 +1,26 @@
+# circles/projections.py
+from rest_framework import serializers
+from connections.projections import project_interest
+from minsoto.projections import iso_datetime
+from users.projections import project_public_user
+
+
+class CircleProjection(serializers.BaseSerializer):
+    """Read-only stand-in for CircleSerializer; expects the rows from
+    circles.queries.with_membership_data. See users.projections."""
+
+    def to_representation(self, circle):
+        return {
+            'id': circle.id,
+            'name': circle.name,
+            'description': circle.description,
+            'circle_type': circle.circle_type,
+            'creator': project_public_user(circle.creator),
+            'interests': [project_interest(interest) for interest in circle.interests.all()],
+            'is_private': circle.is_private,
+            'max_members': circle.max_members,
+            'member_count': circle.member_count,
+            'is_member': circle.viewer_role is not None,
+            'user_role': circle.viewer_role,
+            'created_at': iso_datetime(circle.created_at),
+        }
@@ -0,0 +1,19 @@
+# circles/queries.py
+from django.db.models import Exists, OuterRef, Subquery
+from .models import CircleMembership
+
+
+def active_membership(user):
+    """Exists() over the user's active membership of the outer circle"""
+    return Exists(CircleMembership.objects.filter(circle=OuterRef('pk'), user=user, is_active=True))
+
+
+def with_membership_data(queryset, user):
+    """Load everything CircleSerializer reads in one query plus one prefetch,
+    instead of membership queries per circle"""
+    return queryset.select_related('creator__profile').prefetch_related('interests').annotate(
+        # The viewer's role, or None when they are not an active member
+        viewer_role=Subquery(CircleMembership.objects.filter(
+            circle=OuterRef('pk'), user=user, is_active=True
+        ).values('role')[:1]),
+    )
@@ -1,9 +1,12 @@
 # circles/serializers.py
 from rest_framework import serializers
 from .models import Circle, CircleMembership, Habit, HabitEntry
+from .calendar import build_habit_calendars, get_calendar_days
 from connections.serializers import InterestSerializer
 from users.serializers import PublicUserSerializer
 
+MAX_CHECK_INS = 500  # Entries accepted per bulk check-in request
+
 class CircleMembershipSerializer(serializers.ModelSerializer):
     user = PublicUserSerializer(read_only=True)
     
@@ -17,7 +20,7 @@ class CircleSerializer(serializers.ModelSerializer):
     interest_ids = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False
     )
-    member_count = serializers.ReadOnlyField()
+    member_count = serializers.IntegerField(read_only=True)
     is_member = serializers.SerializerMethodField()
     user_role = serializers.SerializerMethodField()
     
@@ -27,21 +30,41 @@ class CircleSerializer(serializers.ModelSerializer):
                  'interests', 'interest_ids', 'is_private', 'max_members', 
                  'member_count', 'is_member', 'user_role', 'created_at']
     
+    def validate_max_members(self, value):
+        if value < 1:
+            raise serializers.ValidationError('A circle needs room for at least its creator')
+        return value
+    
     def get_is_member(self, obj):
+        # Annotated by circles.queries.with_membership_data on list views
+        if hasattr(obj, 'viewer_role'):
+            return obj.viewer_role is not None
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            return obj.members.filter(id=request.user.id).exists()
+            return obj.circlemembership_set.filter(user=request.user, is_active=True).exists()
         return False
     
     def get_user_role(self, obj):
+        if hasattr(obj, 'viewer_role'):
+            return obj.viewer_role
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             membership = CircleMembership.objects.filter(
-                user=request.user, circle=obj
+                user=request.user, circle=obj, is_active=True
             ).first()
             return membership.role if membership else None
         return None
 
+class HabitListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Build every habit's calendar in one query before rendering the page,
+        # unless the view already did (the async habit list loads them itself)
+        habits = list(data.all() if hasattr(data, 'all') else data)
+        if 'habit_calendars' not in self.context:
+            days = get_calendar_days(self.context.get('request'))
+            self.context['habit_calendars'] = build_habit_calendars([habit.id for habit in habits], days)
+        return super().to_representation(habits)
+
 class HabitSerializer(serializers.ModelSerializer):
     streak_data = serializers.SerializerMethodField()
     
@@ -50,33 +73,26 @@ class HabitSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'description', 'target_frequency', 
                  'current_streak', 'best_streak', 'is_active', 'is_public',
                  'streak_data', 'created_at']
+        list_serializer_class = HabitListSerializer
     
     def get_streak_data(self, obj):
-        # Return last 30 days of data
-        from datetime import date, timedelta
-        end_date = date.today()
-        start_date = end_date - timedelta(days=29)
-        
-        entries = obj.entries.filter(
-            date__gte=start_date,
-            date__lte=end_date
-        ).values('date', 'completed')
-        
-        # Create a complete 30-day dataset
-        data = {}
-        for entry in entries:
-            data[entry['date'].isoformat()] = entry['completed']
-        
-        # Fill missing dates
-        current = start_date
-        while current <= end_date:
-            if current.isoformat() not in data:
-                data[current.isoformat()] = False
-            current += timedelta(days=1)
-        
-        return data
+        # {"start": "YYYY-MM-DD", "days": N, "completed": "0110..."}, oldest day first
+        calendars = self.context.get('habit_calendars')
+        if calendars is None or obj.id not in calendars:
+            days = get_calendar_days(self.context.get('request'))
+            calendars = build_habit_calendars([obj.id], days)
+        return calendars[obj.id]
 
 class HabitEntrySerializer(serializers.ModelSerializer):
     class Meta:
         model = HabitEntry
         fields = ['id', 'date', 'completed', 'notes', 'created_at']
+
+class HabitCheckInSerializer(serializers.Serializer):
+    habit_id = serializers.IntegerField()
+    date = serializers.DateField()
+    completed = serializers.BooleanField(default=True)
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+
+class BulkCheckInSerializer(serializers.Serializer):
+    entries = HabitCheckInSerializer(many=True, max_length=MAX_CHECK_INS, required=False)
@@ -0,0 +1,23 @@
+# circles/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Circle, CircleMembership, Habit
+from .versions import bump_habits_version, bump_membership_version
+
+# HabitEntry bumps its habit's version from save()/delete(), next to the streak bookkeeping
+
+@receiver(post_save, sender=Habit)
+@receiver(post_delete, sender=Habit)
+def invalidate_habit_validators(sender, instance, **kwargs):
+    bump_habits_version(instance.user_id)
+
+@receiver(post_delete, sender=CircleMembership)
+def release_circle_seat(sender, instance, **kwargs):
+    """Deletes skip CircleMembership.save(), cascades and bulk deletes included"""
+    if getattr(instance, '_persisted_active', instance.is_active):
+        Circle.release_seat(instance.circle_id)
+
+@receiver(post_save, sender=CircleMembership)
+@receiver(post_delete, sender=CircleMembership)
+def invalidate_membership_validators(sender, instance, **kwargs):
+    bump_membership_version()
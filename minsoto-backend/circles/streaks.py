@@ -0,0 +1,40 @@
+# circles/streaks.py
+from datetime import timedelta
+from .models import Habit, HabitEntry
+
+ONE_DAY = timedelta(days=1)
+
+
+def compute_streaks(dates):
+    """Return (current_streak, best_streak, last_completed) for ascending
+    completed dates; current is the run ending at the last completed date"""
+    current = best = 0
+    previous = None
+    for day in dates:
+        current = current + 1 if previous is not None and day - previous == ONE_DAY else 1
+        best = max(best, current)
+        previous = day
+    return current, best, previous
+
+
+def recompute_streaks(habits, reset_best=False):
+    """Rebuild streak fields from the entries with one query for all `habits`.
+
+    best_streak is the longest run the habit has ever had, as
+    Habit.record_entry() keeps it, so un-checking days does not lower it and
+    it stays at least the best run left in the entries. reset_best=True
+    takes it from the entries alone, to repair a value that drifted too high.
+    """
+    habits = list(habits)
+    dates_by_habit = {habit.id: [] for habit in habits}
+    entries = HabitEntry.objects.filter(
+        habit_id__in=dates_by_habit, completed=True
+    ).order_by('habit_id', 'date').values_list('habit_id', 'date')
+    for habit_id, day in entries.iterator(chunk_size=5000):
+        dates_by_habit[habit_id].append(day)
+
+    for habit in habits:
+        habit.current_streak, best, habit.last_completed = compute_streaks(dates_by_habit[habit.id])
+        habit.best_streak = best if reset_best else max(habit.best_streak, best)
+    Habit.objects.bulk_update(habits, ['current_streak', 'best_streak', 'last_completed'])
+    return habits
@@ -1,3 +1,370 @@
+import random
+from datetime import date, timedelta
+
 from django.test import TestCase
 
-# Create your tests here.
+from connections.models import Interest
+from content.models import Post
+from minsoto.testing import PAGE_SIZES, APITestCase, make_user
+from .models import Circle, CircleMembership, CircleFull, Habit, HabitEntry
+from .serializers import MAX_CHECK_INS
+from .streaks import compute_streaks, recompute_streaks
+
+ROWS = 30
+
+
+class CircleQueryCountTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = make_user('viewer')
+        cls.others = [make_user(f'member{i}') for i in range(max(PAGE_SIZES))]
+        interests = [Interest.objects.create(name=name) for name in ('Chess', 'Running')]
+        for i in range(ROWS):
+            circle = Circle.objects.create(
+                name=f'Circle {i}', description='', circle_type='social',
+                creator=cls.others[0], max_members=100,
+            )
+            circle.interests.set(interests)
+            CircleMembership.objects.create(user=cls.others[0], circle=circle, role='creator')
+            CircleMembership.objects.create(user=cls.viewer, circle=circle)
+
+    def test_circle_list(self):
+        # Validators, page, interests prefetch
+        self.assertPageQueries('/api/circles/?', 3)
+
+    def test_my_circles(self):
+        self.assertPageQueries('/api/circles/my-circles/?', 3)
+
+    def test_join_and_leave(self):
+        for members in PAGE_SIZES:
+            circle = Circle.objects.create(
+                name=f'{members} members', description='', circle_type='social',
+                creator=self.others[0], max_members=100,
+            )
+            for i, user in enumerate(self.others[:members]):
+                CircleMembership.objects.create(user=user, circle=circle, role='creator' if i == 0 else 'member')
+
+            # Counts include the savepoints of the atomic blocks
+            with self.assertNumQueries(10):
+                response = self.client.post(f'/api/circles/{circle.id}/join/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['member_count'], members + 1)
+
+            with self.assertNumQueries(7):
+                response = self.client.post(f'/api/circles/{circle.id}/leave/')
+            self.assertEqual(response.status_code, 200)
+
+            # Rejoining reactivates the old row
+            with self.assertNumQueries(10):
+                response = self.client.post(f'/api/circles/{circle.id}/join/')
+            self.assertEqual(response.status_code, 200)
+
+
+class CircleMembershipTests(APITestCase):
+    """Seats are taken and given back with the membership, and a full circle
+    turns joiners away"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.creator, cls.viewer, cls.other = make_user('creator'), make_user('viewer'), make_user('other')
+
+    def make_circle(self, max_members, **fields):
+        circle = Circle.objects.create(
+            name='Readers', description='', circle_type='social', creator=self.creator,
+            max_members=max_members, **fields
+        )
+        CircleMembership.objects.create(user=self.creator, circle=circle, role='creator')
+        return circle
+
+    def member_count(self, circle):
+        circle.refresh_from_db()
+        active = CircleMembership.objects.filter(circle=circle, is_active=True).count()
+        self.assertEqual(circle.member_count, active)
+        return circle.member_count
+
+    def join(self, circle, user=None):
+        self.client.force_authenticate(user or self.viewer)
+        return self.client.post(f'/api/circles/{circle.id}/join/')
+
+    def leave(self, circle, user=None):
+        self.client.force_authenticate(user or self.viewer)
+        return self.client.post(f'/api/circles/{circle.id}/leave/')
+
+    def test_join_leave_and_rejoin(self):
+        circle = self.make_circle(max_members=5)
+        self.assertEqual(self.member_count(circle), 1)
+
+        response = self.join(circle)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['member_count'], 2)
+        self.assertTrue(response.data['is_member'])
+        self.assertEqual(self.member_count(circle), 2)
+
+        self.assertEqual(self.join(circle).status_code, 400)  # Already a member
+        self.assertEqual(self.member_count(circle), 2)
+
+        self.assertEqual(self.leave(circle).status_code, 200)
+        self.assertEqual(self.member_count(circle), 1)
+        self.assertEqual(self.leave(circle).status_code, 404)  # No longer a member
+        self.assertEqual(self.member_count(circle), 1)
+
+        self.assertEqual(self.join(circle).status_code, 200)
+        self.assertEqual(self.member_count(circle), 2)
+        self.assertEqual(CircleMembership.objects.filter(circle=circle, user=self.viewer).count(), 1)
+
+    def test_full_circle_refuses_joins(self):
+        circle = self.make_circle(max_members=2)
+        self.assertEqual(self.join(circle).status_code, 200)
+        response = self.join(circle, self.other)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.member_count(circle), 2)
+        self.assertFalse(CircleMembership.objects.filter(circle=circle, user=self.other).exists())
+
+        # A seat given back can be taken again
+        self.assertEqual(self.leave(circle).status_code, 200)
+        self.assertEqual(self.join(circle, self.other).status_code, 200)
+        self.assertEqual(self.member_count(circle), 2)
+
+    def test_full_circle_refuses_rejoins(self):
+        circle = self.make_circle(max_members=2)
+        self.join(circle)
+        self.leave(circle)
+        self.join(circle, self.other)
+        self.assertEqual(self.join(circle).status_code, 409)
+        self.assertFalse(CircleMembership.objects.get(circle=circle, user=self.viewer).is_active)
+        self.assertEqual(self.member_count(circle), 2)
+
+    def test_reserving_a_seat_in_a_full_circle_raises(self):
+        circle = self.make_circle(max_members=1)
+        with self.assertRaises(CircleFull):
+            CircleMembership.objects.create(user=self.viewer, circle=circle)
+        self.assertEqual(self.member_count(circle), 1)
+
+    def test_creator_cannot_leave(self):
+        circle = self.make_circle(max_members=5)
+        self.assertEqual(self.leave(circle, self.creator).status_code, 400)
+        self.assertEqual(self.member_count(circle), 1)
+
+    def test_private_circle_refuses_joins(self):
+        circle = self.make_circle(max_members=5, is_private=True)
+        self.assertEqual(self.join(circle).status_code, 403)
+        self.assertEqual(self.member_count(circle), 1)
+
+    def test_deleting_memberships_gives_seats_back(self):
+        circle = self.make_circle(max_members=5)
+        self.join(circle)
+        self.join(circle, self.other)
+        self.leave(circle, self.other)
+        self.assertEqual(self.member_count(circle), 2)
+        # Deleting an inactive membership must not give back a seat twice
+        CircleMembership.objects.filter(circle=circle, user=self.other).delete()
+        self.assertEqual(self.member_count(circle), 2)
+        CircleMembership.objects.filter(circle=circle, user=self.viewer).delete()
+        self.assertEqual(self.member_count(circle), 1)
+
+
+class HabitQueryCountTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = make_user('viewer')
+        today = date.today()
+        for i in range(ROWS):
+            habit = Habit.objects.create(user=cls.viewer, name=f'Habit {i}')
+            HabitEntry.objects.bulk_create(
+                HabitEntry(habit=habit, date=today - timedelta(days=day), completed=True)
+                for day in range(10)
+            )
+
+    def test_habit_list(self):
+        # Validators, page, one calendar query for the whole page
+        self.assertPageQueries('/api/circles/habits/?', 3)
+
+
+class CircleFeedVisibilityTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer, cls.member = make_user('author'), make_user('member')
+        cls.circle = Circle.objects.create(name='Readers', description='', circle_type='social', creator=cls.viewer)
+        CircleMembership.objects.create(user=cls.viewer, circle=cls.circle, role='creator')
+        CircleMembership.objects.create(user=cls.member, circle=cls.circle)
+
+    def create_post(self, **data):
+        return self.client.post('/api/content/feed/', {'content': 'Hi', 'circle': self.circle.id, **data})
+
+    def member_feed(self):
+        self.client.force_authenticate(self.member)
+        return [post['id'] for post in self.client.get(f'/api/circles/{self.circle.id}/feed/').data['results']]
+
+    def test_circle_posts_default_to_circle_visibility(self):
+        response = self.create_post()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['visibility'], 'circle')
+        self.assertEqual(self.member_feed(), [response.data['id']])
+
+    def test_public_circle_posts_are_allowed(self):
+        response = self.create_post(visibility='public')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.member_feed(), [response.data['id']])
+
+    def test_narrower_visibility_is_refused(self):
+        for visibility in ('friends', 'connections'):
+            response = self.create_post(visibility=visibility)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('visibility', response.data)
+
+    def test_members_do_not_see_older_friends_only_rows(self):
+        # The member is not the author's friend
+        Post.objects.create(author=self.viewer, circle=self.circle, content='Hi', visibility='friends')
+        self.assertEqual(self.member_feed(), [])
+
+
+START = date(2026, 1, 1)
+
+
+def day(n):
+    return START + timedelta(days=n)
+
+
+class StreakTests(TestCase):
+    """Habit.record_entry(), the incremental path behind single check-ins"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user('user')
+
+    def setUp(self):
+        self.habit = Habit.objects.create(user=self.user, name='Read')
+
+    def toggle(self, n):
+        entry, created = HabitEntry.objects.get_or_create(habit=self.habit, date=day(n))
+        if not created:
+            entry.completed = not entry.completed
+            entry.save()
+        self.habit.refresh_from_db()
+
+    def assertStreaks(self, current, best, last):
+        self.assertEqual(
+            (self.habit.current_streak, self.habit.best_streak, self.habit.last_completed),
+            (current, best, None if last is None else day(last)),
+        )
+
+    def test_consecutive_days(self):
+        for n in range(3):
+            self.toggle(n)
+        self.assertStreaks(3, 3, 2)
+
+    def test_gap_starts_a_new_run(self):
+        for n in (0, 1, 2, 5):
+            self.toggle(n)
+        self.assertStreaks(1, 3, 5)
+
+    def test_back_dated_day_bridges_runs(self):
+        for n in (0, 1, 3, 4):
+            self.toggle(n)
+        self.assertStreaks(2, 2, 4)
+        self.toggle(2)
+        self.assertStreaks(5, 5, 4)
+
+    def test_back_dated_day_in_an_older_run(self):
+        for n in (0, 2, 6):
+            self.toggle(n)
+        self.toggle(1)
+        self.assertStreaks(1, 3, 6)
+
+    def test_unchecking_the_last_day(self):
+        for n in (0, 1, 3, 4):
+            self.toggle(n)
+        self.toggle(4)
+        self.assertStreaks(1, 2, 3)
+        self.toggle(3)
+        self.assertStreaks(2, 2, 1)
+
+    def test_unchecking_inside_the_run_keeps_the_record(self):
+        for n in range(5):
+            self.toggle(n)
+        self.toggle(2)
+        self.assertStreaks(2, 5, 4)
+
+    def test_matches_a_rebuild_from_the_entries(self):
+        rng = random.Random(1)
+        record = 0
+        for _ in range(200):
+            self.toggle(rng.randrange(20))
+            dates = sorted(HabitEntry.objects.filter(habit=self.habit, completed=True).values_list('date', flat=True))
+            current, best, last = compute_streaks(dates)
+            record = max(record, best)
+            self.assertEqual(
+                (self.habit.current_streak, self.habit.best_streak, self.habit.last_completed),
+                (current, record, last),
+            )
+
+    def test_recompute_keeps_the_record(self):
+        for n in range(5):
+            self.toggle(n)
+        self.toggle(2)
+        Habit.objects.filter(pk=self.habit.pk).update(current_streak=0, last_completed=None)
+        habit, = recompute_streaks(Habit.objects.filter(pk=self.habit.pk))
+        self.assertEqual((habit.current_streak, habit.best_streak, habit.last_completed), (2, 5, day(4)))
+
+        habit, = recompute_streaks(Habit.objects.filter(pk=self.habit.pk), reset_best=True)
+        self.assertEqual(habit.best_streak, 2)
+
+
+class BulkCheckInTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = make_user('user')
+
+    def check_in(self, *entries):
+        return self.client.post('/api/circles/habits/check-in/', {'entries': list(entries)}, format='json')
+
+    def streaks(self, habit):
+        habit.refresh_from_db()
+        return habit.current_streak, habit.best_streak, habit.last_completed
+
+    def test_matches_single_check_ins(self):
+        single = Habit.objects.create(user=self.viewer, name='Single')
+        bulk = Habit.objects.create(user=self.viewer, name='Bulk')
+        rng = random.Random(2)
+        for _ in range(100):
+            when = day(rng.randrange(20))
+            response = self.client.post(f'/api/circles/habits/{single.id}/complete/', {'date': when.isoformat()})
+            completed = response.data['completed']
+            response = self.check_in({'habit_id': bulk.id, 'date': when.isoformat(), 'completed': completed})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.streaks(bulk), self.streaks(single))
+
+    def test_does_not_lower_the_best_streak(self):
+        habit = Habit.objects.create(user=self.viewer, name='Read')
+        self.check_in(*({'habit_id': habit.id, 'date': day(n).isoformat()} for n in range(5)))
+        response = self.check_in({'habit_id': habit.id, 'date': day(2).isoformat(), 'completed': False})
+        self.assertEqual(response.data['habits'][0]['best_streak'], 5)
+        self.assertEqual(self.streaks(habit), (2, 5, day(4)))
+
+    def test_later_duplicates_win(self):
+        habit = Habit.objects.create(user=self.viewer, name='Read')
+        response = self.check_in(
+            {'habit_id': habit.id, 'date': day(0).isoformat(), 'completed': True},
+            {'habit_id': habit.id, 'date': day(0).isoformat(), 'completed': False},
+        )
+        self.assertEqual(response.data['updated'], 1)
+        self.assertFalse(HabitEntry.objects.get(habit=habit, date=day(0)).completed)
+
+    def test_other_users_habits_are_refused(self):
+        other = Habit.objects.create(user=make_user('other'), name='Run')
+        response = self.check_in({'habit_id': other.id, 'date': day(0).isoformat()})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['habit_ids'], [other.id])
+        self.assertFalse(HabitEntry.objects.exists())
+
+    def test_invalid_bodies(self):
+        habit = Habit.objects.create(user=self.viewer, name='Read')
+        too_many = [{'habit_id': habit.id, 'date': day(n).isoformat()} for n in range(MAX_CHECK_INS + 1)]
+        for body in ([1, 2], {'entries': 'x'}, {'entries': [{'habit_id': habit.id}]}, {'entries': too_many}):
+            response = self.client.post('/api/circles/habits/check-in/', body, format='json')
+            self.assertEqual(response.status_code, 400, body if len(str(body)) < 100 else 'too many')
+        self.assertFalse(HabitEntry.objects.exists())
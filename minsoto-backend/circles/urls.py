@@ -5,8 +5,14 @@ from . import views
 urlpatterns = [
     path('', views.CircleListCreateView.as_view(), name='circles'),
     path('my-circles/', views.MyCirclesView.as_view(), name='my-circles'),
+    path('my-circles/async/', views.AsyncMyCirclesView.as_view(), name='my-circles-async'),
     path('create/', views.CircleListCreateView.as_view(), name='create-circle'),
+    path('<int:circle_id>/join/', views.join_circle, name='join-circle'),
+    path('<int:circle_id>/leave/', views.leave_circle, name='leave-circle'),
+    path('<int:circle_id>/feed/', views.CircleFeedView.as_view(), name='circle-feed'),
     path('habits/', views.HabitListCreateView.as_view(), name='habits'),
+    path('habits/async/', views.AsyncHabitListView.as_view(), name='habits-async'),
     path('habits/<int:pk>/', views.HabitDetailView.as_view(), name='habit-detail'),
     path('habits/<int:habit_id>/complete/', views.mark_habit_complete, name='mark_habit_complete'),
+    path('habits/check-in/', views.bulk_check_in, name='bulk-check-in'),
 ]
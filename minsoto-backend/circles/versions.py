@@ -0,0 +1,39 @@
+# circles/versions.py
+from minsoto.conditional import bump_version, get_version
+
+# Membership changes alter member_count/is_member on every circle listing
+MEMBERSHIP_VERSION_KEY = 'circles:memberships:version'
+
+
+def _habits_version_key(user_id):
+    return f'circles:habits:version:{user_id}'
+
+
+def get_habits_version(user_id):
+    """Moves whenever any of the user's habits or their entries change"""
+    return get_version(_habits_version_key(user_id))
+
+
+def bump_habits_version(user_id):
+    bump_version(_habits_version_key(user_id))
+
+
+def _circle_feed_version_key(circle_id):
+    return f'circles:feed:version:{circle_id}'
+
+
+def get_circle_feed_version(circle_id):
+    """Moves whenever a post is added to, edited in or removed from the circle"""
+    return get_version(_circle_feed_version_key(circle_id))
+
+
+def bump_circle_feed_version(circle_id):
+    bump_version(_circle_feed_version_key(circle_id))
+
+
+def get_membership_version():
+    return get_version(MEMBERSHIP_VERSION_KEY)
+
+
+def bump_membership_version():
+    bump_version(MEMBERSHIP_VERSION_KEY)
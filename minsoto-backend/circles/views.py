@@ -1,33 +1,62 @@
 # circles/views.py
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from datetime import date
-from .models import Circle, CircleMembership, Habit, HabitEntry
-from .serializers import CircleSerializer, HabitSerializer, HabitEntrySerializer
+from minsoto.async_views import AsyncListView
+from minsoto.conditional import ConditionalGetMixin
+from content.feed import with_feed_data, with_viewer_likes
+from content.models import Post
+from content.projections import PostProjection
+from content.visibility import CIRCLE_POST_VISIBILITIES, visible_to
+from .calendar import abuild_habit_calendars, get_calendar_days
+from .models import Circle, CircleFull, CircleMembership, Habit, HabitEntry
+from .projections import CircleProjection
+from .queries import active_membership, with_membership_data
+from .serializers import CircleSerializer, HabitSerializer, HabitEntrySerializer, BulkCheckInSerializer
+from .streaks import recompute_streaks
+from .versions import bump_habits_version, get_circle_feed_version, get_habits_version, get_membership_version
 
-class CircleListCreateView(generics.ListCreateAPIView):
+
+class CircleValidatorsMixin(ConditionalGetMixin):
+    def get_validator_versions(self):
+        # member_count and is_member live in CircleMembership
+        return [get_membership_version()]
+    
+    def get_serializer_class(self):
+        # Listings render the annotated rows through the projection
+        if self.request.method == 'GET':
+            return CircleProjection
+        return CircleSerializer
+
+class CircleListCreateView(CircleValidatorsMixin, generics.ListCreateAPIView):
     serializer_class = CircleSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Circle.objects.filter(
-            Q(is_private=False) | Q(members=self.request.user)
-        ).distinct()
+        user = self.request.user
+        # Exists instead of joining members, so no DISTINCT is needed
+        return with_membership_data(Circle.objects.filter(Q(is_private=False) | active_membership(user)), user)
     
     def perform_create(self, serializer):
         interest_ids = serializer.validated_data.pop('interest_ids', [])
-        circle = serializer.save(creator=self.request.user)
-        
-        # Add creator as admin
-        CircleMembership.objects.create(
-            user=self.request.user,
-            circle=circle,
-            role='creator'
-        )
+        with transaction.atomic():
+            circle = serializer.save(creator=self.request.user)
+            
+            # Add creator as admin; takes the circle's first seat
+            CircleMembership.objects.create(
+                user=self.request.user,
+                circle=circle,
+                role='creator'
+            )
+            circle.refresh_from_db(fields=['member_count'])
         
         # Add interests
         if interest_ids:
@@ -35,14 +64,120 @@ class CircleListCreateView(generics.ListCreateAPIView):
             interests = Interest.objects.filter(id__in=interest_ids)
             circle.interests.set(interests)
 
-class MyCirclesView(generics.ListAPIView):
+class MyCirclesView(CircleValidatorsMixin, generics.ListAPIView):
     serializer_class = CircleSerializer
     permission_classes = [IsAuthenticated]
     
     def get_queryset(self):
-        return Circle.objects.filter(members=self.request.user)
+        user = self.request.user
+        return with_membership_data(Circle.objects.filter(active_membership(user)), user)
+
+class AsyncMyCirclesView(AsyncListView):
+    """MyCirclesView on the async ORM"""
+    serializer_class = CircleProjection
+    
+    async def aget_queryset(self):
+        return MyCirclesView.get_queryset(self)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def join_circle(request, circle_id):
+    circle = get_object_or_404(Circle, id=circle_id)
+    if circle.is_private:
+        return Response({'error': 'This circle is private'}, status=status.HTTP_403_FORBIDDEN)
+    
+    try:
+        with transaction.atomic():
+            # Locked so two requests cannot both reactivate it and take two seats
+            membership = CircleMembership.objects.select_for_update().filter(
+                user=request.user, circle=circle
+            ).first()
+            if membership is None:
+                CircleMembership.objects.create(user=request.user, circle=circle)
+            elif membership.is_active:
+                return Response({'error': 'Already a member'}, status=status.HTTP_400_BAD_REQUEST)
+            else:
+                membership.is_active = True
+                membership.save()
+    except CircleFull:
+        return Response({'error': 'Circle is full'}, status=status.HTTP_409_CONFLICT)
+    except IntegrityError:
+        # A concurrent join by the same user created the row first
+        return Response({'error': 'Already a member'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    circle = with_membership_data(Circle.objects.filter(id=circle.id), request.user).get()
+    return Response(CircleProjection(circle, context={'request': request}).data)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def leave_circle(request, circle_id):
+    with transaction.atomic():
+        membership = get_object_or_404(
+            CircleMembership.objects.select_for_update(),
+            user=request.user, circle_id=circle_id, is_active=True
+        )
+        if membership.role == 'creator':
+            return Response(
+                {'error': 'The creator cannot leave the circle'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Deactivated rather than deleted, so rejoining keeps the original row
+        membership.is_active = False
+        membership.save()
+    
+    return Response({'status': 'success'})
+
+class CircleFeedView(generics.ListAPIView):
+    """A circle's timeline, newest first, off the (circle, created_at) index.
+    
+    Every member sees the same posts, so the members' first page is cached
+    under the circle's feed version; only is_liked is redone per viewer.
+    Public circles are readable by non-members, minus what visibility hides.
+    """
+    serializer_class = PostProjection
+    permission_classes = [IsAuthenticated]
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.circle = get_object_or_404(
+            Circle.objects.annotate(is_member=active_membership(request.user)),
+            id=self.kwargs['circle_id']
+        )
+        if self.circle.is_private and not self.circle.is_member:
+            raise PermissionDenied('This circle is private')
+    
+    def get_queryset(self):
+        queryset = Post.objects.filter(circle=self.circle)
+        if self.circle.is_member:
+            # The same for every member, so the page can be shared. Rows saved
+            # friends- or connections-only before PostSerializer refused them
+            # are left out; visible_to() still shows them in the other feeds
+            queryset = queryset.filter(visibility__in=CIRCLE_POST_VISIBILITIES)
+        else:
+            queryset = queryset.filter(visible_to(self.request.user))
+        return with_feed_data(queryset, self.request.user)
+    
+    def list(self, request, *args, **kwargs):
+        # Only the default first page is shared
+        if not (settings.CIRCLE_FEED_CACHE_TIMEOUT and self.circle.is_member and not request.query_params):
+            return super().list(request, *args, **kwargs)
+        
+        key = f'circles:feed:{self.circle.id}:{get_circle_feed_version(self.circle.id)}'
+        page = cache.get(key)
+        if page is None:
+            response = super().list(request, *args, **kwargs)
+            cache.set(key, response.data, settings.CIRCLE_FEED_CACHE_TIMEOUT)
+            return response
+        return Response({**page, 'results': with_viewer_likes(page['results'], request.user)})
 
-class HabitListCreateView(generics.ListCreateAPIView):
+class HabitValidatorsMixin(ConditionalGetMixin):
+    last_modified_field = None
+    
+    def get_validator_versions(self):
+        # Entries and streaks move the version; the calendar window moves daily
+        return [get_habits_version(self.request.user.id), date.today().isoformat()]
+
+class HabitListCreateView(HabitValidatorsMixin, generics.ListCreateAPIView):
     serializer_class = HabitSerializer
     permission_classes = [IsAuthenticated]
     
@@ -55,7 +190,19 @@ class HabitListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class HabitDetailView(generics.RetrieveUpdateDestroyAPIView):
+class AsyncHabitListView(AsyncListView):
+    """GET-only variant of HabitListCreateView on the async ORM"""
+    serializer_class = HabitSerializer
+    
+    async def aget_queryset(self):
+        return HabitListCreateView.get_queryset(self)
+    
+    async def aserialize(self, habits):
+        days = get_calendar_days(self.request)
+        calendars = await abuild_habit_calendars([habit.id for habit in habits], days)
+        return self.get_serializer(habits, habit_calendars=calendars).data
+
+class HabitDetailView(HabitValidatorsMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = HabitSerializer
     permission_classes = [IsAuthenticated]
     
@@ -89,3 +236,49 @@ def mark_habit_complete(request, habit_id):
         entry.save()
     
     return Response(HabitEntrySerializer(entry).data)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_check_in(request):
+    """Upsert many habit entries at once: {"entries": [{habit_id, date, completed, notes}, ...]}"""
+    serializer = BulkCheckInSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Later items win when the same habit/date appears twice
+    check_ins = {
+        (item['habit_id'], item['date']): item
+        for item in serializer.validated_data.get('entries', [])
+    }
+    habit_ids = {habit_id for habit_id, _ in check_ins}
+    
+    owned_ids = set(Habit.objects.filter(
+        user=request.user, id__in=habit_ids
+    ).values_list('id', flat=True))
+    if owned_ids != habit_ids:
+        return Response(
+            {'error': 'Habit not found', 'habit_ids': sorted(habit_ids - owned_ids)},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    entries = [
+        HabitEntry(habit_id=item['habit_id'], date=item['date'],
+                   completed=item['completed'], notes=item['notes'])
+        for item in check_ins.values()
+    ]
+    with transaction.atomic():
+        # bulk_create skips HabitEntry.save(), so streaks are rebuilt once per habit below
+        HabitEntry.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['habit', 'date'],
+            update_fields=['completed', 'notes'],
+        )
+        habits = recompute_streaks(Habit.objects.filter(id__in=habit_ids))
+    # Neither bulk write sends signals
+    bump_habits_version(request.user.id)
+    
+    return Response({
+        'updated': len(entries),
+        'habits': HabitSerializer(habits, many=True, context={'request': request}).data,
+    })
@@ -0,0 +1,64 @@
+# connections/graph.py
+from django.conf import settings
+from django.core.cache import cache
+from .models import ConnectionEdge
+
+
+def _cache_key(user_id):
+    return f'connections:adjacency:{user_id}'
+
+
+def _load_adjacencies(user_ids):
+    adjacencies = {user_id: {} for user_id in user_ids}
+    edges = ConnectionEdge.objects.filter(
+        user_id__in=user_ids
+    ).values_list('user_id', 'other_user_id', 'connection_type')
+    for user_id, other_user_id, connection_type in edges:
+        adjacencies[user_id][other_user_id] = connection_type
+    return adjacencies
+
+
+def get_adjacencies(user_ids):
+    """{user_id: {neighbour_id: connection_type}} for many users, loading
+    whatever the cache is missing with a single query"""
+    keys = {_cache_key(user_id): user_id for user_id in user_ids}
+    cached = cache.get_many(keys)
+    adjacencies = {keys[key]: adjacency for key, adjacency in cached.items()}
+
+    missing = [user_id for user_id in user_ids if user_id not in adjacencies]
+    if missing:
+        loaded = _load_adjacencies(missing)
+        cache.set_many(
+            {_cache_key(user_id): adjacency for user_id, adjacency in loaded.items()},
+            settings.CONNECTION_GRAPH_CACHE_TIMEOUT
+        )
+        adjacencies.update(loaded)
+    return adjacencies
+
+
+def get_adjacency(user_id):
+    """{neighbour_id: connection_type} for every connection of user_id"""
+    return get_adjacencies([user_id])[user_id]
+
+
+async def aget_adjacency(user_id):
+    """get_adjacency for async views, loading a miss with the async ORM"""
+    adjacency = await cache.aget(_cache_key(user_id))
+    if adjacency is None:
+        edges = ConnectionEdge.objects.filter(user_id=user_id).values_list('other_user_id', 'connection_type')
+        adjacency = {other_user_id: connection_type async for other_user_id, connection_type in edges}
+        await cache.aset(_cache_key(user_id), adjacency, settings.CONNECTION_GRAPH_CACHE_TIMEOUT)
+    return adjacency
+
+
+def connection_type_between(user_id, other_user_id):
+    """'connection', 'friend', or None when the users are not connected"""
+    return get_adjacency(user_id).get(other_user_id)
+
+
+def are_connected(user_id, other_user_id):
+    return other_user_id in get_adjacency(user_id)
+
+
+def invalidate_adjacency(*user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
@@ -0,0 +1,91 @@
+# connections/interest_index.py
+import threading
+from bisect import bisect_left
+from itertools import islice
+from django.utils.text import slugify
+from minsoto.conditional import bump_version, get_version
+from .models import Interest
+
+VERSION_KEY = 'interest_index:version'
+
+
+class InterestIndex:
+    """Per-worker typeahead index over the Interest table.
+
+    Interests are few and rarely change, so each worker loads them once and
+    answers searches from memory. Every suffix of every lower-cased name is
+    kept in one sorted array: a substring query is a bisect range over it,
+    and a prefix query is the same lookup restricted to whole-name suffixes.
+
+    Writes bump a version in the cache (see connections/signals.py); workers
+    compare it on each lookup and reload when it moves.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._interests = []  # Sorted by (category, name), like the API
+        self._suffixes = []   # Sorted (suffix, position in _interests, is_prefix)
+        self._ids = {}        # id, lower-cased name and slug -> id
+
+    def invalidate(self):
+        bump_version(VERSION_KEY)
+
+    def version(self):
+        return get_version(VERSION_KEY)
+
+    def search(self, search=None, category=None, prefix_only=False):
+        """Interests whose name contains (or, with prefix_only, starts with)
+        `search`, case-insensitively, in (category, name) order"""
+        interests, suffixes = self._get()
+
+        if search:
+            term = search.lower()
+            start = bisect_left(suffixes, (term,))
+            positions = set()
+            for suffix, position, is_prefix in islice(suffixes, start, None):
+                if not suffix.startswith(term):
+                    break
+                if is_prefix or not prefix_only:
+                    positions.add(position)
+            interests = [interests[position] for position in sorted(positions)]
+
+        if category:
+            interests = [interest for interest in interests if interest.category == category]
+        return interests
+
+    def resolve(self, keys):
+        """Ids of the interests named by `keys`, each an id, a name (any
+        case) or a slug of the name; unknown keys are skipped"""
+        self._get()
+        known = self._ids
+        ids = (known.get(key.strip().lower()) for key in keys)
+        return list(dict.fromkeys(interest_id for interest_id in ids if interest_id is not None))
+
+    def _get(self):
+        version = self.version()
+        with self._lock:
+            if self._version != version:
+                self._load()
+                self._version = version
+            return self._interests, self._suffixes
+
+    def _load(self):
+        interests = sorted(Interest.objects.all(), key=lambda interest: (interest.category, interest.name))
+        suffixes = []
+        for position, interest in enumerate(interests):
+            name = interest.name.lower()
+            suffixes.extend((name[i:], position, i == 0) for i in range(len(name)))
+        suffixes.sort()
+        # Ids win over names, and names over slugs, should they ever clash
+        ids = {str(interest.id): interest.id for interest in interests}
+        for interest in interests:
+            ids.setdefault(interest.name.lower(), interest.id)
+        for interest in interests:
+            ids.setdefault(slugify(interest.name), interest.id)
+        self._interests = interests
+        self._suffixes = suffixes
+        self._ids = ids
+
+
+interest_index = InterestIndex()
@@ -0,0 +1,105 @@
+# connections/management/commands/benchmark_suggestions.py
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from connections import recommendations
+
+
+class Command(BaseCommand):
+    help = ('Offline benchmark for connections.recommendations. Builds a synthetic '
+            'connection graph, then times building the SuggestionGraph and scoring a '
+            'sample of users with and without NumPy. It checks that both give the same '
+            'suggestions and projects the time for a full refresh_suggestions run. '
+            'No database needed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--degree', type=int, default=20, help='Average connections per user')
+        parser.add_argument('--community', type=int, default=50,
+                            help='Users per community; most connections stay inside one')
+        parser.add_argument('--interests', type=int, default=200)
+        parser.add_argument('--sample', type=int, default=1000, help='Users scored per backend')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        users = options['users']
+        started = time.perf_counter()
+        edges = self.make_edges(users, options['degree'], options['community'])
+        profile_interests = self.make_interests(users, options['interests'])
+        connection_interests = self.make_connection_interests(edges, profile_interests)
+        self.stdout.write(
+            f'{users:,} users, {len(edges):,} edges, {len(profile_interests):,} profile interests, '
+            f'{len(connection_interests):,} connection interests '
+            f'(generated in {time.perf_counter() - started:.1f}s)'
+        )
+
+        sample = self.random.sample(range(users), min(options['sample'], users))
+        backends = [('python', None)]
+        if recommendations.numpy is not None:
+            backends.insert(0, ('numpy', recommendations.numpy))
+
+        self.stdout.write(f"{'backend':<8} {'build s':>8} {'ms/user':>8} {'full run s':>11}")
+        results = {}
+        installed = recommendations.numpy
+        try:
+            for name, module in backends:
+                recommendations.numpy = module
+                started = time.perf_counter()
+                graph = recommendations.SuggestionGraph(edges, profile_interests, connection_interests)
+                build = time.perf_counter() - started
+
+                started = time.perf_counter()
+                results[name] = [graph.suggest(user_id, settings.SUGGESTIONS_LIMIT) for user_id in sample]
+                per_user = (time.perf_counter() - started) / len(sample)
+                self.stdout.write(f'{name:<8} {build:8.2f} {per_user * 1000:8.3f} {build + per_user * users:11.1f}')
+        finally:
+            recommendations.numpy = installed
+
+        if len(results) == 2:
+            if results['numpy'] == results['python']:
+                self.stdout.write(self.style.SUCCESS('NumPy and Python suggestions match'))
+            else:
+                self.stdout.write(self.style.ERROR('NumPy and Python suggestions differ'))
+
+    def make_edges(self, users, degree, community):
+        """Both directions of about users * degree / 2 connections, most of
+        them inside a user's community so friends-of-friends overlap"""
+        pairs = set()
+        while len(pairs) < users * degree // 2:
+            user_id = self.random.randrange(users)
+            if self.random.random() < 0.8:
+                base = user_id - user_id % community
+                other_user_id = self.random.randrange(base, min(base + community, users))
+            else:
+                other_user_id = self.random.randrange(users)
+            if user_id != other_user_id:
+                pairs.add((min(user_id, other_user_id), max(user_id, other_user_id)))
+        return [edge for user_id, other_user_id in pairs for edge in ((user_id, other_user_id), (other_user_id, user_id))]
+
+    def make_interests(self, users, interests):
+        """(user_id, interest_id) for one to five interests per user, some
+        interests much more popular than others"""
+        weights = [1 / (rank + 1) for rank in range(interests)]
+        rows = []
+        for user_id in range(users):
+            for interest_id in set(self.random.choices(range(interests), weights, k=self.random.randint(1, 5))):
+                rows.append((user_id, interest_id))
+        return rows
+
+    def make_connection_interests(self, edges, profile_interests):
+        """(user_id, interest_id) for about a third of the edges, the interest
+        taken from the other user's profile. Users get the same interest over
+        several connections, and often already have it themselves, so the
+        duplicates the real tables produce are covered."""
+        interests = {}
+        for user_id, interest_id in profile_interests:
+            interests.setdefault(user_id, []).append(interest_id)
+        return [
+            (user_id, self.random.choice(interests[other_user_id]))
+            for user_id, other_user_id in edges
+            if other_user_id in interests and self.random.random() < 0.3
+        ]
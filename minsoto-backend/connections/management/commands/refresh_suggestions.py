@@ -0,0 +1,19 @@
+# connections/management/commands/refresh_suggestions.py
+import time
+from django.core.management.base import BaseCommand
+from connections.recommendations import refresh_suggestions
+
+class Command(BaseCommand):
+    help = ('Recompute every user\'s connection suggestions from the whole connection '
+            'graph and store them for the suggestions API. Run periodically, e.g. hourly '
+            'from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users written per transaction')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        refreshed = refresh_suggestions(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed suggestions for {refreshed} users in {time.perf_counter() - started:.1f}s'
+        ))
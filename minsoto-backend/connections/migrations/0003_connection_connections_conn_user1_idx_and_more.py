@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0002_alter_connection_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='connection',
+            index=models.Index(fields=['user1', '-created_at', '-id'], name='connections_conn_user1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connection',
+            index=models.Index(fields=['user2', '-created_at', '-id'], name='connections_conn_user2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionrequest',
+            index=models.Index(fields=['receiver', 'status', '-created_at', '-id'], name='connections_req_inbox_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interest',
+            index=models.Index(fields=['category', 'name'], name='connections_interest_cat_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-18 18:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0003_connection_connections_conn_user1_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConnectionEdge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('connection_type', models.CharField(choices=[('connection', 'Connection'), ('friend', 'Friend')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='connection',
+            name='connections_conn_user1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='connection',
+            name='connections_conn_user2_idx',
+        ),
+        migrations.AddField(
+            model_name='connectionedge',
+            name='connection',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='edges', to='connections.connection'),
+        ),
+        migrations.AddField(
+            model_name='connectionedge',
+            name='other_user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='connectionedge',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='connection_edges', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='connectionedge',
+            index=models.Index(fields=['user', '-created_at', '-id'], include=('other_user', 'connection', 'connection_type'), name='connections_edge_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='connectionedge',
+            index=models.Index(fields=['user', 'connection_type', '-created_at', '-id'], include=('other_user', 'connection'), name='connections_edge_user_type_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='connectionedge',
+            unique_together={('user', 'other_user')},
+        ),
+    ]
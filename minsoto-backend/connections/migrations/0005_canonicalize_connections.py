@@ -0,0 +1,56 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def canonicalize_connections(apps, schema_editor):
+    """Store every pair lower id first, merging pairs saved in both orders"""
+    Connection = apps.get_model('connections', 'Connection')
+
+    for connection in Connection.objects.filter(user1_id__gt=F('user2_id')).iterator():
+        twin = Connection.objects.filter(user1_id=connection.user2_id, user2_id=connection.user1_id).first()
+        if twin is None:
+            Connection.objects.filter(pk=connection.pk).update(
+                user1_id=connection.user2_id, user2_id=connection.user1_id
+            )
+            continue
+
+        # Keep the older row, the closer relationship, and both interest sets
+        if connection.connection_type == 'friend':
+            twin.connection_type = 'friend'
+        twin.created_at = min(twin.created_at, connection.created_at)
+        twin.save(update_fields=['connection_type', 'created_at'])
+        twin.interests.add(*connection.interests.all())
+        connection.delete()
+
+
+def build_connection_edges(apps, schema_editor):
+    Connection = apps.get_model('connections', 'Connection')
+    ConnectionEdge = apps.get_model('connections', 'ConnectionEdge')
+
+    edges = []
+    for connection in Connection.objects.iterator(chunk_size=2000):
+        for user_id, other_user_id in ((connection.user1_id, connection.user2_id),
+                                       (connection.user2_id, connection.user1_id)):
+            edges.append(ConnectionEdge(
+                connection_id=connection.pk,
+                user_id=user_id,
+                other_user_id=other_user_id,
+                connection_type=connection.connection_type,
+                created_at=connection.created_at,
+            ))
+        if len(edges) >= 2000:
+            ConnectionEdge.objects.bulk_create(edges)
+            edges = []
+    ConnectionEdge.objects.bulk_create(edges)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0004_connectionedge_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(canonicalize_connections, migrations.RunPython.noop),
+        migrations.RunPython(build_connection_edges, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Separate from the data migration: PostgreSQL refuses to ALTER a table
+# with pending deferred FK checks from rows updated in the same transaction.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0005_canonicalize_connections'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='connection',
+            constraint=models.CheckConstraint(condition=models.Q(('user1__lt', models.F('user2'))), name='connections_connection_canonical_order'),
+        ),
+    ]
@@ -11,6 +11,9 @@ class Interest(models.Model):
     
     class Meta:
         ordering = ['category', 'name']
+        indexes = [
+            models.Index(fields=['category', 'name'], name='connections_interest_cat_idx'),
+        ]
     
     def __str__(self):
         return self.name
@@ -39,6 +42,9 @@ class ConnectionRequest(models.Model):
     class Meta:
         unique_together = ['sender', 'receiver', 'request_type']  # One request per type per user pair
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['receiver', 'status', '-created_at', '-id'], name='connections_req_inbox_idx'),
+        ]
     
     def __str__(self):
         return f"{self.sender.username} → {self.receiver.username} ({self.request_type})"
@@ -58,10 +64,65 @@ class Connection(models.Model):
     class Meta:
         unique_together = ['user1', 'user2']
         ordering = ['-created_at']
+        constraints = [
+            # Each pair is stored once, lower id first (see save())
+            models.CheckConstraint(condition=models.Q(user1__lt=models.F('user2')), name='connections_connection_canonical_order'),
+        ]
     
     def __str__(self):
         return f"{self.user1.username} ⇄ {self.user2.username} ({self.connection_type})"
     
+    def save(self, *args, **kwargs):
+        if self.user1_id > self.user2_id:
+            self.user1, self.user2 = self.user2, self.user1
+        super().save(*args, **kwargs)
+    
+    @staticmethod
+    def canonical_pair(user_id, other_user_id):
+        """Lookup kwargs for the pair, matching the stored order"""
+        return {'user1_id': min(user_id, other_user_id), 'user2_id': max(user_id, other_user_id)}
+    
     def get_other_user(self, current_user):
         """Helper method to get the other user in the connection"""
         return self.user2 if self.user1 == current_user else self.user1
+
+class ConnectionEdge(models.Model):
+    """One row per direction of a Connection, kept in sync by signals.
+    
+    Lets "my connections" and adjacency loads be a range scan on user
+    instead of an OR over user1/user2.
+    """
+    connection = models.ForeignKey(Connection, on_delete=models.CASCADE, related_name='edges')
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='connection_edges')
+    other_user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='+')
+    connection_type = models.CharField(max_length=20, choices=Connection.CONNECTION_TYPES)
+    created_at = models.DateTimeField()  # Copied from the connection
+    
+    class Meta:
+        unique_together = ['user', 'other_user']
+        indexes = [
+            # Covering indexes for keyset pages of a user's connections, with
+            # and without a type filter (INCLUDE is PostgreSQL-only)
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                include=['other_user', 'connection', 'connection_type'],
+                name='connections_edge_user_idx',
+            ),
+            models.Index(
+                fields=['user', 'connection_type', '-created_at', '-id'],
+                include=['other_user', 'connection'],
+                name='connections_edge_user_type_idx',
+            ),
+        ]
+
+class Suggestion(models.Model):
+    """A precomputed "people you may know" entry, rebuilt for every user by
+    the refresh_suggestions command (see connections/recommendations.py)"""
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='suggestions')
+    suggested_user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='+')
+    mutual_connections = models.PositiveIntegerField()
+    shared_interests = models.PositiveIntegerField()
+    score = models.FloatField()
+    
+    class Meta:
+        unique_together = ['user', 'suggested_user']
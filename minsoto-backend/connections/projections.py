@@ -0,0 +1,22 @@
+# connections/projections.py
+from rest_framework import serializers
+from minsoto.projections import iso_datetime
+from users.projections import project_public_user
+
+
+def project_interest(interest):
+    return {'id': interest.id, 'name': interest.name, 'description': interest.description}
+
+
+class ConnectionEdgeProjection(serializers.BaseSerializer):
+    """Read-only stand-in for ConnectionEdgeSerializer (and so for the
+    ConnectionSerializer shape); see users.projections"""
+
+    def to_representation(self, edge):
+        return {
+            'id': edge.connection_id,
+            'user': project_public_user(edge.other_user),
+            'connection_type': edge.connection_type,
+            'interests': [project_interest(interest) for interest in edge.connection.interests.all()],
+            'created_at': iso_datetime(edge.created_at),
+        }
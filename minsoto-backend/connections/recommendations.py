@@ -0,0 +1,208 @@
+# connections/recommendations.py
+try:
+    import numpy
+except ImportError:  # Optional; the graph is walked in plain Python without it
+    numpy = None
+
+from collections import Counter, defaultdict
+from itertools import chain, islice
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from users.models import CustomUser, Profile
+from .models import ConnectionEdge, Suggestion
+
+MUTUAL_WEIGHT = 1.0
+INTEREST_WEIGHT = 0.5
+# Bounds the friends-of-friends walk for very well-connected users
+MAX_NEIGHBOURS_SCANNED = 500
+
+ProfileInterest = Profile.interests.through
+
+
+def get_suggestions(user_id):
+    """The user's precomputed suggestions, best first. Only reads the
+    Suggestion rows written by refresh_suggestions()."""
+    return Suggestion.objects.filter(user_id=user_id).select_related(
+        'suggested_user__profile'
+    ).order_by('-score', 'suggested_user_id')
+
+
+def drop_suggestions(user_id, other_user_id):
+    """Forget suggesting two users to each other once they connect, without
+    waiting for the next refresh"""
+    Suggestion.objects.filter(
+        Q(user_id=user_id, suggested_user_id=other_user_id) |
+        Q(user_id=other_user_id, suggested_user_id=user_id)
+    ).delete()
+
+
+class SuggestionGraph:
+    """Every user's connections and interests, held in memory to score
+    suggestions for many users in one pass.
+
+    With NumPy the lists are stored CSR-style: users are numbered 0..n-1,
+    neighbours of user i are indices[indptr[i]:indptr[i + 1]], and interest
+    members are laid out the same way, so counting friends-of-friends or
+    interest overlap is one bincount() over concatenated slices. Without it
+    the lists are dicts and counting uses Counter. Both give the same
+    suggestions.
+    """
+
+    def __init__(self, edges, profile_interests, connection_interests=()):
+        """edges are (user_id, other_user_id) per direction, as in
+        ConnectionEdge. profile_interests are (user_id, interest_id) and make
+        users candidates for others with the interest; connection_interests
+        only add to the user's own interests, as the interests their
+        connections were made over."""
+        if numpy is not None:
+            self._build_arrays(edges, profile_interests, connection_interests)
+        else:
+            self._build_lists(edges, profile_interests, connection_interests)
+
+    def _build_lists(self, edges, profile_interests, connection_interests):
+        self.neighbours = defaultdict(list)
+        for user_id, other_user_id in edges:
+            self.neighbours[user_id].append(other_user_id)
+        self.members = defaultdict(list)
+        self.own_interests = defaultdict(set)
+        for user_id, interest_id in profile_interests:
+            self.members[interest_id].append(user_id)
+            self.own_interests[user_id].add(interest_id)
+        for user_id, interest_id in connection_interests:
+            self.own_interests[user_id].add(interest_id)
+
+    def _build_arrays(self, edges, profile_interests, connection_interests):
+        edges, profile_interests, connection_interests = (
+            _pairs(edges), _pairs(profile_interests), _pairs(connection_interests)
+        )
+        self.user_ids = numpy.unique(numpy.concatenate(
+            [edges.ravel(), profile_interests[:, 0], connection_interests[:, 0]]
+        ))
+        self.interest_ids = numpy.unique(profile_interests[:, 1])
+        self.indptr, self.indices = _csr(
+            self._numbers(edges[:, 0]), self._numbers(edges[:, 1]), len(self.user_ids)
+        )
+        self.member_indptr, self.member_indices = _csr(
+            numpy.searchsorted(self.interest_ids, profile_interests[:, 1]),
+            self._numbers(profile_interests[:, 0]),
+            len(self.interest_ids),
+        )
+        # An interest can be both the user's own and one a connection was made
+        # over, or shared by several connections; it counts once, as in the sets
+        own = numpy.unique(numpy.concatenate([profile_interests, connection_interests]), axis=0)
+        self.own_indptr, self.own_interests = _csr(self._numbers(own[:, 0]), own[:, 1], len(self.user_ids))
+
+    def _numbers(self, user_ids):
+        return numpy.searchsorted(self.user_ids, user_ids)
+
+    def suggest(self, user_id, limit):
+        """[(user_id, mutual_connections, shared_interests, score)] for up to
+        `limit` users user_id is not connected to, best first"""
+        if numpy is not None:
+            return self._suggest_arrays(user_id, limit)
+        return self._suggest_lists(user_id, limit)
+
+    def _suggest_lists(self, user_id, limit):
+        neighbours = self.neighbours.get(user_id, [])
+        excluded = set(neighbours) | {user_id}
+
+        mutual = Counter()
+        for neighbour in neighbours[:MAX_NEIGHBOURS_SCANNED]:
+            mutual.update(self.neighbours.get(neighbour, ()))
+        shared = Counter()
+        for interest_id in self.own_interests.get(user_id, ()):
+            shared.update(self.members.get(interest_id, ()))
+
+        suggestions = [
+            (candidate, mutual[candidate], shared[candidate],
+             MUTUAL_WEIGHT * mutual[candidate] + INTEREST_WEIGHT * shared[candidate])
+            for candidate in (set(mutual) | set(shared)) - excluded
+        ]
+        suggestions.sort(key=lambda suggestion: (-suggestion[3], suggestion[0]))
+        return suggestions[:limit]
+
+    def _suggest_arrays(self, user_id, limit):
+        number = self._numbers(user_id)
+        if number == len(self.user_ids) or self.user_ids[number] != user_id:
+            return []  # No connections or interests at all
+
+        neighbours = self.indices[self.indptr[number]:self.indptr[number + 1]]
+        friends_of_friends = _slices(self.indptr, self.indices, neighbours[:MAX_NEIGHBOURS_SCANNED])
+        interests = self.own_interests[self.own_indptr[number]:self.own_indptr[number + 1]]
+        positions = numpy.searchsorted(self.interest_ids, interests)
+        known = positions < len(self.interest_ids)
+        known[known] = self.interest_ids[positions[known]] == interests[known]
+        members = _slices(self.member_indptr, self.member_indices, positions[known])
+
+        # Dense counts over every user: cheaper than sorting the (often
+        # large) member lists, and excluding users is plain indexing
+        size = len(self.user_ids)
+        mutual = numpy.bincount(friends_of_friends, minlength=size)
+        shared = numpy.bincount(members, minlength=size)
+        scores = MUTUAL_WEIGHT * mutual + INTEREST_WEIGHT * shared
+        scores[neighbours] = 0
+        scores[number] = 0
+
+        candidates = numpy.flatnonzero(scores)
+        if len(candidates) > limit:
+            # Keep the top `limit` scores, and anything tied with the last of them
+            cutoff = -numpy.partition(-scores[candidates], limit - 1)[limit - 1]
+            candidates = candidates[scores[candidates] >= cutoff]
+        # Users are numbered in id order, so this breaks ties by id
+        best = candidates[numpy.lexsort((candidates, -scores[candidates]))[:limit]]
+        return [
+            (int(self.user_ids[i]), int(mutual[i]), int(shared[i]), float(scores[i]))
+            for i in best
+        ]
+
+
+def _pairs(rows):
+    """An (n, 2) int64 array from an iterable of pairs, without a list of tuples in between"""
+    return numpy.fromiter(chain.from_iterable(rows), dtype=numpy.int64).reshape(-1, 2)
+
+
+def _csr(rows, columns, size):
+    """(indptr, indices) for the given row/column pairs; rows keep their input order"""
+    order = numpy.argsort(rows, kind='stable')
+    indptr = numpy.zeros(size + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(rows, minlength=size), out=indptr[1:])
+    return indptr, columns[order]
+
+
+def _slices(indptr, indices, rows):
+    """The given rows' entries, concatenated"""
+    if not len(rows):
+        return numpy.empty(0, dtype=indices.dtype)
+    return numpy.concatenate([indices[indptr[row]:indptr[row + 1]] for row in rows])
+
+
+def load_graph():
+    """A SuggestionGraph of every connection and interest in the database"""
+    return SuggestionGraph(
+        ConnectionEdge.objects.values_list('user_id', 'other_user_id').iterator(chunk_size=10000),
+        ProfileInterest.objects.values_list('profile__user_id', 'interest_id').iterator(chunk_size=10000),
+        ConnectionEdge.objects.filter(connection__interests__isnull=False).values_list(
+            'user_id', 'connection__interests'
+        ).iterator(chunk_size=10000),
+    )
+
+
+def refresh_suggestions(batch_size=1000):
+    """Rebuild every user's Suggestion rows from one in-memory graph, a
+    batch of users per transaction; returns how many users were refreshed"""
+    graph = load_graph()
+    user_ids = iter(CustomUser.objects.order_by('pk').values_list('pk', flat=True))
+    refreshed = 0
+    while batch := list(islice(user_ids, batch_size)):
+        rows = [
+            Suggestion(user_id=user_id, suggested_user_id=candidate, mutual_connections=mutual,
+                       shared_interests=shared, score=score)
+            for user_id in batch
+            for candidate, mutual, shared, score in graph.suggest(user_id, settings.SUGGESTIONS_LIMIT)
+        ]
+        with transaction.atomic():
+            Suggestion.objects.filter(user_id__in=batch).delete()
+            Suggestion.objects.bulk_create(rows, batch_size=1000)
+        refreshed += len(batch)
+    return refreshed
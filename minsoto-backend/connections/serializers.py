@@ -1,6 +1,6 @@
 # connections/serializers.py
 from rest_framework import serializers
-from .models import Interest, ConnectionRequest, Connection
+from .models import Interest, ConnectionRequest, Connection, ConnectionEdge
 from users.serializers import PublicUserSerializer
 
 class InterestSerializer(serializers.ModelSerializer):
@@ -30,3 +30,14 @@ class ConnectionSerializer(serializers.ModelSerializer):
         request_user = self.context['request'].user
         other_user = obj.user2 if obj.user1 == request_user else obj.user1
         return PublicUserSerializer(other_user).data
+
+
+class ConnectionEdgeSerializer(serializers.ModelSerializer):
+    """Same shape as ConnectionSerializer, read from the viewer's side of the edge"""
+    id = serializers.IntegerField(source='connection_id', read_only=True)
+    user = PublicUserSerializer(source='other_user', read_only=True)
+    interests = InterestSerializer(source='connection.interests', many=True, read_only=True)
+    
+    class Meta:
+        model = ConnectionEdge
+        fields = ['id', 'user', 'connection_type', 'interests', 'created_at']
@@ -0,0 +1,46 @@
+# connections/signals.py
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .graph import invalidate_adjacency
+from .interest_index import interest_index
+from .recommendations import drop_suggestions
+from .models import Interest, Connection, ConnectionEdge
+
+@receiver(post_save, sender=Interest)
+@receiver(post_delete, sender=Interest)
+def invalidate_interest_index(sender, **kwargs):
+    """Make every worker reload its typeahead index on the next lookup"""
+    interest_index.invalidate()
+
+@receiver(post_save, sender=Connection)
+def sync_connection_edges(sender, instance, created, **kwargs):
+    """Mirror the connection into one edge per direction (deletes cascade)"""
+    if created:
+        ConnectionEdge.objects.bulk_create([
+            ConnectionEdge(connection=instance, user_id=user_id, other_user_id=other_user_id,
+                           connection_type=instance.connection_type, created_at=instance.created_at)
+            for user_id, other_user_id in ((instance.user1_id, instance.user2_id),
+                                           (instance.user2_id, instance.user1_id))
+        ])
+    else:
+        ConnectionEdge.objects.filter(connection=instance).update(connection_type=instance.connection_type)
+
+@receiver(post_save, sender=Connection)
+@receiver(post_delete, sender=Connection)
+def invalidate_connection_graph(sender, instance, **kwargs):
+    """Drop both users' cached adjacency once the change commits.
+    
+    Dropping it earlier would let a concurrent reader reload the old edges
+    and cache them for CONNECTION_GRAPH_CACHE_TIMEOUT, which fan_out_post
+    would then trust.
+    """
+    user_ids = (instance.user1_id, instance.user2_id)
+    transaction.on_commit(lambda: invalidate_adjacency(*user_ids))
+
+@receiver(post_save, sender=Connection)
+def drop_stale_suggestions(sender, instance, created, **kwargs):
+    """Stop suggesting the pair to each other now that they are connected;
+    everything else waits for the next refresh_suggestions run"""
+    if created:
+        drop_suggestions(instance.user1_id, instance.user2_id)
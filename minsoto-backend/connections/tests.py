@@ -1,3 +1,118 @@
-from django.test import TestCase
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from minsoto.testing import APITestCase, make_user
+from . import recommendations
+from .graph import _cache_key, get_adjacency
+from .interest_index import VERSION_KEY, InterestIndex
+from .models import Connection, ConnectionRequest, Interest
+
+
+class ConnectionRequestETagTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer = make_user('receiver')
+        cls.requests = [
+            ConnectionRequest.objects.create(sender=make_user(f'sender{i}'), receiver=cls.viewer, request_type='connection')
+            for i in range(4)
+        ]
+
+    def get_page(self, etag):
+        return self.client.get('/api/connections/requests/?page_size=2', HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_page_is_not_modified(self):
+        etag = self.get_page('')['ETag']
+        self.assertEqual(self.get_page(etag).status_code, 304)
+
+    def test_declining_an_older_request_changes_the_etag(self):
+        response = self.get_page('')
+        # Newest first: the page holds requests[3] and requests[2]
+        self.assertEqual([row['id'] for row in response.data['results']], [self.requests[3].id, self.requests[2].id])
+
+        respond = self.client.post(f'/api/connections/requests/{self.requests[2].id}/respond/', {'action': 'decline'})
+        self.assertEqual(respond.status_code, 200)
+
+        # Same count and newest row, but requests[1] moved up into the page
+        response = self.get_page(response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['id'] for row in response.data['results']], [self.requests[3].id, self.requests[1].id])
+
+
+class AdjacencyCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user, self.other = make_user('user'), make_user('other')
+
+    def test_connecting_drops_cached_adjacency_after_commit(self):
+        self.assertEqual(get_adjacency(self.user.id), {})
+        with self.captureOnCommitCallbacks(execute=True):
+            Connection.objects.create(user1=self.user, user2=self.other, connection_type='friend')
+            # A concurrent reader still sees the committed state and caches it
+            cache.set(_cache_key(self.user.id), {}, None)
+        self.assertEqual(get_adjacency(self.user.id), {self.other.id: 'friend'})
+        self.assertEqual(get_adjacency(self.other.id), {self.user.id: 'friend'})
+
+    def test_disconnecting_drops_cached_adjacency_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            connection = Connection.objects.create(user1=self.user, user2=self.other, connection_type='friend')
+        self.assertEqual(get_adjacency(self.user.id), {self.other.id: 'friend'})
+        with self.captureOnCommitCallbacks(execute=True):
+            connection.delete()
+        self.assertEqual(get_adjacency(self.user.id), {})
+
+
+class InterestIndexTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def names(self, index):
+        return [interest.name for interest in index.search()]
+
+    def test_reloads_after_a_change(self):
+        index = InterestIndex()
+        Interest.objects.create(name='Chess')
+        self.assertEqual(self.names(index), ['Chess'])
+        Interest.objects.create(name='Go')
+        self.assertEqual(self.names(index), ['Chess', 'Go'])
+
+    def test_reloads_after_the_version_is_evicted(self):
+        index = InterestIndex()
+        Interest.objects.create(name='Chess')
+        self.assertEqual(self.names(index), ['Chess'])
+        # A counter that restarted would land on the version already loaded
+        cache.delete(VERSION_KEY)
+        Interest.objects.create(name='Go')
+        self.assertEqual(self.names(index), ['Chess', 'Go'])
+
+
+class SuggestionGraphTests(SimpleTestCase):
+    edges = [(1, 2), (2, 1), (2, 3), (3, 2), (3, 4), (4, 3), (1, 5), (5, 1), (5, 3), (3, 5)]
+    profile_interests = [(1, 10), (3, 10), (4, 10), (4, 11), (6, 11)]
+    # User 1 has interest 10 themselves and over two connections, and 11 only over one
+    connection_interests = [(1, 10), (1, 10), (1, 11), (2, 10)]
+    expected = [
+        (3, 2, 1, 2.5),  # Through 2 and 5, and interest 10
+        (4, 0, 2, 1.0),  # Interests 10 and 11, each counted once
+        (6, 0, 1, 0.5),
+    ]
+
+    def suggest(self, backend):
+        with mock.patch.object(recommendations, 'numpy', backend):
+            graph = recommendations.SuggestionGraph(self.edges, self.profile_interests, self.connection_interests)
+            return graph.suggest(1, 10)
+
+    def test_python_backend(self):
+        self.assertEqual(self.suggest(None), self.expected)
+
+    @skipIf(recommendations.numpy is None, 'NumPy is not installed')
+    def test_numpy_backend(self):
+        self.assertEqual(self.suggest(recommendations.numpy), self.expected)
+
+    def test_user_without_connections_or_interests(self):
+        graph = recommendations.SuggestionGraph(self.edges, self.profile_interests)
+        self.assertEqual(graph.suggest(99, 10), [])
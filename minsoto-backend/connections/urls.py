@@ -8,4 +8,6 @@ urlpatterns = [
     path('requests/send/', views.send_connection_request, name='send_connection_request'),
     path('requests/<int:request_id>/respond/', views.respond_to_connection_request, name='respond_connection_request'),
     path('my-connections/', views.MyConnectionsView.as_view(), name='my_connections'),
+    path('my-connections/async/', views.AsyncMyConnectionsView.as_view(), name='my_connections_async'),
+    path('suggestions/', views.connection_suggestions, name='connection_suggestions'),
 ]
@@ -3,29 +3,38 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from .models import Interest, ConnectionRequest, Connection
-from .serializers import InterestSerializer, ConnectionRequestSerializer, ConnectionSerializer
+from django.utils import timezone
+from .models import Interest, ConnectionRequest, Connection, ConnectionEdge
+from .serializers import InterestSerializer, ConnectionRequestSerializer
+from .projections import ConnectionEdgeProjection
+from .graph import are_connected
+from .interest_index import interest_index
+from .recommendations import get_suggestions
+from minsoto.async_views import AsyncListView
+from minsoto.conditional import ConditionalGetMixin
+from notifications.events import notify
+from users.projections import project_public_user
 
-class InterestListCreateView(generics.ListCreateAPIView):
+class InterestListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = Interest.objects.all()
     serializer_class = InterestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_ordering = ('category', 'name')  # name is unique
+    
+    def get_validator_versions(self):
+        # The same version the index reloads on
+        return [interest_index.version()]
     
     def get_queryset(self):
-        queryset = Interest.objects.all()
-        category = self.request.query_params.get('category')
-        search = self.request.query_params.get('search')
-        
-        if category:
-            queryset = queryset.filter(category=category)
-        if search:
-            queryset = queryset.filter(name__icontains=search)
-        
-        return queryset.order_by('category', 'name')
+        # Served from the in-memory typeahead index, already in (category, name) order
+        return interest_index.search(
+            search=self.request.query_params.get('search'),
+            category=self.request.query_params.get('category'),
+        )
 
-class ConnectionRequestListView(generics.ListAPIView):
+class ConnectionRequestListView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = ConnectionRequestSerializer
     permission_classes = [IsAuthenticated]
     
@@ -35,22 +44,29 @@ class ConnectionRequestListView(generics.ListAPIView):
             status='pending'
         )
 
-class MyConnectionsView(generics.ListAPIView):
-    serializer_class = ConnectionSerializer
+class MyConnectionsView(ConditionalGetMixin, generics.ListAPIView):
+    serializer_class = ConnectionEdgeProjection
     permission_classes = [IsAuthenticated]
+    last_modified_field = 'created_at'  # Edges are replaced, never updated
     
     def get_queryset(self):
-        user = self.request.user
         connection_type = self.request.query_params.get('type')
         
-        queryset = Connection.objects.filter(
-            Q(user1=user) | Q(user2=user)
-        )
+        # The user's side of each connection: a range scan on (user, [type,] created_at)
+        queryset = ConnectionEdge.objects.filter(user=self.request.user)
         
         if connection_type:
             queryset = queryset.filter(connection_type=connection_type)
         
-        return queryset
+        return queryset.select_related('other_user__profile').prefetch_related('connection__interests')
+
+class AsyncMyConnectionsView(AsyncListView):
+    """MyConnectionsView on the async ORM"""
+    serializer_class = ConnectionEdgeProjection
+    
+    async def aget_queryset(self):
+        # Building the queryset runs no queries, so the sync view's code is reused as is
+        return MyConnectionsView.get_queryset(self)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -71,12 +87,7 @@ def send_connection_request(request):
             )
         
         # Check if connection already exists
-        existing_connection = Connection.objects.filter(
-            Q(user1=request.user, user2_id=serializer.validated_data['receiver_id']) |
-            Q(user1_id=serializer.validated_data['receiver_id'], user2=request.user)
-        ).first()
-        
-        if existing_connection:
+        if are_connected(request.user.id, serializer.validated_data['receiver_id']):
             return Response(
                 {'error': 'Connection already exists'}, 
                 status=status.HTTP_400_BAD_REQUEST
@@ -94,13 +105,6 @@ def send_connection_request(request):
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def respond_to_connection_request(request, request_id):
-    connection_request = get_object_or_404(
-        ConnectionRequest,
-        id=request_id,
-        receiver=request.user,
-        status='pending'
-    )
-    
     action = request.data.get('action')
     if action not in ['accept', 'decline']:
         return Response(
@@ -108,22 +112,61 @@ def respond_to_connection_request(request, request_id):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    if action == 'accept':
-        # Create connection
-        connection = Connection.objects.create(
-            user1=connection_request.sender,
-            user2=connection_request.receiver,
-            connection_type=connection_request.request_type
+    with transaction.atomic():
+        # Locked so a double-submitted accept cannot run twice
+        connection_request = get_object_or_404(
+            ConnectionRequest.objects.select_for_update(),
+            id=request_id,
+            receiver=request.user,
+            status='pending'
         )
         
-        # Add interest if specified
-        if connection_request.interest:
-            connection.interests.add(connection_request.interest)
+        if action == 'accept':
+            # The pair may already be connected: both users can have sent
+            # each other a request, and the other one was accepted first
+            connection, created = Connection.objects.get_or_create(
+                **Connection.canonical_pair(connection_request.sender_id, connection_request.receiver_id),
+                defaults={'connection_type': connection_request.request_type}
+            )
+            if not created and connection_request.request_type == 'friend' and connection.connection_type != 'friend':
+                connection.connection_type = 'friend'
+                connection.save(update_fields=['connection_type'])
+            
+            # Add interest if specified
+            if connection_request.interest:
+                connection.interests.add(connection_request.interest)
+            
+            # A pending request the other way is answered by this one
+            ConnectionRequest.objects.filter(
+                sender=connection_request.receiver,
+                receiver=connection_request.sender,
+                status='pending'
+            ).update(status='accepted', updated_at=timezone.now())
+            
+            connection_request.status = 'accepted'
+        else:
+            connection_request.status = 'declined'
         
-        connection_request.status = 'accepted'
-    else:
-        connection_request.status = 'declined'
+        connection_request.save()
     
-    connection_request.save()
+    notify([connection_request.sender_id], 'connection_response', {
+        'id': connection_request.id,
+        'status': connection_request.status,
+    })
     
     return Response({'status': 'success'})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def connection_suggestions(request):
+    """People the user may know, ranked by mutual connections and shared
+    interests. Precomputed by the refresh_suggestions command."""
+    return Response([
+        {
+            'user': project_public_user(suggestion.suggested_user),
+            'mutual_connections': suggestion.mutual_connections,
+            'shared_interests': suggestion.shared_interests,
+            'score': suggestion.score,
+        }
+        for suggestion in get_suggestions(request.user.id)
+    ])
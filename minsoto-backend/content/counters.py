@@ -0,0 +1,45 @@
+# content/counters.py
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Post, Like, Comment
+
+
+def adjust_post_counters(post_id, likes=0, comments=0):
+    """Apply counter deltas with a single UPDATE ... SET x = x + n.
+
+    Call inside the same transaction as the Like/Comment write so the
+    counter can never commit without the row it counts.
+    """
+    updates = {}
+    if likes:
+        updates['likes_count'] = F('likes_count') + likes
+    if comments:
+        updates['comments_count'] = F('comments_count') + comments
+    if updates:
+        Post.objects.filter(pk=post_id).update(**updates)
+
+
+def count_per_post(model):
+    """Subquery expression counting `model` rows for the outer post"""
+    return Coalesce(Subquery(
+        model.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post').annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def reconcile_post_counters(post_ids):
+    """Recompute counters for the given posts; returns the posts that drifted"""
+    posts = Post.objects.filter(pk__in=post_ids).annotate(
+        actual_likes=count_per_post(Like),
+        actual_comments=count_per_post(Comment),
+    ).only('id', 'likes_count', 'comments_count')
+
+    drifted = []
+    for post in posts:
+        if post.likes_count != post.actual_likes or post.comments_count != post.actual_comments:
+            post.likes_count = post.actual_likes
+            post.comments_count = post.actual_comments
+            drifted.append(post)
+
+    Post.objects.bulk_update(drifted, ['likes_count', 'comments_count'])
+    return drifted
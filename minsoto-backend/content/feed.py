@@ -0,0 +1,133 @@
+# content/feed.py
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from connections.graph import aget_adjacency, get_adjacency
+from .like_buffer import like_buffer
+from .models import Post, FeedEntry, Like
+from .streams import aselect_from_streams, keyset_after, select_from_streams
+
+# Fanned out to every connection; readers filter with content.visibility to
+# drop what they may not see (friends-only posts for plain connections,
+# circle posts for outsiders)
+FEED_VISIBILITIES = ['public', 'connections', 'friends', 'circle']
+
+
+def fan_out_post(post):
+    """Write a feed entry for the author and each of their connections.
+
+    Authors over FEED_FANOUT_THRESHOLD only get their own entry; the post is
+    flagged so readers pull it in at read time instead.
+    """
+    if post.visibility not in FEED_VISIBILITIES:
+        return
+
+    recipients = list(get_adjacency(post.author_id))
+    fanned_out = len(recipients) <= settings.FEED_FANOUT_THRESHOLD
+    if post.fanned_out != fanned_out:
+        Post.objects.filter(pk=post.pk).update(fanned_out=fanned_out)
+        post.fanned_out = fanned_out
+    if not fanned_out:
+        recipients = []
+
+    recipients.append(post.author_id)
+    FeedEntry.objects.bulk_create(
+        [FeedEntry(user_id=user_id, post=post, created_at=post.created_at) for user_id in recipients],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def link_feeds(user1_id, user2_id):
+    """Backfill each user's feed with the other's recent posts after connecting"""
+    entries = []
+    for reader_id, author_id in ((user1_id, user2_id), (user2_id, user1_id)):
+        recent_posts = Post.objects.filter(
+            author_id=author_id,
+            fanned_out=True,
+            visibility__in=FEED_VISIBILITIES
+        ).order_by('-created_at').values_list('id', 'created_at')[:settings.FEED_BACKFILL_SIZE]
+        entries.extend(
+            FeedEntry(user_id=reader_id, post_id=post_id, created_at=created_at)
+            for post_id, created_at in recent_posts
+        )
+    FeedEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+
+
+def unlink_feeds(user1_id, user2_id):
+    """Drop each user's posts from the other's feed after disconnecting"""
+    FeedEntry.objects.filter(
+        Q(user_id=user1_id, post__author_id=user2_id) |
+        Q(user_id=user2_id, post__author_id=user1_id)
+    ).delete()
+
+
+def get_connections_feed(user, queryset, position, limit):
+    """Narrow `queryset` to the first `limit` posts of the user's connections
+    feed after `position`, a (created_at, id) keyset position or None.
+    Returns (queryset, resume_position) as select_from_streams() does.
+
+    The page is read off the user's FeedEntry rows newest first, a range
+    scan on content_feed_user_idx, merged with the same window of posts from
+    connected authors too popular to fan out, which are pulled at read time.
+    """
+    post_ids, resume_position = select_from_streams(
+        _feed_streams(user, list(get_adjacency(user.id))), queryset, position, limit
+    )
+    return queryset.filter(pk__in=post_ids), resume_position
+
+
+async def aget_connections_feed(user, queryset, position, limit):
+    """get_connections_feed on the async ORM"""
+    post_ids, resume_position = await aselect_from_streams(
+        _feed_streams(user, list(await aget_adjacency(user.id))), queryset, position, limit
+    )
+    return queryset.filter(pk__in=post_ids), resume_position
+
+
+def _feed_streams(user, authors):
+    def read_streams(position, limit):
+        streams = [_entries_after(user, position, limit)]
+        if authors:
+            streams.append(_pulled_after(authors, position, limit))
+        return streams
+    return read_streams
+
+
+def _entries_after(user, position, limit):
+    entries = FeedEntry.objects.filter(user=user)
+    if position is not None:
+        entries = entries.filter(keyset_after(position, 'post_id'))
+    return entries.order_by('-created_at', '-post_id').values_list('created_at', 'post_id')[:limit]
+
+
+def _pulled_after(author_ids, position, limit):
+    posts = Post.objects.filter(fanned_out=False, author_id__in=author_ids)
+    if position is not None:
+        posts = posts.filter(keyset_after(position, 'id'))
+    return posts.order_by('-created_at', '-id').values_list('created_at', 'id')[:limit]
+
+
+def with_feed_data(queryset, user):
+    """Load everything PostSerializer reads in one query plus one prefetch,
+    instead of a query per post for is_liked and the nested author/interests.
+    Like and comment totals come from the counter columns on Post."""
+    return queryset.select_related('author__profile').prefetch_related('interests').annotate(
+        is_liked=Exists(Like.objects.filter(post=OuterRef('pk'), user=user)),
+    )
+
+
+def with_viewer_likes(results, user):
+    """Re-derive is_liked on serialized posts shared between viewers, such
+    as a cached page, with one query for the whole page"""
+    liked = set(Like.objects.filter(
+        user=user, post_id__in=[post['id'] for post in results]
+    ).values_list('post_id', flat=True))
+
+    def is_liked(post_id):
+        if settings.LIKE_BUFFER_ENABLED:
+            pending = like_buffer.pending_state(user.id, post_id)
+            if pending is not None:
+                return pending
+        return post_id in liked
+
+    return [{**post, 'is_liked': is_liked(post['id'])} for post in results]
@@ -0,0 +1,62 @@
+# content/interest_feed.py
+from django.db.models import Exists, OuterRef
+from .models import InterestFeedEntry, Post
+from .streams import aselect_from_streams, keyset_after, select_from_streams
+
+
+def add_interest_entries(post_ids, interest_ids):
+    """Index (post, interest) pairs just added to Post.interests"""
+    posts = Post.objects.filter(pk__in=post_ids).values_list('pk', 'created_at')
+    InterestFeedEntry.objects.bulk_create([
+        InterestFeedEntry(post_id=post_id, interest_id=interest_id, created_at=created_at)
+        for post_id, created_at in posts
+        for interest_id in interest_ids
+    ], batch_size=1000, ignore_conflicts=True)
+
+
+def remove_interest_entries(post_ids, interest_ids=None):
+    """Drop pairs removed from Post.interests; every pair of the posts when
+    interest_ids is None, as after a clear()"""
+    entries = InterestFeedEntry.objects.filter(post_id__in=post_ids)
+    if interest_ids is not None:
+        entries = entries.filter(interest_id__in=interest_ids)
+    entries.delete()
+
+
+def tagged_with_any(interest_ids):
+    """Exists() over the posts' interest entries, for querysets that are
+    already narrow (a connections feed) and would waste a stream walk"""
+    return Exists(InterestFeedEntry.objects.filter(post=OuterRef('pk'), interest_id__in=interest_ids))
+
+
+def filter_by_interests(queryset, interest_ids, position, limit):
+    """Narrow `queryset` to its first `limit` posts after `position`, a
+    (created_at, id) keyset position or None, tagged with any of interest_ids.
+    Returns (queryset, resume_position) as select_from_streams() does.
+
+    Each interest's entries are read newest first off content_interest_feed_idx
+    and k-way merged in memory instead of a DISTINCT join over the M2M table.
+    """
+    post_ids, resume_position = select_from_streams(_interest_streams(interest_ids), queryset, position, limit)
+    return queryset.filter(pk__in=post_ids), resume_position
+
+
+async def afilter_by_interests(queryset, interest_ids, position, limit):
+    """filter_by_interests on the async ORM"""
+    post_ids, resume_position = await aselect_from_streams(
+        _interest_streams(interest_ids), queryset, position, limit
+    )
+    return queryset.filter(pk__in=post_ids), resume_position
+
+
+def _interest_streams(interest_ids):
+    def read_streams(position, limit):
+        return [_entries_after(interest_id, position, limit) for interest_id in interest_ids]
+    return read_streams
+
+
+def _entries_after(interest_id, position, limit):
+    entries = InterestFeedEntry.objects.filter(interest_id=interest_id)
+    if position is not None:
+        entries = entries.filter(keyset_after(position, 'post_id'))
+    return entries.order_by('-created_at', '-post_id').values_list('created_at', 'post_id')[:limit]
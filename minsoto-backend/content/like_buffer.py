@@ -0,0 +1,140 @@
+# content/like_buffer.py
+import atexit
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
+from .counters import count_per_post
+from .models import Post, Like
+
+logger = logging.getLogger(__name__)
+
+
+class LikeBuffer:
+    """Coalesces like toggles in memory and writes them in batches.
+
+    Only the latest desired state of each (user, post) pair is kept, so a
+    storm of toggles on one post becomes one bulk insert, one bulk delete
+    and one counter UPDATE per flush. Pending states are visible to readers
+    through pending_state() until they reach the database.
+
+    The buffer lives in one process's memory, so it is only correct with a
+    single worker: two workers would each keep their own pending state for
+    the same pair and report different liked states to the same user. More
+    workers need the pending state in a shared store (such as Redis) first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}   # (user_id, post_id) -> liked
+        self._flushing = {}  # Batch currently being written
+        self._timer = None
+
+    def pending_state(self, user_id, post_id):
+        """Buffered liked state for the pair, or None if nothing is pending"""
+        key = (user_id, post_id)
+        with self._lock:
+            return self._pending.get(key, self._flushing.get(key))
+
+    def pending_likes(self, post_id):
+        """How far the post's stored likes_count is behind its buffered toggles"""
+        with self._lock:
+            states = {key: liked for key, liked in self._flushing.items() if key[1] == post_id}
+            states.update((key, liked) for key, liked in self._pending.items() if key[1] == post_id)
+        if not states:
+            return 0
+        # A pending state only counts where it differs from the stored like
+        stored = set(Like.objects.filter(
+            post_id=post_id, user_id__in=[user_id for user_id, _ in states]
+        ).values_list('user_id', flat=True))
+        return sum(1 if liked else -1 for (user_id, _), liked in states.items() if liked != (user_id in stored))
+
+    def toggle(self, user_id, post_id):
+        """Flip the user's like on the post and return the new state"""
+        persisted = self.pending_state(user_id, post_id)
+        if persisted is None:
+            persisted = Like.objects.filter(user_id=user_id, post_id=post_id).exists()
+
+        key = (user_id, post_id)
+        with self._lock:
+            # Another request may have toggled while we were reading
+            current = self._pending.get(key, self._flushing.get(key, persisted))
+            self._pending[key] = not current
+            should_flush = len(self._pending) >= settings.LIKE_BUFFER_MAX_PENDING
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(settings.LIKE_BUFFER_FLUSH_INTERVAL, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if should_flush:
+            self.flush()
+        return not current
+
+    def flush(self):
+        """Write every pending toggle to the database"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushing = pending
+        if not pending:
+            return
+
+        try:
+            self._write(pending)
+        except Exception:
+            logger.exception('Failed to flush %d buffered likes', len(pending))
+            with self._lock:
+                # Re-queue whatever has not been superseded since
+                for key, liked in pending.items():
+                    self._pending.setdefault(key, liked)
+        finally:
+            with self._lock:
+                self._flushing = {}
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def _write(self, pending):
+        post_ids = set(Post.objects.filter(
+            id__in={post_id for _, post_id in pending}
+        ).values_list('id', flat=True))
+        pending = {key: liked for key, liked in pending.items() if key[1] in post_ids}
+
+        with transaction.atomic():
+            existing = set(Like.objects.filter(
+                post_id__in=post_ids,
+                user_id__in={user_id for user_id, _ in pending}
+            ).values_list('user_id', 'post_id'))
+
+            to_create = []
+            to_delete = defaultdict(list)
+            for (user_id, post_id), liked in pending.items():
+                if liked and (user_id, post_id) not in existing:
+                    to_create.append(Like(user_id=user_id, post_id=post_id))
+                elif not liked and (user_id, post_id) in existing:
+                    to_delete[post_id].append(user_id)
+
+            Like.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+            if to_delete:
+                condition = Q()
+                for post_id, user_ids in to_delete.items():
+                    condition |= Q(post_id=post_id, user_id__in=user_ids)
+                Like.objects.filter(condition).delete()
+
+            # ignore_conflicts hides which rows were really inserted, and a
+            # like may have changed since `existing` was read, so deltas from
+            # the plan could drift. Recount the touched posts instead, in one
+            # UPDATE.
+            touched = {like.post_id for like in to_create} | set(to_delete)
+            if touched:
+                Post.objects.filter(pk__in=touched).update(likes_count=count_per_post(Like))
+
+like_buffer = LikeBuffer()
+atexit.register(like_buffer.flush)
@@ -0,0 +1,90 @@
+# content/management/commands/benchmark_async_views.py
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+# (sync path, async path) pairs that return the same payload
+ENDPOINTS = [
+    ('/api/content/feed/', '/api/content/feed/async/'),
+    ('/api/content/feed/?feed_type=connections', '/api/content/feed/async/?feed_type=connections'),
+    ('/api/connections/my-connections/', '/api/connections/my-connections/async/'),
+    ('/api/circles/my-circles/', '/api/circles/my-circles/async/'),
+    ('/api/circles/habits/', '/api/circles/habits/async/'),
+]
+
+
+class Command(BaseCommand):
+    help = ('Compare throughput and latency of the sync list views with their async '
+            'variants under concurrent load. Run against the ASGI server, e.g. '
+            '`uvicorn minsoto.asgi:application --workers 1`.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000', help='Server base URL')
+        parser.add_argument('--token', required=True, help='Access token to request as')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--duration', type=float, default=10, help='Seconds per endpoint')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        if url.scheme != 'http':
+            raise CommandError('Only plain http:// URLs are supported')
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.token = options['token']
+
+        self.stdout.write(f"{'endpoint':<48} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for paths in ENDPOINTS:
+            for path in paths:
+                result = asyncio.run(self.load(path, options['concurrency'], options['duration']))
+                self.stdout.write(
+                    f"{path:<48} {result['rate']:8.1f} {result['p50']:8.1f} "
+                    f"{result['p99']:8.1f} {result['errors']:7d}"
+                )
+
+    async def load(self, path, concurrency, duration):
+        latencies = []
+        errors = 0
+        deadline = time.monotonic() + duration
+
+        async def worker():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    ok = await self.request(path)
+                except OSError:
+                    ok = False
+                if ok:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+        latencies.sort()
+        return {
+            'rate': len(latencies) / elapsed,
+            'p50': statistics.median(latencies) if latencies else 0,
+            'p99': latencies[int(len(latencies) * 0.99)] if latencies else 0,
+            'errors': errors,
+        }
+
+    async def request(self, path):
+        """GET over a fresh connection; True on a 200 read to the end"""
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            writer.write(
+                f'GET {path} HTTP/1.1\r\nHost: {self.host}\r\n'
+                f'Authorization: Bearer {self.token}\r\nConnection: close\r\n\r\n'.encode()
+            )
+            await writer.drain()
+            status = await reader.readline()
+            await reader.read()
+            return b' 200 ' in status
+        finally:
+            writer.close()
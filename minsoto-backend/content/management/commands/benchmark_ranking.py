@@ -0,0 +1,165 @@
+# content/management/commands/benchmark_ranking.py
+import bisect
+import math
+import random
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from content import ranking
+
+
+class Command(BaseCommand):
+    help = ('Offline benchmark for the "for you" ranking in content.ranking. Times the '
+            'scoring stage with and without NumPy, then replays a synthetic interaction '
+            "log and counts how many of each user's next interactions land in their "
+            'ranked top k, against the newest-first top k. No database needed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--posts', type=int, default=3000)
+        parser.add_argument('--events', type=int, default=20000, help='Likes and comments in the log')
+        parser.add_argument('--hours', type=int, default=72, help='Simulated time the log spans')
+        parser.add_argument('--step', type=int, default=6, help='Hours between ranking checkpoints')
+        parser.add_argument('--k', type=int, default=20, help='Top k compared at each checkpoint')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.time_scoring([100, 500, 2000, 10000])
+
+        users, posts = self.make_world(options['users'], options['posts'], options['hours'])
+        log = self.make_log(users, posts, options['events'], options['hours'])
+        k = options['k']
+        hits, total = self.replay(users, posts, log, options['hours'], options['step'], k)
+        self.stdout.write(f"\nReplayed {len(log):,} interactions; top {k} ranked every {options['step']}h")
+        for name in ('ranked', 'newest first'):
+            self.stdout.write(f'{name:<14} {hits[name]:6d} of the next {total} interactions '
+                              f'({hits[name] / max(total, 1):.1%})')
+
+    def time_scoring(self, sizes):
+        installed = ranking.numpy
+        self.stdout.write(f"{'candidates':>10} {'numpy ms':>10} {'python ms':>10}")
+        for size in sizes:
+            features = {
+                'age_hours': [self.random.uniform(0, 72) for _ in range(size)],
+                'likes': [self.random.randrange(100) for _ in range(size)],
+                'comments': [self.random.randrange(20) for _ in range(size)],
+                'strength': [self.random.choice([0.0, 0.5, 1.0]) for _ in range(size)],
+                'overlap': [self.random.random() for _ in range(size)],
+            }
+            numpy_ms = f"{'n/a':>10}"
+            if installed is not None:
+                numpy_ms = f'{self.time_call(lambda: ranking.score(features)):10.3f}'
+            try:
+                ranking.numpy = None
+                python_ms = self.time_call(lambda: ranking.score(features))
+            finally:
+                ranking.numpy = installed
+            self.stdout.write(f'{size:10d} {numpy_ms} {python_ms:10.3f}')
+
+    def time_call(self, call, runs=20):
+        started = time.perf_counter()
+        for _ in range(runs):
+            call()
+        return (time.perf_counter() - started) * 1000 / runs
+
+    def make_world(self, user_count, post_count, hours):
+        """Users with interests and connections, and posts spread over `hours`
+        with interests and a hidden quality that drives interactions"""
+        interests = range(20)
+        users = []
+        for _ in range(user_count):
+            users.append({'interests': set(self.random.sample(interests, self.random.randint(1, 3))), 'strength': {}})
+        for user_id, user in enumerate(users):
+            for other_id in self.random.sample(range(user_count), 10):
+                if other_id != user_id:
+                    strength = ranking.CONNECTION_STRENGTH['friend' if self.random.random() < 0.3 else 'connection']
+                    user['strength'][other_id] = users[other_id]['strength'][user_id] = strength
+
+        posts = sorted((
+            {
+                'created': self.random.uniform(0, hours),
+                'author': self.random.randrange(user_count),
+                'interests': set(self.random.sample(interests, self.random.randint(1, 2))),
+                'quality': self.random.lognormvariate(0, 1),
+            }
+            for _ in range(post_count)
+        ), key=lambda post: post['created'])
+        for post_id, post in enumerate(posts):
+            post['id'] = post_id
+        return users, posts
+
+    def affinity(self, user_id, user, post, now):
+        """How likely the user is to interact with the post; the ground truth
+        the ranking has to recover from counts, connections and interests"""
+        shared = len(post['interests'] & user['interests'])
+        return (post['quality'] * (1 + 3 * shared) * (1 + 2 * user['strength'].get(post['author'], 0))
+                * math.exp(-(now - post['created']) / 24))
+
+    def make_log(self, users, posts, event_count, hours):
+        """(time, user_id, post_id, kind) interactions, oldest first"""
+        created = [post['created'] for post in posts]
+        log = []
+        while len(log) < event_count:
+            now = self.random.uniform(0, hours)
+            live = bisect.bisect_right(created, now)
+            if not live:
+                continue
+            user_id = self.random.randrange(len(users))
+            seen = [posts[i] for i in self.random.sample(range(live), min(live, 100))]
+            weights = [self.affinity(user_id, users[user_id], post, now) for post in seen]
+            post = self.random.choices(seen, weights)[0]
+            kind = 'comment' if self.random.random() < 0.2 else 'like'
+            log.append((now, user_id, post['id'], kind))
+        log.sort()
+        return log
+
+    def replay(self, users, posts, log, hours, step, k):
+        """Walk the log; at each checkpoint rank every user active in the next
+        step from the counts so far, and score both orderings against what
+        they go on to interact with"""
+        created = [post['created'] for post in posts]
+        window = settings.RANKED_FEED_WINDOW_HOURS
+        likes, comments = defaultdict(int), defaultdict(int)
+        hits = {'ranked': 0, 'newest first': 0}
+        total = 0
+        position = 0
+
+        for now in range(step, hours, step):
+            while position < len(log) and log[position][0] <= now:
+                _, _, post_id, kind = log[position]
+                (comments if kind == 'comment' else likes)[post_id] += 1
+                position += 1
+
+            # Only posts that exist by now can be ranked
+            upcoming = defaultdict(set)
+            for when, user_id, post_id, _ in log[position:]:
+                if when > now + step:
+                    break
+                if posts[post_id]['created'] <= now:
+                    upcoming[user_id].add(post_id)
+
+            live = posts[bisect.bisect_left(created, now - window):bisect.bisect_right(created, now)]
+            candidates = live[-settings.RANKED_FEED_CANDIDATES:]
+            for user_id, interacted in upcoming.items():
+                user = users[user_id]
+                features = {'age_hours': [], 'likes': [], 'comments': [], 'strength': [], 'overlap': []}
+                for post in candidates:
+                    shared = len(post['interests'] & user['interests'])
+                    features['age_hours'].append(now - post['created'])
+                    features['likes'].append(likes[post['id']])
+                    features['comments'].append(comments[post['id']])
+                    features['strength'].append(user['strength'].get(post['author'], 0.0))
+                    features['overlap'].append(
+                        shared / (len(post['interests']) + len(user['interests']) - shared) if shared else 0.0
+                    )
+                ids = [post['id'] for post in candidates]
+                ranked = ranking.rank(ids, features['age_hours'], ranking.score(features))[:k]
+                newest = ids[::-1][:k]
+                hits['ranked'] += len(interacted.intersection(ranked))
+                hits['newest first'] += len(interacted.intersection(newest))
+                total += len(interacted)
+        return hits, total
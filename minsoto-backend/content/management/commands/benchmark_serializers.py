@@ -0,0 +1,117 @@
+# content/management/commands/benchmark_serializers.py
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from circles.models import Circle
+from circles.projections import CircleProjection
+from circles.serializers import CircleSerializer
+from connections.models import Connection, ConnectionEdge, Interest
+from connections.projections import ConnectionEdgeProjection
+from connections.serializers import ConnectionEdgeSerializer
+from content.models import Post
+from content.projections import PostProjection
+from content.serializers import PostSerializer
+from minsoto.renderers import ORJSONRenderer
+from users.models import CustomUser, Profile
+from users.projections import PublicUserProjection
+from users.serializers import PublicUserSerializer
+
+
+class Command(BaseCommand):
+    help = ('Objects serialized per second by the ModelSerializers and their projections, '
+            'with and without JSON rendering. Runs on in-memory rows; no database needed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--objects', type=int, default=20, help='Rows per page')
+        parser.add_argument('--seconds', type=float, default=2, help='Time per measurement')
+
+    def handle(self, *args, **options):
+        count = options['objects']
+        self.seconds = options['seconds']
+        viewer = self.make_user(0)
+        request = Request(APIRequestFactory().get('/'))
+        request.user = viewer
+        self.context = {'request': request}
+
+        cases = [
+            ('post', self.make_posts(count), PostSerializer, PostProjection),
+            ('circle', self.make_circles(count), CircleSerializer, CircleProjection),
+            ('connection', self.make_edges(count), ConnectionEdgeSerializer, ConnectionEdgeProjection),
+            ('user', [self.make_user(i) for i in range(count)], PublicUserSerializer, PublicUserProjection),
+        ]
+
+        self.stdout.write(f"{'':<12} {'serializer':>12} {'projection':>12} {'+ render':>12} {'+ render':>12}")
+        self.stdout.write(f"{'objects/s':<12} {'':>12} {'':>12} {'(json)':>12} {'(orjson)':>12}")
+        for name, rows, serializer_class, projection_class in cases:
+            rates = [
+                self.measure(rows, serializer_class, None),
+                self.measure(rows, projection_class, None),
+                self.measure(rows, serializer_class, JSONRenderer()),
+                self.measure(rows, projection_class, ORJSONRenderer()),
+            ]
+            self.stdout.write(f'{name:<12}' + ''.join(f' {rate:12,.0f}' for rate in rates))
+
+    def measure(self, rows, serializer_class, renderer):
+        serialized = 0
+        started = time.perf_counter()
+        deadline = started + self.seconds
+        while time.perf_counter() < deadline:
+            data = serializer_class(rows, many=True, context=self.context).data
+            if renderer is not None:
+                renderer.render(data)
+            serialized += len(rows)
+        return serialized / (time.perf_counter() - started)
+
+    # Unsaved rows with their relations cached, shaped like the views' querysets
+
+    def make_user(self, i):
+        user = CustomUser(id=i + 1, username=f'user{i}', first_name='First', last_name='Last')
+        user.profile = Profile(
+            user=user, bio='Bio ' * 20, profile_picture_url='https://example.com/p.png',
+            widget_layout={'widgets': [{'type': 'habits', 'x': 0, 'y': 0}]},
+        )
+        return user
+
+    def make_interests(self):
+        return [Interest(id=i + 1, name=f'interest{i}', description='Description') for i in range(3)]
+
+    def make_posts(self, count):
+        posts = []
+        for i in range(count):
+            post = Post(
+                id=i + 1, author=self.make_user(i), content='Post content ' * 10,
+                created_at=datetime.now(timezone.utc), likes_count=i, comments_count=i,
+            )
+            post._prefetched_objects_cache = {'interests': self.make_interests()}
+            post.is_liked = bool(i % 2)
+            posts.append(post)
+        return posts
+
+    def make_circles(self, count):
+        circles = []
+        for i in range(count):
+            circle = Circle(
+                id=i + 1, name=f'Circle {i}', description='Description', circle_type='social',
+                creator=self.make_user(i), created_at=datetime.now(timezone.utc),
+            )
+            circle._prefetched_objects_cache = {'interests': self.make_interests()}
+            circle.members_total = i
+            circle.viewer_role = 'member' if i % 2 else None
+            circles.append(circle)
+        return circles
+
+    def make_edges(self, count):
+        edges = []
+        for i in range(count):
+            connection = Connection(id=i + 1, connection_type='connection')
+            connection._prefetched_objects_cache = {'interests': self.make_interests()}
+            edges.append(ConnectionEdge(
+                id=i + 1, connection=connection, other_user=self.make_user(i),
+                connection_type='connection', created_at=datetime.now(timezone.utc),
+            ))
+        return edges
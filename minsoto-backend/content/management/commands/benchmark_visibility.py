@@ -0,0 +1,125 @@
+# content/management/commands/benchmark_visibility.py
+import random
+import statistics
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from circles.models import Circle, CircleMembership
+from connections.models import Connection
+from content.feed import with_feed_data
+from content.models import Post
+from content.visibility import visible_to
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = ('Time feed pages filtered by content.visibility.visible_to as the post table '
+            'grows, and show whether PostgreSQL scans an index or the whole table. '
+            'Works on throwaway rows inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000',
+                            help='Comma-separated post counts to measure at')
+        parser.add_argument('--authors', type=int, default=200)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per page')
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        self.page_size = options['page_size']
+        self.repeat = options['repeat']
+
+        self.stdout.write(f"{'posts':>9} {'page 1 ms':>10} {'page 50 ms':>11}  plan")
+        with transaction.atomic():
+            viewer, authors = self.make_graph(options['authors'])
+            created = 0
+            for size in sizes:
+                self.make_posts(authors, size - created)
+                created = size
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'ANALYZE {Post._meta.db_table}')
+                self.measure(viewer, size)
+            transaction.set_rollback(True)
+
+    def make_graph(self, count):
+        """A viewer connected to a third of the authors (half of those as
+        friends) and sharing a circle with another third"""
+        run = uuid.uuid4().hex[:8]
+        users = CustomUser.objects.bulk_create([
+            CustomUser(username=f'visibility-{run}-{i}', email=f'visibility-{run}-{i}@example.invalid')
+            for i in range(count + 1)
+        ])
+        if users[0].pk is None:  # Backends without RETURNING
+            users = list(CustomUser.objects.filter(username__startswith=f'visibility-{run}-'))
+        viewer, authors = users[0], users[1:]
+
+        for i, author in enumerate(authors[:count // 3]):
+            Connection.objects.create(
+                user1=viewer, user2=author, connection_type='friend' if i % 2 else 'connection'
+            )
+        circle = Circle.objects.create(
+            name=f'Visibility {run}', description='Benchmark', circle_type='social',
+            creator=viewer, max_members=count + 1
+        )
+        CircleMembership.objects.create(user=viewer, circle=circle, role='creator')
+        for author in authors[count // 3:2 * count // 3]:
+            CircleMembership.objects.create(user=author, circle=circle)
+        return viewer, authors
+
+    def make_posts(self, authors, count):
+        visibilities = [choice for choice, _ in Post.VISIBILITY_CHOICES]
+        posts = Post.objects.bulk_create([
+            Post(author=random.choice(authors), content='Benchmark post', visibility=random.choice(visibilities))
+            for _ in range(count)
+        ], batch_size=5000)
+        # created_at is auto_now_add; spread the posts over a few months so
+        # pages are ordered by time rather than by the id tie-breaker alone
+        now = timezone.now()
+        for post in posts:
+            post.created_at = now - timedelta(seconds=random.randrange(90 * 24 * 60 * 60))
+        Post.objects.bulk_update(posts, ['created_at'], batch_size=1000)
+
+    def measure(self, viewer, size):
+        queryset = with_feed_data(Post.objects.filter(visible_to(viewer)), viewer).order_by('-created_at', '-id')
+
+        first_page = queryset[:self.page_size + 1]
+        cursor = list(queryset.values_list('created_at', 'id')[self.page_size * 49:self.page_size * 49 + 1])
+        deep_page = first_page
+        if cursor:
+            created_at, post_id = cursor[0]
+            deep_page = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lte=post_id)
+            )[:self.page_size + 1]
+
+        self.stdout.write(
+            f'{size:9,d} {self.time(first_page):10.2f} {self.time(deep_page):11.2f}  {self.plan(first_page)}'
+        )
+
+    def time(self, queryset):
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def plan(self, queryset):
+        """Which access path the first page takes on the post table"""
+        if connection.vendor != 'postgresql':
+            return f'(EXPLAIN summary needs PostgreSQL, running on {connection.vendor})'
+        table = Post._meta.db_table
+        scans = [
+            line.strip(' ->').split('  (')[0]
+            for line in queryset.explain().splitlines()
+            if f' on {table}' in line and 'Scan' in line
+        ]
+        if any(scan.startswith('Seq Scan') for scan in scans):
+            return self.style.ERROR('; '.join(scans))
+        return '; '.join(scans)
@@ -0,0 +1,27 @@
+# content/management/commands/compact_trends.py
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from content.trends import expire_buckets, refresh_trending, trend_tracker
+
+class Command(BaseCommand):
+    help = ('Delete trend buckets that have left the window and recompute the trending '
+            'top lists, which the trending API only reads. Run every minute or so, e.g. '
+            'from cron; the API and this command must share a cache (CACHE_BACKEND).')
+
+    def handle(self, *args, **options):
+        backend = caches[DEFAULT_CACHE_ALIAS]
+        if isinstance(backend, (LocMemCache, DummyCache)):
+            raise CommandError(
+                f'The trending lists are stored in the cache, but {type(backend).__name__} is '
+                f'not shared with the API processes, which would keep returning empty lists. '
+                f'Set CACHE_BACKEND to a shared cache such as Redis or Memcached.'
+            )
+        trend_tracker.flush()
+        expired = expire_buckets()
+        trending = refresh_trending()
+        self.stdout.write(self.style.SUCCESS(
+            f"Expired {expired} buckets; {len(trending['post'])} trending posts, "
+            f"{len(trending['interest'])} trending interests"
+        ))
@@ -0,0 +1,20 @@
+# content/management/commands/rebuild_feeds.py
+from django.core.management.base import BaseCommand
+from content.feed import fan_out_post
+from content.models import Post, FeedEntry
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized connections feed from existing posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        FeedEntry.objects.all().delete()
+
+        count = 0
+        for post in Post.objects.order_by('id').iterator(chunk_size=options['batch_size']):
+            fan_out_post(post)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Fanned out {count} posts'))
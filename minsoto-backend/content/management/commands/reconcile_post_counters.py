@@ -0,0 +1,28 @@
+# content/management/commands/reconcile_post_counters.py
+from django.core.management.base import BaseCommand
+from content.counters import reconcile_post_counters
+from content.models import Post
+
+class Command(BaseCommand):
+    help = 'Recompute drifted Post.likes_count / Post.comments_count values'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_id = 0
+        checked = fixed = 0
+
+        while True:
+            post_ids = list(
+                Post.objects.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not post_ids:
+                break
+            fixed += len(reconcile_post_counters(post_ids))
+            checked += len(post_ids)
+            last_id = post_ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f'Checked {checked} posts, fixed {fixed}'))
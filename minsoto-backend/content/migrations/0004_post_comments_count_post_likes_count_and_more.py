@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-18 18:35
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_counters(apps, schema_editor):
+    Post = apps.get_model('content', 'Post')
+    Like = apps.get_model('content', 'Like')
+    Comment = apps.get_model('content', 'Comment')
+
+    def count_per_post(model):
+        return Coalesce(Subquery(
+            model.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post').annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    Post.objects.update(likes_count=count_per_post(Like), comments_count=count_per_post(Comment))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0003_post_content_post_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'created_at', 'id'], name='content_comment_post_idx'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
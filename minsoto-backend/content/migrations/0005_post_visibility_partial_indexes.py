@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0006_connection_canonical_order'),
+        ('content', '0004_post_comments_count_post_likes_count_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='content_post_vis_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 'public')), fields=['-created_at', '-id'], name='content_post_public_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('visibility', 'public'), _negated=True), fields=['visibility', '-created_at', '-id'], name='content_post_restricted_idx'),
+        ),
+    ]
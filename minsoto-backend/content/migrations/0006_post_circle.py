@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0004_circle_member_count'),
+        ('connections', '0006_connection_canonical_order'),
+        ('content', '0005_post_visibility_partial_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='circle',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='posts', to='circles.circle'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('circle__isnull', False)), fields=['circle', '-created_at', '-id'], name='content_post_circle_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_interest_entries(apps, schema_editor):
+    Post = apps.get_model('content', 'Post')
+    InterestFeedEntry = apps.get_model('content', 'InterestFeedEntry')
+
+    links = Post.interests.through.objects.values_list('post_id', 'interest_id', 'post__created_at')
+    InterestFeedEntry.objects.bulk_create(
+        (InterestFeedEntry(post_id=post_id, interest_id=interest_id, created_at=created_at)
+         for post_id, interest_id, created_at in links.iterator()),
+        batch_size=1000,
+    )
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('connections', '0006_connection_canonical_order'),
+        ('content', '0006_post_circle'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterestFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('interest', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='connections.interest')),
+                ('post', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='interest_entries', to='content.post')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['interest', '-created_at', '-post'], name='content_interest_feed_idx')],
+                'unique_together': {('post', 'interest')},
+            },
+        ),
+        migrations.RunPython(populate_interest_entries, migrations.RunPython.noop),
+    ]
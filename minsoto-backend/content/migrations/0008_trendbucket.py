@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0007_interestfeedentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Post'), ('interest', 'Interest')], max_length=10)),
+                ('object_id', models.PositiveIntegerField()),
+                ('bucket', models.DateTimeField()),
+                ('points', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['bucket'], name='content_trend_bucket_idx')],
+                'unique_together': {('kind', 'object_id', 'bucket')},
+            },
+        ),
+    ]
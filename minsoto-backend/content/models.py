@@ -23,10 +23,69 @@ class Post(models.Model):
     post_type = models.CharField(max_length=20, choices=POST_TYPES, default='text')
     visibility = models.CharField(max_length=20, choices=VISIBILITY_CHOICES, default='public')
     interests = models.ManyToManyField(Interest, blank=True)
+    # Set for posts made to a circle; they make up its timeline. Indexed by
+    # content_post_circle_idx below rather than a plain FK index
+    circle = models.ForeignKey(
+        'circles.Circle', on_delete=models.CASCADE, null=True, blank=True,
+        related_name='posts', db_index=False
+    )
     image_url = models.URLField(blank=True)
     is_highlighted = models.BooleanField(default=False)
+    # False when the author was over FEED_FANOUT_THRESHOLD at posting time;
+    # such posts are pulled into connection feeds at read time instead
+    fanned_out = models.BooleanField(default=True)
+    # Denormalized counters, kept current by content.counters
+    likes_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # Keyset pagination: (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='content_post_created_idx'),
+            # Split by visibility for content.visibility: public posts need no
+            # subquery, the restricted ones are the few that do
+            models.Index(
+                fields=['-created_at', '-id'], condition=models.Q(visibility='public'),
+                name='content_post_public_idx',
+            ),
+            models.Index(
+                fields=['visibility', '-created_at', '-id'], condition=~models.Q(visibility='public'),
+                name='content_post_restricted_idx',
+            ),
+            # Circle timelines, see circles.views.CircleFeedView
+            models.Index(
+                fields=['circle', '-created_at', '-id'], condition=models.Q(circle__isnull=False),
+                name='content_post_circle_idx',
+            ),
+        ]
+
+class FeedEntry(models.Model):
+    """Materialized connections-feed row: one per (reader, post)"""
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='feed_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='feed_entries')
+    created_at = models.DateTimeField()  # Copied from the post so reads never touch Post
+    
+    class Meta:
+        unique_together = ['user', 'post']
+        indexes = [
+            # Pages of a reader's feed are range scans in (created_at, post) order
+            models.Index(fields=['user', '-created_at', '-post'], name='content_feed_user_idx'),
+        ]
+
+class InterestFeedEntry(models.Model):
+    """Post.interests row carrying the post's created_at, so each interest's
+    posts are one index range scan; see content/interest_feed.py"""
+    interest = models.ForeignKey(Interest, on_delete=models.CASCADE, related_name='+', db_index=False)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='interest_entries', db_index=False)
+    created_at = models.DateTimeField()  # Copied from the post
+    
+    class Meta:
+        unique_together = ['post', 'interest']
+        indexes = [
+            models.Index(fields=['interest', '-created_at', '-post'], name='content_interest_feed_idx'),
+        ]
 
 class Like(models.Model):
     user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
@@ -42,3 +101,28 @@ class Comment(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['post', 'created_at', 'id'], name='content_comment_post_idx'),
+        ]
+
+class TrendBucket(models.Model):
+    """Activity points for one post or interest in one time bucket; written
+    by content.trends, expired by the compact_trends command"""
+    KINDS = [
+        ('post', 'Post'),
+        ('interest', 'Interest'),
+    ]
+    
+    kind = models.CharField(max_length=10, choices=KINDS)
+    object_id = models.PositiveIntegerField()
+    bucket = models.DateTimeField()  # Start of the bucket
+    points = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['kind', 'object_id', 'bucket']
+        indexes = [
+            # Window reads and expiry
+            models.Index(fields=['bucket'], name='content_trend_bucket_idx'),
+        ]
@@ -0,0 +1,28 @@
+# content/projections.py
+from rest_framework import serializers
+from connections.projections import project_interest
+from minsoto.projections import iso_datetime
+from users.projections import project_public_user
+from .serializers import is_liked_by_viewer
+
+
+class PostProjection(serializers.BaseSerializer):
+    """Read-only stand-in for PostSerializer on feed pages; expects the
+    rows from content.feed.with_feed_data. See users.projections."""
+
+    def to_representation(self, post):
+        return {
+            'id': post.id,
+            'author': project_public_user(post.author),
+            'content': post.content,
+            'post_type': post.post_type,
+            'visibility': post.visibility,
+            'circle': post.circle_id,
+            'interests': [project_interest(interest) for interest in post.interests.all()],
+            'image_url': post.image_url,
+            'is_highlighted': post.is_highlighted,
+            'created_at': iso_datetime(post.created_at),
+            'likes_count': post.likes_count,
+            'comments_count': post.comments_count,
+            'is_liked': is_liked_by_viewer(post, self.context.get('request')),
+        }
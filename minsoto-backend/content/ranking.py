@@ -0,0 +1,202 @@
+# content/ranking.py
+try:
+    import numpy
+except ImportError:  # Optional; candidates are scored in plain Python without it
+    numpy = None
+
+import math
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from connections.graph import get_adjacency
+from minsoto.pagination import KeysetPagination
+from users.models import Profile
+from .models import InterestFeedEntry, Post
+from .visibility import visible_to
+
+# How much each kind of connection to the author counts
+CONNECTION_STRENGTH = {'friend': 1.0, 'connection': 0.5}
+# A comment says more about a post than a like
+COMMENT_WEIGHT = 2
+# Hours added to a post's age in velocity, so a like on a minute-old post is not a spike
+VELOCITY_SMOOTHING_HOURS = 2
+
+
+def score(features, weights=None, half_life_hours=None):
+    """Score posts from their feature columns, all sequences of equal length:
+    age_hours, likes, comments, strength (see CONNECTION_STRENGTH) and
+    overlap (Jaccard of post and viewer interests, 0..1).
+
+    Recency halves every half_life_hours; engagement counts as log1p of
+    likes and comments per hour. Uses NumPy when it is installed, with the
+    same arithmetic either way.
+    """
+    weights = weights or settings.RANKED_FEED_WEIGHTS
+    decay = math.log(2) / (half_life_hours or settings.RANKED_FEED_HALF_LIFE_HOURS)
+
+    if numpy is not None:
+        age = numpy.asarray(features['age_hours'], dtype=float)
+        engagement = (numpy.asarray(features['likes'], dtype=float)
+                      + COMMENT_WEIGHT * numpy.asarray(features['comments'], dtype=float))
+        return (
+            weights['recency'] * numpy.exp(-decay * age)
+            + weights['velocity'] * numpy.log1p(engagement / (age + VELOCITY_SMOOTHING_HOURS))
+            + weights['connection'] * numpy.asarray(features['strength'], dtype=float)
+            + weights['interests'] * numpy.asarray(features['overlap'], dtype=float)
+        ).tolist()
+
+    return [
+        weights['recency'] * math.exp(-decay * age)
+        + weights['velocity'] * math.log1p((likes + COMMENT_WEIGHT * comments) / (age + VELOCITY_SMOOTHING_HOURS))
+        + weights['connection'] * strength
+        + weights['interests'] * overlap
+        for age, likes, comments, strength, overlap in zip(
+            features['age_hours'], features['likes'], features['comments'],
+            features['strength'], features['overlap'],
+        )
+    ]
+
+
+def rank(ids, age_hours, scores):
+    """ids by descending score; ties go to the newer post, then the higher id"""
+    order = sorted(range(len(ids)), key=lambda i: (-scores[i], age_hours[i], -ids[i]))
+    return [ids[i] for i in order]
+
+
+def generate_candidates(user, interest_ids, now):
+    """Ids of posts worth scoring, from bounded windows over the last
+    RANKED_FEED_WINDOW_HOURS: the newest posts the user can see, the newest
+    by their connections, and the newest in their profile interests"""
+    since = now - timedelta(hours=settings.RANKED_FEED_WINDOW_HOURS)
+    limit = settings.RANKED_FEED_CANDIDATES
+    recent = Post.objects.filter(visible_to(user), created_at__gte=since).order_by('-created_at', '-id')
+
+    candidates = set(recent.values_list('id', flat=True)[:limit])
+    adjacency = get_adjacency(user.id)
+    if adjacency:
+        candidates.update(recent.filter(author_id__in=list(adjacency)).values_list('id', flat=True)[:limit])
+    if interest_ids:
+        # Not checked for visibility yet; load_features() does that
+        candidates.update(InterestFeedEntry.objects.filter(
+            interest_id__in=interest_ids, created_at__gte=since
+        ).order_by('-created_at').values_list('post_id', flat=True)[:limit])
+    return candidates
+
+
+def user_interest_ids(user):
+    """Ids of the interests on the user's profile"""
+    return set(Profile.interests.through.objects.filter(
+        profile__user=user
+    ).values_list('interest_id', flat=True))
+
+
+def load_features(user, interest_ids, candidates, now):
+    """(ids, feature columns for score()) of the candidates the user can see"""
+    rows = Post.objects.filter(visible_to(user), pk__in=candidates).values_list(
+        'id', 'author_id', 'created_at', 'likes_count', 'comments_count'
+    )
+    adjacency = get_adjacency(user.id)
+    post_interests = defaultdict(set)
+    for post_id, interest_id in InterestFeedEntry.objects.filter(
+        post_id__in=candidates
+    ).values_list('post_id', 'interest_id'):
+        post_interests[post_id].add(interest_id)
+
+    ids = []
+    features = {'age_hours': [], 'likes': [], 'comments': [], 'strength': [], 'overlap': []}
+    for post_id, author_id, created_at, likes, comments in rows:
+        tags = post_interests[post_id]
+        shared = len(tags & interest_ids)
+        ids.append(post_id)
+        features['age_hours'].append(max((now - created_at).total_seconds(), 0) / 3600)
+        features['likes'].append(likes)
+        features['comments'].append(comments)
+        features['strength'].append(CONNECTION_STRENGTH.get(adjacency.get(author_id), 0.0))
+        features['overlap'].append(shared / (len(tags) + len(interest_ids) - shared) if shared else 0.0)
+    return ids, features
+
+
+def build_ranking(user):
+    """Post ids for the user's "for you" feed, best first"""
+    now = timezone.now()
+    interest_ids = user_interest_ids(user)
+    candidates = generate_candidates(user, interest_ids, now)
+    ids, features = load_features(user, interest_ids, candidates, now)
+    return rank(ids, features['age_hours'], score(features))
+
+
+def _current_key(user_id):
+    return f'content:ranking:{user_id}'
+
+
+def _ranking_key(user_id, ranking_id):
+    return f'content:ranking:{user_id}:{ranking_id}'
+
+
+def get_ranking(user, ranking_id=None):
+    """(ranking_id, ranked post ids) for the user.
+
+    A new ranking is built at most every RANKED_FEED_CACHE_TIMEOUT seconds.
+    Rankings themselves are kept for RANKED_FEED_SCROLL_TIMEOUT, so a cursor
+    keeps paging through the ranking its first page came from; one that
+    has expired is replaced by a fresh ranking at the same offset.
+    """
+    ranking_id = ranking_id or cache.get(_current_key(user.id))
+    if ranking_id:
+        ranked = cache.get(_ranking_key(user.id, ranking_id))
+        if ranked is not None:
+            return ranking_id, ranked
+
+    ranking_id = uuid.uuid4().hex
+    ranked = build_ranking(user)
+    cache.set(_ranking_key(user.id, ranking_id), ranked, settings.RANKED_FEED_SCROLL_TIMEOUT)
+    cache.set(_current_key(user.id), ranking_id, settings.RANKED_FEED_CACHE_TIMEOUT)
+    return ranking_id, ranked
+
+
+class RankedFeedPagination(KeysetPagination):
+    """Pages through a cached ranking by position. The cursor holds the
+    ranking's id and an offset instead of row values."""
+    ordering = ('ranking', 'offset')  # The cursor's fields
+
+    def get_page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ranking_id, self.offset = self.decode_position(request) or (None, 0)
+        self.ranking_id, ranked = get_ranking(request.user, ranking_id)
+        self.page_ids = ranked[self.offset:self.offset + self.page_size + 1]
+        # Rank order is restored in paginate_queryset()
+        return queryset.filter(pk__in=self.page_ids)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        posts = {post.pk: post for post in self.get_page_queryset(queryset, request, view)}
+        # Posts deleted or hidden since ranking just leave a gap
+        self.has_next = len(self.page_ids) > self.page_size
+        self.page = [posts[pk] for pk in self.page_ids[:self.page_size] if pk in posts]
+        return self.page
+
+    def decode_position(self, request):
+        position = super().decode_position(request)
+        if position is not None:
+            ranking_id, offset = position
+            if not isinstance(ranking_id, str) or not isinstance(offset, int) or offset < 0:
+                raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_position(self, obj):
+        # Nothing about the row itself: the next page starts at the next offset
+        return [self.ranking_id, self.offset + self.page_size]
+
+    def get_next_link(self):
+        # The page can come out empty if all of its posts went away
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_position(None))
@@ -1,32 +1,52 @@
+from django.conf import settings
 from rest_framework import serializers
+from .like_buffer import like_buffer
 from .models import Post, Like, Comment
+from .visibility import CIRCLE_POST_VISIBILITIES
+from circles.models import CircleMembership
 from users.serializers import PublicUserSerializer
 from connections.serializers import InterestSerializer
 
 class PostSerializer(serializers.ModelSerializer):
     author = PublicUserSerializer(read_only=True)
     interests = InterestSerializer(many=True, read_only=True)
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
     
     class Meta:
         model = Post
-        fields = ['id', 'author', 'content', 'post_type', 'visibility', 'interests', 
+        fields = ['id', 'author', 'content', 'post_type', 'visibility', 'circle', 'interests', 
                  'image_url', 'is_highlighted', 'created_at', 'likes_count', 
                  'comments_count', 'is_liked']
+        read_only_fields = ['likes_count', 'comments_count']
     
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-    
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+    def validate(self, attrs):
+        circle = attrs.get('circle')
+        if circle is not None:
+            request = self.context['request']
+            if not CircleMembership.objects.filter(circle=circle, user=request.user, is_active=True).exists():
+                raise serializers.ValidationError({'circle': 'You are not a member of this circle'})
+            # Posts to a circle are for its members unless the author makes them public
+            attrs.setdefault('visibility', 'circle')
+            if attrs['visibility'] not in CIRCLE_POST_VISIBILITIES:
+                raise serializers.ValidationError({
+                    'visibility': f'Posts in a circle must be one of {CIRCLE_POST_VISIBILITIES}'
+                })
+        return attrs
     
     def get_is_liked(self, obj):
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return obj.likes.filter(user=request.user).exists()
+        return is_liked_by_viewer(obj, self.context.get('request'))
+
+def is_liked_by_viewer(post, request):
+    if not (request and request.user.is_authenticated):
         return False
+    if settings.LIKE_BUFFER_ENABLED:
+        pending = like_buffer.pending_state(request.user.id, post.id)
+        if pending is not None:
+            return pending
+    # Annotated by content.feed.with_feed_data on list views
+    if hasattr(post, 'is_liked'):
+        return post.is_liked
+    return post.likes.filter(user=request.user).exists()
 
 class CommentSerializer(serializers.ModelSerializer):
     author = PublicUserSerializer(read_only=True)
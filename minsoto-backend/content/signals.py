@@ -0,0 +1,48 @@
+# content/signals.py
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from circles.versions import bump_circle_feed_version
+from connections.models import Connection
+from .models import InterestFeedEntry, Post
+from .feed import fan_out_post, link_feeds, unlink_feeds
+from .interest_feed import add_interest_entries, remove_interest_entries
+
+@receiver(post_save, sender=Post)
+def handle_new_post(sender, instance, created, **kwargs):
+    """Push new posts into the feeds of the author's connections"""
+    if created:
+        fan_out_post(instance)
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_circle_feed(sender, instance, **kwargs):
+    """Drop the cached first page of the post's circle timeline"""
+    if instance.circle_id:
+        bump_circle_feed_version(instance.circle_id)
+
+@receiver(m2m_changed, sender=Post.interests.through)
+def sync_interest_entries(sender, instance, action, reverse, pk_set, **kwargs):
+    """Mirror Post.interests into InterestFeedEntry, from either side"""
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if action == 'pre_clear':
+        # pk_set is empty on clear(), so drop the rows before the links go
+        if reverse:
+            InterestFeedEntry.objects.filter(interest=instance).delete()
+        else:
+            remove_interest_entries([instance.pk])
+        return
+    post_ids, interest_ids = (pk_set, [instance.pk]) if reverse else ([instance.pk], pk_set)
+    if action == 'post_add':
+        add_interest_entries(post_ids, interest_ids)
+    else:
+        remove_interest_entries(post_ids, interest_ids)
+
+@receiver(post_save, sender=Connection)
+def handle_new_connection(sender, instance, created, **kwargs):
+    if created:
+        link_feeds(instance.user1_id, instance.user2_id)
+
+@receiver(post_delete, sender=Connection)
+def handle_removed_connection(sender, instance, **kwargs):
+    unlink_feeds(instance.user1_id, instance.user2_id)
@@ -0,0 +1,72 @@
+# content/streams.py
+import heapq
+from itertools import groupby, islice
+from django.conf import settings
+from django.db.models import Q
+
+
+def keyset_after(position, id_field):
+    """Rows strictly after a (created_at, id) position, newest first, with
+    the leading bound that lets the database range-scan, as in KeysetPagination"""
+    created_at, post_id = position
+    return Q(created_at__lte=created_at) & (
+        Q(created_at__lt=created_at) | Q(created_at=created_at, **{f'{id_field}__lt': post_id})
+    )
+
+
+def merge_streams(streams, limit):
+    """(created_at, post_id) of the first `limit` distinct posts across the
+    streams, newest first.
+
+    Each stream holds its first `limit` keys after the same position (an
+    interest's entries in content.interest_feed, a reader's feed entries in
+    content.feed), which is enough: a post among the first `limit` overall
+    is among the first `limit` of every stream it appears in. A post in
+    several streams has the same key in each, so its copies come out
+    adjacent.
+    """
+    merged = heapq.merge(*streams, reverse=True)
+    return [key for key, _ in islice(groupby(merged), limit)]
+
+
+def select_from_streams(read_streams, queryset, position, limit):
+    """([post_id], resume_position) for the first `limit` posts of the
+    merged streams after `position` that are also in `queryset`.
+
+    read_streams(position, size) returns querysets of (created_at, post_id)
+    keys, newest first. Candidates are checked against `queryset`
+    (visibility, interest filters) a batch at a time. The batch doubles each
+    round, so a feed that is mostly filtered out still takes few queries,
+    and the walk stops after FEED_SCAN_ROUNDS rather than reading the whole
+    history in one request. resume_position is then the last key checked,
+    for the next page to continue from; it is None when the page is
+    complete or the streams ran out.
+    """
+    selected = []
+    size = limit
+    for _ in range(settings.FEED_SCAN_ROUNDS):
+        batch = merge_streams([list(stream) for stream in read_streams(position, size)], size)
+        post_ids = [post_id for _, post_id in batch]
+        kept = set(queryset.filter(pk__in=post_ids).values_list('pk', flat=True))
+        selected.extend(post_id for post_id in post_ids if post_id in kept)
+        if len(selected) >= limit or len(batch) < size:
+            return selected[:limit], None
+        position = batch[-1]
+        size *= 2
+    return selected, position
+
+
+async def aselect_from_streams(read_streams, queryset, position, limit):
+    """select_from_streams on the async ORM"""
+    selected = []
+    size = limit
+    for _ in range(settings.FEED_SCAN_ROUNDS):
+        batch = merge_streams([[key async for key in stream] for stream in read_streams(position, size)], size)
+        post_ids = [post_id for _, post_id in batch]
+        kept = {post_id async for post_id in queryset.filter(pk__in=post_ids).values_list('pk', flat=True)}
+        selected.extend(post_id for post_id in post_ids if post_id in kept)
+        if len(selected) >= limit or len(batch) < size:
+            return selected[:limit], None
+        position = batch[-1]
+        size *= 2
+    return selected, position
@@ -1,3 +1,334 @@
-from django.test import TestCase
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from circles.models import Circle, CircleMembership
+from connections.models import Connection, Interest
+from minsoto.testing import APITestCase, make_user
+from .like_buffer import LikeBuffer
+from .models import Comment, FeedEntry, InterestFeedEntry, Like, Post
+from .trends import TrendTracker
+from .visibility import visible_to
+
+POSTS = 30
+
+
+class FeedPageTestCase(APITestCase):
+    """Walks every page of a list, following its next links"""
+
+    def token_client(self):
+        """A client for the async views, which only read JWTs"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.viewer)}')
+        return client
+
+    def walk(self, url, client=None):
+        """Ids across every page, and the most queries one page took"""
+        client = client or self.client
+        ids, most_queries = [], 0
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            most_queries = max(most_queries, len(queries))
+            # The async views render without a DRF Response
+            page = response.data if hasattr(response, 'data') else json.loads(response.content)
+            ids.extend(row['id'] for row in page['results'])
+            url = page['next']
+        return ids, most_queries
+
+
+class FeedQueryCountTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer, cls.friend, cls.popular = map(make_user, ('viewer', 'friend', 'popular'))
+        Connection.objects.create(user1=cls.viewer, user2=cls.friend, connection_type='friend')
+        Connection.objects.create(user1=cls.viewer, user2=cls.popular, connection_type='connection')
+        cls.interest = Interest.objects.create(name='Chess')
+
+        for i in range(POSTS):
+            # Every third post is by an author too popular to fan out, so
+            # the connections feed has to pull it at read time
+            author = cls.popular if i % 3 == 0 else cls.friend
+            with override_settings(FEED_FANOUT_THRESHOLD=0 if author == cls.popular else 1000):
+                post = Post.objects.create(author=author, content=f'Post {i}', visibility='public')
+            post.interests.add(cls.interest)
+            Comment.objects.create(author=cls.viewer, post=post, content='Nice')
+
+    def test_global_feed(self):
+        # Validators, page, interests prefetch
+        self.assertPageQueries('/api/content/feed/?feed_type=global', 3)
+
+    def test_connections_feed(self):
+        self.assertTrue(Post.objects.filter(author=self.popular, fanned_out=False).exists())
+        # Feed entries, pulled posts and the visibility check, then as above
+        self.assertPageQueries('/api/content/feed/?feed_type=connections', 6)
+
+    def test_filtered_feed(self):
+        # The interest's stream and the check of its candidates, then as above
+        self.assertPageQueries(f'/api/content/feed/?feed_type=global&filter={self.interest.id}', 5)
+
+    def test_filtered_connections_feed(self):
+        self.assertPageQueries(f'/api/content/feed/?feed_type=connections&filter={self.interest.id}', 6)
+
+    def test_for_you_feed(self):
+        # The ranking is cached after the warm-up request
+        self.assertPageQueries('/api/content/feed/?feed_type=for_you', 3)
+
+    def test_comments(self):
+        post = Post.objects.first()
+        for _ in range(POSTS):
+            Comment.objects.create(author=self.friend, post=post, content='Agreed')
+        # Visible post, validators, page
+        self.assertPageQueries(f'/api/content/posts/{post.id}/comments/?', 3)
+
+
+class FeedPaginationTests(FeedPageTestCase):
+    """Walking every page returns each post once, in (created_at, id) order,
+    including across runs of posts created in the same instant"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer, cls.friend, cls.colleague, cls.stranger = map(
+            make_user, ('viewer', 'friend', 'colleague', 'stranger')
+        )
+        Connection.objects.create(user1=cls.viewer, user2=cls.friend, connection_type='friend')
+        Connection.objects.create(user1=cls.viewer, user2=cls.colleague, connection_type='connection')
+        cls.chess, cls.go = Interest.objects.create(name='Chess'), Interest.objects.create(name='Go')
+
+        authors = [cls.friend, cls.colleague, cls.stranger]
+        visibilities = ['public', 'connections', 'friends']
+        now = timezone.now()
+        for i in range(POSTS):
+            author = authors[i % 3]
+            # The colleague's posts are pulled at read time, the others fanned out
+            with override_settings(FEED_FANOUT_THRESHOLD=0 if author == cls.colleague else 1000):
+                post = Post.objects.create(author=author, content=f'Post {i}', visibility=visibilities[i // 3 % 3])
+            post.interests.add(*[interest for interest, every in ((cls.chess, 2), (cls.go, 3)) if i % every == 0])
+            # Runs of four posts share a timestamp, so pages split ties on id
+            created_at = now - timedelta(minutes=i // 4)
+            for model, field in ((Post, 'pk'), (FeedEntry, 'post_id'), (InterestFeedEntry, 'post_id')):
+                model.objects.filter(**{field: post.pk}).update(created_at=created_at)
+
+        cls.post = Post.objects.get(content='Post 0')
+        for i in range(POSTS):
+            Comment.objects.create(author=authors[i % 3], post=cls.post, content=f'Comment {i}')
+        Comment.objects.filter(post=cls.post).update(created_at=now)
+
+    def expected(self, queryset, ordering=('-created_at', '-id')):
+        return list(queryset.order_by(*ordering).values_list('pk', flat=True).distinct())
+
+    def assertPagesMatch(self, url, expected):
+        for page_size in (1, 3, 7):
+            with self.subTest(page_size=page_size):
+                self.assertEqual(self.walk(f'{url}&page_size={page_size}')[0], expected)
+                if url.startswith('/api/content/feed/?'):
+                    async_url = url.replace('/feed/?', '/feed/async/?')
+                    self.assertEqual(self.walk(f'{async_url}&page_size={page_size}', self.token_client())[0], expected)
+
+    def test_global_feed(self):
+        self.assertPagesMatch('/api/content/feed/?feed_type=global', self.expected(Post.objects.filter(visibility='public')))
+
+    def test_connections_feed(self):
+        connected = Post.objects.filter(visible_to(self.viewer), author__in=[self.friend, self.colleague])
+        self.assertPagesMatch('/api/content/feed/?feed_type=connections', self.expected(connected))
+
+    def test_filtered_feed(self):
+        # Posts tagged with both interests come out of both streams
+        tagged = Post.objects.filter(visibility='public', interests__in=[self.chess, self.go])
+        self.assertPagesMatch(f'/api/content/feed/?feed_type=global&filter={self.chess.id},{self.go.id}', self.expected(tagged))
+
+    def test_filtered_connections_feed(self):
+        tagged = Post.objects.filter(
+            visible_to(self.viewer), author__in=[self.friend, self.colleague], interests=self.go
+        )
+        self.assertPagesMatch(f'/api/content/feed/?feed_type=connections&filter={self.go.id}', self.expected(tagged))
+
+    def test_comments(self):
+        # Oldest first, every comment in the same instant
+        comments = self.expected(Comment.objects.filter(post=self.post), ordering=('created_at', 'id'))
+        self.assertEqual(len(comments), POSTS)
+        self.assertPagesMatch(f'/api/content/posts/{self.post.id}/comments/?', comments)
+
+
+@override_settings(FEED_SCAN_ROUNDS=3)
+class FeedScanTests(FeedPageTestCase):
+    """A page whose candidates are mostly hidden stops after FEED_SCAN_ROUNDS
+    and continues on the next page instead of reading the whole history"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewer, cls.author = map(make_user, ('viewer', 'author'))
+        Connection.objects.create(user1=cls.viewer, user2=cls.author, connection_type='connection')
+        cls.interest = Interest.objects.create(name='Chess')
+        cls.visible = []
+        for i in range(3):
+            post = Post.objects.create(author=cls.author, content=f'Public {i}', visibility='public')
+            post.interests.add(cls.interest)
+            cls.visible.insert(0, post.id)
+        # Newer, and hidden from a plain connection and from the global feed
+        for i in range(100):
+            post = Post.objects.create(author=cls.author, content=f'Friends only {i}', visibility='friends')
+            post.interests.add(cls.interest)
+
+    def test_connections_feed(self):
+        post_ids, most_queries = self.walk('/api/content/feed/?feed_type=connections&page_size=2')
+        self.assertEqual(post_ids, self.visible)
+        # Three rounds of feed entries, pulled posts and the visibility check, plus the page itself
+        self.assertLessEqual(most_queries, 12)
+
+    def test_async_connections_feed(self):
+        post_ids, most_queries = self.walk(
+            '/api/content/feed/async/?feed_type=connections&page_size=2', self.token_client()
+        )
+        self.assertEqual(post_ids, self.visible)
+        self.assertLessEqual(most_queries, 12)
+
+    def test_filtered_feed(self):
+        post_ids, most_queries = self.walk(f'/api/content/feed/?feed_type=global&filter={self.interest.id}&page_size=2')
+        self.assertEqual(post_ids, self.visible)
+        # Three rounds of the interest's entries and the check, plus the page itself
+        self.assertLessEqual(most_queries, 9)
+
+    def test_async_filtered_feed(self):
+        post_ids, most_queries = self.walk(
+            f'/api/content/feed/async/?feed_type=global&filter={self.interest.id}&page_size=2', self.token_client()
+        )
+        self.assertEqual(post_ids, self.visible)
+        self.assertLessEqual(most_queries, 9)
+
+
+class VisibilityTests(TestCase):
+    """visible_to() for each kind of post and each relationship to its author"""
+
+    # Post key -> viewers who may see it
+    visible = {
+        'public': {'author', 'friend', 'connection', 'member', 'former_member', 'stranger', 'anonymous'},
+        'connections': {'author', 'friend', 'connection'},
+        'friends': {'author', 'friend'},
+        'circle': {'author', 'member'},
+        # Made before circle posts named their circle: any shared circle counts
+        'legacy_circle': {'author', 'member'},
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.viewers = {
+            name: make_user(name) for name in ('author', 'friend', 'connection', 'member', 'former_member', 'stranger')
+        }
+        cls.viewers['anonymous'] = AnonymousUser()
+        author = cls.viewers['author']
+        Connection.objects.create(user1=author, user2=cls.viewers['friend'], connection_type='friend')
+        Connection.objects.create(user1=author, user2=cls.viewers['connection'], connection_type='connection')
+        circle = Circle.objects.create(name='Runners', description='', circle_type='habit', creator=author)
+        CircleMembership.objects.create(user=author, circle=circle, role='creator')
+        CircleMembership.objects.create(user=cls.viewers['member'], circle=circle)
+        CircleMembership.objects.create(user=cls.viewers['former_member'], circle=circle, is_active=False)
+
+        cls.posts = {
+            visibility: Post.objects.create(author=author, content=visibility, visibility=visibility)
+            for visibility in ('public', 'connections', 'friends')
+        }
+        cls.posts['circle'] = Post.objects.create(author=author, content='circle', visibility='circle', circle=circle)
+        cls.posts['legacy_circle'] = Post.objects.create(author=author, content='legacy', visibility='circle')
+
+    def test_each_viewer_sees_what_they_may(self):
+        for name, viewer in self.viewers.items():
+            with self.subTest(viewer=name):
+                expected = {self.posts[key].id for key, viewers in self.visible.items() if name in viewers}
+                self.assertEqual(set(Post.objects.filter(visible_to(viewer)).values_list('pk', flat=True)), expected)
+
+    def test_other_circles_do_not_count(self):
+        outsider = make_user('outsider')
+        circle = Circle.objects.create(name='Readers', description='', circle_type='social', creator=outsider)
+        CircleMembership.objects.create(user=outsider, circle=circle, role='creator')
+        # Sharing a different circle with a member is not sharing the author's
+        CircleMembership.objects.create(user=self.viewers['member'], circle=circle)
+        self.assertEqual(
+            set(Post.objects.filter(visible_to(outsider)).values_list('pk', flat=True)), {self.posts['public'].id}
+        )
+
+
+@override_settings(TRENDS_FLUSH_INTERVAL=3600)
+class TrendingLikeTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.viewer, cls.other = map(make_user, ('author', 'viewer', 'other'))
+        cls.post = Post.objects.create(author=cls.author, content='Hello', visibility='public')
+
+    def like_points(self, toggles):
+        """Points the toggles add to the post, from a tracker of their own"""
+        tracker = TrendTracker()
+        with mock.patch('content.views.trend_tracker', tracker):
+            for user, times in toggles:
+                client = APIClient()
+                client.force_authenticate(user)
+                for _ in range(times):
+                    client.post(f'/api/content/posts/{self.post.id}/like/')
+        with mock.patch('content.trends.add_points') as add_points:
+            tracker.flush()
+        return sum(value for kind, object_id, _, value in (call.args for call in add_points.call_args_list)
+                   if kind == 'post' and object_id == self.post.id)
+
+    def test_toggling_a_like_counts_once(self):
+        self.assertEqual(self.like_points([(self.viewer, 7)]), 1)
+
+    @override_settings(LIKE_BUFFER_ENABLED=True)
+    def test_toggling_a_buffered_like_counts_once(self):
+        self.assertEqual(self.like_points([(self.viewer, 7)]), 1)
+
+    def test_each_user_counts(self):
+        self.assertEqual(self.like_points([(self.viewer, 3), (self.other, 1)]), 2)
+
+
+@override_settings(LIKE_BUFFER_ENABLED=True, LIKE_BUFFER_FLUSH_INTERVAL=3600)
+class BufferedLikeCountTests(APITestCase):
+    """like_post reports the count the post will have once the buffer is
+    flushed, however many toggles are pending"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author, cls.viewer, cls.other = map(make_user, ('author', 'viewer', 'other'))
+        cls.post = Post.objects.create(author=cls.author, content='Hello', visibility='public', likes_count=1)
+        Like.objects.create(user=cls.other, post=cls.post)
+
+    def setUp(self):
+        super().setUp()
+        self.buffer = LikeBuffer()
+        patcher = mock.patch('content.views.like_buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def toggle(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(f'/api/content/posts/{self.post.id}/like/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['liked'], response.data['likes_count']
+
+    def test_counts_follow_every_pending_toggle(self):
+        self.assertEqual(self.toggle(self.viewer), (True, 2))
+        self.assertEqual(self.toggle(self.viewer), (False, 1))
+        self.assertEqual(self.toggle(self.viewer), (True, 2))
+        # A stored like taken back and given again within the same window
+        self.assertEqual(self.toggle(self.other), (False, 1))
+        self.assertEqual(self.toggle(self.other), (True, 2))
+        self.assertEqual(self.toggle(self.other), (False, 1))
+
+    def test_counts_match_the_flushed_post(self):
+        for user in (self.viewer, self.other, self.viewer, self.viewer):
+            _, likes_count = self.toggle(user)
+        self.buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, likes_count)
+        self.assertEqual(self.toggle(self.viewer), (False, 0))
@@ -0,0 +1,161 @@
+# content/trends.py
+import atexit
+import heapq
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import InterestFeedEntry, TrendBucket
+
+logger = logging.getLogger(__name__)
+
+TRENDING_KEY = 'content:trending'
+
+
+def bucket_start(moment):
+    """Start of the TRENDS_BUCKET_SECONDS bucket holding `moment`"""
+    seconds = int(moment.timestamp()) // settings.TRENDS_BUCKET_SECONDS * settings.TRENDS_BUCKET_SECONDS
+    return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+
+
+class TrendTracker:
+    """Sliding-window activity counters for posts and their interests.
+
+    Events only bump an in-memory Counter keyed by (post, bucket); a timer
+    folds it into TrendBucket rows every TRENDS_FLUSH_INTERVAL, crediting
+    each post's interests at the same time. A busy post costs one UPDATE
+    per flush however many likes it gets. Points still in memory when a
+    worker dies are lost, which a trend can afford.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()  # (post_id, bucket) -> points
+        self._timer = None
+
+    def record(self, post_id, event, user_id=None):
+        """Count a 'post', 'like' or 'comment' event on the post.
+
+        With user_id, the user's event counts once per post and bucket, so
+        liking and unliking over and over cannot push a post up the list.
+        """
+        bucket = bucket_start(timezone.now())
+        if user_id is not None and not cache.add(
+            f'content:trends:seen:{event}:{user_id}:{post_id}:{bucket.timestamp():.0f}',
+            True, settings.TRENDS_BUCKET_SECONDS
+        ):
+            return
+        key = (post_id, bucket)
+        with self._lock:
+            self._pending[key] += settings.TRENDS_POINTS[event]
+            should_flush = len(self._pending) >= settings.TRENDS_MAX_PENDING
+            if not should_flush and self._timer is None:
+                self._timer = threading.Timer(settings.TRENDS_FLUSH_INTERVAL, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Write the pending points to TrendBucket"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return
+
+        try:
+            self._write(pending)
+        except Exception:
+            logger.exception('Failed to flush %d trend counters', len(pending))
+            with self._lock:
+                self._pending.update(pending)
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def _write(self, pending):
+        interests = defaultdict(list)
+        for post_id, interest_id in InterestFeedEntry.objects.filter(
+            post_id__in={post_id for post_id, _ in pending}
+        ).values_list('post_id', 'interest_id'):
+            interests[post_id].append(interest_id)
+
+        points = Counter()
+        for (post_id, bucket), value in pending.items():
+            points['post', post_id, bucket] += value
+            for interest_id in interests[post_id]:
+                points['interest', interest_id, bucket] += value
+
+        for (kind, object_id, bucket), value in points.items():
+            add_points(kind, object_id, bucket, value)
+
+
+def add_points(kind, object_id, bucket, value):
+    """UPDATE ... SET points = points + n, creating the row on first use"""
+    lookup = {'kind': kind, 'object_id': object_id, 'bucket': bucket}
+    if TrendBucket.objects.filter(**lookup).update(points=F('points') + value):
+        return
+    try:
+        with transaction.atomic():
+            TrendBucket.objects.create(points=value, **lookup)
+    except IntegrityError:
+        # Another worker created it in between
+        TrendBucket.objects.filter(**lookup).update(points=F('points') + value)
+
+
+def compute_trending(now=None):
+    """Top TRENDS_TOP_K [(id, score)] per kind over the window, with points
+    halving every TRENDS_HALF_LIFE_HOURS. Reads only the rollup table."""
+    now = now or timezone.now()
+    since = bucket_start(now - timedelta(hours=settings.TRENDS_WINDOW_HOURS))
+    scores = {'post': defaultdict(float), 'interest': defaultdict(float)}
+    for kind, object_id, bucket, points in TrendBucket.objects.filter(bucket__gte=since).values_list(
+        'kind', 'object_id', 'bucket', 'points'
+    ).iterator():
+        age_hours = max((now - bucket).total_seconds(), 0) / 3600
+        scores[kind][object_id] += points * 0.5 ** (age_hours / settings.TRENDS_HALF_LIFE_HOURS)
+
+    return {
+        kind: heapq.nlargest(settings.TRENDS_TOP_K, totals.items(), key=lambda item: (item[1], item[0]))
+        for kind, totals in scores.items()
+    }
+
+
+def refresh_trending():
+    """Recompute the top lists and store them for get_trending(). Stored
+    without an expiry: each run replaces the last, and a late run leaves
+    readers with the last lists computed."""
+    trending = compute_trending()
+    cache.set(TRENDING_KEY, trending, None)
+    return trending
+
+
+def get_trending():
+    """The top lists last stored by refresh_trending(), from the
+    compact_trends command; empty lists before its first run. Never
+    aggregates buckets itself, so requests cost one cache read."""
+    return cache.get(TRENDING_KEY, {'post': [], 'interest': []})
+
+
+def expire_buckets(now=None):
+    """Delete buckets that have left the window; returns how many"""
+    now = now or timezone.now()
+    since = bucket_start(now - timedelta(hours=settings.TRENDS_WINDOW_HOURS))
+    deleted, _ = TrendBucket.objects.filter(bucket__lt=since).delete()
+    return deleted
+
+
+trend_tracker = TrendTracker()
+atexit.register(trend_tracker.flush)
@@ -4,5 +4,8 @@ from . import views
 
 urlpatterns = [
     path('feed/', views.PostListCreateView.as_view(), name='content-feed'),
+    path('feed/async/', views.AsyncFeedView.as_view(), name='content-feed-async'),
     path('posts/<int:post_id>/like/', views.like_post, name='like-post'),
+    path('posts/<int:post_id>/comments/', views.CommentListCreateView.as_view(), name='post-comments'),
+    path('trending/', views.trending, name='trending'),
 ]
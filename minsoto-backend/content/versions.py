@@ -0,0 +1,15 @@
+# content/versions.py
+from minsoto.conditional import bump_version, get_version
+
+
+def _likes_version_key(user_id):
+    return f'content:likes:version:{user_id}'
+
+
+def get_likes_version(user_id):
+    """Moves whenever the user likes or unlikes a post, buffered or not"""
+    return get_version(_likes_version_key(user_id))
+
+
+def bump_likes_version(user_id):
+    bump_version(_likes_version_key(user_id))
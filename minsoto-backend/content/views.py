@@ -1,62 +1,204 @@
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
+from django.shortcuts import get_object_or_404
 from .models import Post, Like, Comment
 from .serializers import PostSerializer, CommentSerializer
-from connections.models import Connection, Interest
+from .projections import PostProjection
+from connections.interest_index import interest_index
+from connections.models import Interest
+from connections.projections import project_interest
+from minsoto.async_views import AsyncListView
+from minsoto.conditional import ConditionalGetMixin
+from .counters import adjust_post_counters
+from .feed import aget_connections_feed, get_connections_feed, with_feed_data
+from .interest_feed import afilter_by_interests, filter_by_interests, tagged_with_any
+from .ranking import RankedFeedPagination
+from .trends import get_trending, trend_tracker
+from .like_buffer import like_buffer
+from .versions import bump_likes_version, get_likes_version
+from .visibility import visible_to
+from notifications.events import notify
 
-class PostListCreateView(generics.ListCreateAPIView):
+def get_filter_interests(filter_param):
+    """Interest ids for ?filter=: 'all', or comma-separated interest ids,
+    names or slugs. Unknown ones are ignored, as the name lookup always did."""
+    if filter_param == 'all':
+        return []
+    # Whole value first, for names that contain a comma
+    return interest_index.resolve([filter_param]) or interest_index.resolve(filter_param.split(','))
+
+class PostListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = PostSerializer
     permission_classes = [IsAuthenticated]
     
+    def get_serializer_class(self):
+        # Feed pages render through the projection; creating still validates
+        if self.request.method == 'GET':
+            return PostProjection
+        return PostSerializer
+    
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator') and self.request.query_params.get('feed_type') == 'for_you':
+            self._paginator = RankedFeedPagination()
+        return super().paginator
+    
+    def get_validator_fields(self):
+        # Counter columns change without touching updated_at
+        return [*super().get_validator_fields(), 'likes_count', 'comments_count']
+    
+    def get_validator_versions(self):
+        # A rebuilt ranking can reorder the same posts. The viewer's own
+        # likes change is_liked, possibly before they reach the database (see
+        # like_buffer) and without moving the page's counter sums.
+        return [getattr(self.paginator, 'ranking_id', None), get_likes_version(self.request.user.id)]
+    
     def get_queryset(self):
         feed_type = self.request.query_params.get('feed_type', 'global')
         filter_param = self.request.query_params.get('filter', 'all')
         
+        if feed_type == 'for_you':
+            # Ranked and paged by RankedFeedPagination; visible_to() again in
+            # case something was hidden since the ranking was built. Interest
+            # filters do not apply to the ranking.
+            return with_feed_data(Post.objects.filter(visible_to(self.request.user)), self.request.user)
+        
+        interest_ids = get_filter_interests(filter_param)
+        position = self.paginator.decode_position(self.request)
+        limit = self.paginator.get_page_size(self.request) + 1
         if feed_type == 'connections':
-            # Get posts from connections
-            user_connections = Connection.objects.filter(
-                Q(user1=self.request.user) | Q(user2=self.request.user)
-            )
-            connected_users = []
-            for conn in user_connections:
-                other_user = conn.user2 if conn.user1 == self.request.user else conn.user1
-                connected_users.append(other_user)
-            
-            queryset = Post.objects.filter(
-                Q(author__in=connected_users) | Q(author=self.request.user),
-                visibility__in=['public', 'connections']
-            )
+            # Paged off the reader's materialized entries, see content/feed.py
+            queryset = Post.objects.filter(visible_to(self.request.user))
+            if interest_ids:
+                queryset = queryset.filter(tagged_with_any(interest_ids))
+            queryset, self.resume_position = get_connections_feed(self.request.user, queryset, position, limit)
         else:
-            # Global feed
+            # Global feed: public posts only, off content_post_public_idx
             queryset = Post.objects.filter(visibility='public')
+            if interest_ids:
+                queryset, self.resume_position = filter_by_interests(queryset, interest_ids, position, limit)
         
-        if filter_param != 'all':
-            try:
-                interest = Interest.objects.get(name=filter_param)
-                queryset = queryset.filter(interests=interest)
-            except Interest.DoesNotExist:
-                pass
+        return with_feed_data(queryset, self.request.user).order_by('-created_at', '-id')
+    
+    def perform_create(self, serializer):
+        post = serializer.save(author=self.request.user)
+        trend_tracker.record(post.id, 'post')
+
+class AsyncFeedView(AsyncListView):
+    """GET-only variant of PostListCreateView on the async ORM"""
+    serializer_class = PostProjection
+    
+    async def aget_queryset(self):
+        feed_type = self.request.query_params.get('feed_type', 'global')
+        filter_param = self.request.query_params.get('filter', 'all')
         
-        return queryset.order_by('-created_at')
+        # The index reloads from the database after an interest changes
+        interest_ids = await sync_to_async(get_filter_interests)(filter_param)
+        paginator = self.pagination_class()
+        position = paginator.decode_position(self.request)
+        limit = paginator.get_page_size(self.request) + 1
+        if feed_type == 'connections':
+            queryset = Post.objects.filter(visible_to(self.request.user))
+            if interest_ids:
+                queryset = queryset.filter(tagged_with_any(interest_ids))
+            queryset, self.resume_position = await aget_connections_feed(self.request.user, queryset, position, limit)
+        else:
+            queryset = Post.objects.filter(visibility='public')
+            if interest_ids:
+                queryset, self.resume_position = await afilter_by_interests(queryset, interest_ids, position, limit)
+        
+        return with_feed_data(queryset, self.request.user).order_by('-created_at', '-id')
+
+class CommentListCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
+    serializer_class = CommentSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_ordering = ('created_at', 'id')  # Oldest first, like a thread
+    
+    def get_post(self):
+        """The thread's post, 404 if it does not exist or the viewer may not see it"""
+        if not hasattr(self, '_post'):
+            self._post = get_object_or_404(
+                Post.objects.filter(visible_to(self.request.user)), pk=self.kwargs['post_id']
+            )
+        return self._post
+    
+    def get_queryset(self):
+        return Comment.objects.filter(
+            post=self.get_post()
+        ).select_related('author__profile')
     
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user)
+        post = self.get_post()
+        with transaction.atomic():
+            serializer.save(author=self.request.user, post=post)
+            adjust_post_counters(post.id, comments=1)
+        trend_tracker.record(post.id, 'comment')
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def like_post(request, post_id):
+    if settings.LIKE_BUFFER_ENABLED:
+        row = Post.objects.filter(id=post_id).values_list('author_id', 'likes_count').first()
+        if row is None:
+            return Response({'error': 'Post not found'}, status=404)
+        author_id, likes_count = row
+        liked = like_buffer.toggle(request.user.id, post_id)
+        # The stored count lags the buffer until the next flush
+        likes_count = max(likes_count + like_buffer.pending_likes(post_id), 0)
+        _after_like(request.user, post_id, author_id, liked, likes_count)
+        return Response({'liked': liked, 'likes_count': likes_count})
+    
     try:
         post = Post.objects.get(id=post_id)
-        like, created = Like.objects.get_or_create(user=request.user, post=post)
+        with transaction.atomic():
+            like, created = Like.objects.get_or_create(user=request.user, post=post)
+            if created:
+                adjust_post_counters(post.id, likes=1)
+            else:
+                # A concurrent unlike may already have removed the row;
+                # only count what this request deleted
+                deleted, _ = Like.objects.filter(pk=like.pk).delete()
+                if deleted:
+                    adjust_post_counters(post.id, likes=-deleted)
+        # After the commit, so the new likes version never labels the old state
+        likes_count = Post.objects.filter(pk=post.id).values_list('likes_count', flat=True).first() or 0
+        _after_like(request.user, post.id, post.author_id, created, likes_count)
         
-        if not created:
-            like.delete()
-            return Response({'liked': False})
-        else:
-            return Response({'liked': True})
+        return Response({'liked': created, 'likes_count': likes_count})
             
     except Post.DoesNotExist:
         return Response({'error': 'Post not found'}, status=404)
+
+def _after_like(user, post_id, author_id, liked, likes_count):
+    bump_likes_version(user.id)
+    if liked:
+        trend_tracker.record(post_id, 'like', user_id=user.id)
+    if liked and author_id != user.id:
+        notify([author_id], 'like', {'post_id': post_id, 'user_id': user.id, 'likes_count': likes_count})
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def trending(request):
+    """Trending posts and interests from the precomputed top lists in
+    content.trends; posts the viewer may not see are left out"""
+    top = get_trending()
+    post_ids = [post_id for post_id, _ in top['post']]
+    posts = with_feed_data(Post.objects.filter(visible_to(request.user), pk__in=post_ids), request.user).in_bulk()
+    interests = Interest.objects.in_bulk([interest_id for interest_id, _ in top['interest']])
+    
+    return Response({
+        'posts': PostProjection(
+            [posts[post_id] for post_id in post_ids if post_id in posts],
+            many=True, context={'request': request}
+        ).data,
+        'interests': [
+            {**project_interest(interests[interest_id]), 'score': round(score, 2)}
+            for interest_id, score in top['interest'] if interest_id in interests
+        ],
+    })
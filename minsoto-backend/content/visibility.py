@@ -0,0 +1,39 @@
+# content/visibility.py
+from django.db.models import Exists, OuterRef, Q
+from circles.models import CircleMembership
+from connections.models import ConnectionEdge
+
+# What a post made in a circle may be: for its members, or for everyone.
+# Members share one view of the circle's timeline, so a friends- or
+# connections-only post there would reach members it was not meant for.
+CIRCLE_POST_VISIBILITIES = ['circle', 'public']
+
+
+def visible_to(user):
+    """Q() matching every post the user may see, for Post.objects.filter().
+
+    Connection, friendship and shared-circle checks are Exists() subqueries
+    against the outer post's author or circle, so the whole feed stays one query that
+    the database can drive from the (created_at, id) indexes. Anonymous
+    users see public posts only.
+    """
+    if not user.is_authenticated:
+        return Q(visibility='public')
+    edges = ConnectionEdge.objects.filter(user=user, other_user=OuterRef('author_id'))
+    viewer_circles = CircleMembership.objects.filter(user=user, is_active=True).values('circle_id')
+    in_post_circle = CircleMembership.objects.filter(
+        user=user, circle_id=OuterRef('circle_id'), is_active=True
+    )
+    # Circle posts made before posts could name their circle: any circle
+    # shared with the author will do
+    shares_circle = CircleMembership.objects.filter(
+        user=OuterRef('author_id'), is_active=True, circle_id__in=viewer_circles
+    )
+    return (
+        Q(visibility='public') |
+        Q(author=user) |
+        Q(Exists(edges), visibility='connections') |
+        Q(Exists(edges.filter(connection_type='friend')), visibility='friends') |
+        Q(Exists(in_post_circle), visibility='circle') |
+        Q(Exists(shares_circle), visibility='circle', circle__isnull=True)
+    )
@@ -0,0 +1,63 @@
+# minsoto/async_views.py
+from django.views import View
+from django.http import HttpResponse
+from rest_framework import exceptions
+from rest_framework.request import Request
+from .authentication import AsyncJWTAuthentication
+from .pagination import KeysetPagination
+from .renderers import ORJSONRenderer
+
+
+class AsyncListView(View):
+    """Read-only, keyset-paginated list endpoint on Django's async ORM.
+
+    DRF views only run synchronously, so under ASGI each request is handed
+    to a worker thread and back. These views stay on the event loop: the
+    user is loaded with aget(), the page with aiterator(), and the same
+    DRF serializers render the rows.
+
+    Subclasses implement aget_queryset() and must select, prefetch or
+    annotate everything their serializer reads. Serializing then touches
+    no database, and a stray lazy query raises SynchronousOnlyOperation
+    instead of quietly blocking the loop.
+    """
+    serializer_class = None
+    pagination_class = KeysetPagination
+    renderer_class = ORJSONRenderer
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            return await self.alist(request)
+        except exceptions.APIException as e:
+            detail = e.detail if isinstance(e.detail, (dict, list)) else {'detail': e.detail}
+            return self.render(detail, status=e.status_code)
+
+    async def alist(self, request):
+        authenticated = await AsyncJWTAuthentication().aauthenticate(request)
+        if authenticated is None:
+            raise exceptions.NotAuthenticated()
+
+        # A DRF request gives the paginator and serializers query_params;
+        # the user is set directly so nothing re-runs the sync authenticators
+        self.request = Request(request, authenticators=())
+        self.request.user = authenticated[0]
+
+        queryset = await self.aget_queryset()
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, self.request, view=self)
+        data = await self.aserialize(page)
+        return self.render(paginator.get_paginated_response(data).data)
+
+    async def aget_queryset(self):
+        raise NotImplementedError
+
+    async def aserialize(self, objects):
+        """Serialized page; override to load context the serializer needs"""
+        return self.get_serializer(objects).data
+
+    def get_serializer(self, objects, **context):
+        return self.serializer_class(objects, many=True, context={'request': self.request, **context})
+
+    def render(self, data, status=200):
+        renderer = self.renderer_class()
+        return HttpResponse(renderer.render(data), status=status, content_type=renderer.media_type)
@@ -0,0 +1,116 @@
+# minsoto/conditional.py
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def get_version(key):
+    """Current value of a version counter kept in the cache"""
+    # Seeded from the clock so an evicted counter never restarts at an old value
+    cache.add(key, time.time_ns(), None)
+    return cache.get(key)
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+class ConditionalGetMixin:
+    """ETag / Last-Modified support for generic list and detail views.
+
+    Validators are computed before anything is serialized: the pk and
+    `last_modified_field` of each row the response would contain, in order
+    (just the current page on paginated lists), plus any version counters
+    the view returns from get_validator_versions() for data those columns
+    cannot see. A matching If-None-Match or If-Modified-Since gets a 304
+    straight away.
+
+    Lists only send an ETag: deleting a row can leave max(updated_at)
+    unchanged, so a Last-Modified date alone would not notice it. Aggregates
+    over the page are not enough either: removing a row from a full page
+    pulls the next one in without moving the count or the newest date.
+    """
+    last_modified_field = 'updated_at'
+
+    def get_validator_fields(self):
+        """Columns of the response rows that change whenever they do"""
+        fields = ['pk']
+        if self.last_modified_field:
+            fields.append(self.last_modified_field)
+        return fields
+
+    def get_validator_versions(self):
+        """Version counters covering anything else the response depends on"""
+        return []
+
+    def get_validators(self, rows):
+        """(etag, last_modified) for a response built from `rows`"""
+        state = []
+        last_modified = None
+        if rows is not None and not isinstance(rows, list):
+            fields = self.get_validator_fields()
+            state = list(rows.values_list(*fields))
+            if not rows.ordered:
+                state.sort()
+            if self.last_modified_field and state:
+                column = fields.index(self.last_modified_field)
+                last_modified = max((row[column] for row in state if row[column] is not None), default=None)
+        versions = self.get_validator_versions()
+
+        request = self.request
+        fingerprint = repr((
+            request.get_full_path(),
+            request.user.pk,
+            request.accepted_renderer.format,
+            state,
+            versions,
+        ))
+        etag = 'W/"%s"' % hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest()
+        return etag, last_modified
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset
+        if self.paginator is not None:
+            rows = self.paginator.get_page_queryset(queryset, request, view=self)
+
+        etag, _ = self.get_validators(rows)
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.get_serializer(page, many=True).data)
+        else:
+            response = Response(self.get_serializer(queryset, many=True).data)
+        response['ETag'] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        # Views that resolve their own object (no lookup kwarg) rely on versions
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        rows = None
+        if lookup_url_kwarg in self.kwargs:
+            rows = self.filter_queryset(self.get_queryset()).filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+
+        etag, last_modified = self.get_validators(rows)
+        last_modified = int(last_modified.timestamp()) if last_modified else None
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
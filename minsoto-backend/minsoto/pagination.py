@@ -0,0 +1,158 @@
+# minsoto/pagination.py
+import base64
+import json
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination keyed on the values of the last row seen.
+
+    Pages are selected with a WHERE over the ordering keys instead of OFFSET,
+    so the hundredth page costs the same as the first. The default key is
+    (created_at, id); a view can set `pagination_ordering` to use another
+    one, as long as its last field is unique.
+
+    A view that stops scanning before it fills a page (see content.streams)
+    sets `resume_position` to the last key it checked; the next link then
+    continues from there even though the page came out short.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        results = list(self.get_page_queryset(queryset, request, view))
+        return self.set_page(results, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset on the async ORM, for querysets only"""
+        rows = self.get_page_queryset(queryset, request, view)
+        results = [obj async for obj in rows.aiterator(chunk_size=self.page_size + 1)]
+        return self.set_page(results, view)
+
+    def set_page(self, results, view):
+        """Keep the page out of `results`, the page plus one if there is more"""
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        self.resume_position = None
+        if not self.has_next:
+            self.resume_position = getattr(view, 'resume_position', None)
+            self.has_next = self.resume_position is not None
+        return self.page
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """The rows of the requested page plus one to detect the next page,
+        unevaluated. Accepts a queryset, or a list already sorted by the
+        ordering (for views served from memory)."""
+        self.request = request
+        self.ordering = getattr(view, 'pagination_ordering', self.ordering)
+        self.page_size = self.get_page_size(request)
+        position = self.decode_position(request)
+
+        if isinstance(queryset, list):
+            if position is not None:
+                queryset = [obj for obj in queryset if self.is_after(obj, position)]
+        else:
+            queryset = queryset.order_by(*self.ordering)
+            if position is not None:
+                queryset = queryset.filter(self.get_keyset_filter(position))
+        return queryset[:self.page_size + 1]
+
+    def get_page_size(self, request):
+        page_size = settings.REST_FRAMEWORK['PAGE_SIZE']
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return page_size
+        if requested > 0:
+            page_size = min(requested, settings.PAGINATION_MAX_PAGE_SIZE)
+        return page_size
+
+    def decode_position(self, request):
+        """Return the ordering key values encoded in the cursor, or None"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def get_position(self, obj):
+        position = []
+        for field in self.ordering:
+            value = getattr(obj, field.lstrip('-'))
+            if isinstance(value, date):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def encode_position(self, obj):
+        return self.encode_values(self.get_position(obj))
+
+    def encode_values(self, position):
+        position = [value.isoformat() if isinstance(value, date) else value for value in position]
+        return base64.urlsafe_b64encode(json.dumps(position).encode('ascii')).decode('ascii')
+
+    def is_after(self, obj, position):
+        """In-memory counterpart of get_keyset_filter"""
+        for field, current, value in zip(self.ordering, self.get_position(obj), position):
+            if current != value:
+                return current < value if field.startswith('-') else current > value
+        return False
+
+    def get_keyset_filter(self, position):
+        """Rows strictly after `position` in the ordering.
+
+        Expands (a, b) < (x, y) into a <= x AND (a < x OR (a = x AND b < y));
+        the redundant leading bound lets the database range-scan the index.
+        """
+        names = [field.lstrip('-') for field in self.ordering]
+        lookups = ['lt' if field.startswith('-') else 'gt' for field in self.ordering]
+
+        after = Q()
+        for i, name in enumerate(names):
+            clause = Q(**{f'{name}__{lookups[i]}': position[i]})
+            for previous, value in zip(names[:i], position):
+                clause &= Q(**{previous: value})
+            after |= clause
+
+        leading = Q(**{f'{names[0]}__{lookups[0]}e': position[0]})
+        return leading & after
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.resume_position is not None:
+            cursor = self.encode_values(self.resume_position)
+        else:
+            cursor = self.encode_position(self.page[-1])
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,9 @@
+# minsoto/projections.py
+from rest_framework import serializers
+
+_datetime_field = serializers.DateTimeField()
+
+
+def iso_datetime(value):
+    """A datetime exactly as a DRF DateTimeField renders it"""
+    return _datetime_field.to_representation(value) if value is not None else None
@@ -0,0 +1,41 @@
+# minsoto/renderers.py
+try:
+    import orjson
+except ImportError:  # Optional; DRF's own encoder is used without it
+    orjson = None
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_fallback_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer backed by orjson, which encodes a feed page several
+    times faster than json.dumps.
+
+    Output matches JSONRenderer's compact, UTF-8 form. Types orjson does not
+    know (lazy strings, Decimals, querysets...) go through DRF's encoder.
+    Indented output for the browsable API, or a missing orjson, falls back
+    to JSONRenderer entirely.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        try:
+            ret = orjson.dumps(data, default=_fallback_encoder.default, option=orjson.OPT_UTC_Z)
+        except TypeError:
+            # Non-string keys, such as the item indexes in a list serializer's
+            # errors; json.dumps turns them into strings. Not the default,
+            # since orjson handles str-keyed dicts faster without the option.
+            ret = orjson.dumps(
+                data, default=_fallback_encoder.default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+            )
+        # Same escaping as JSONRenderer, so the output is safe inside <script>
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -55,6 +55,7 @@ INSTALLED_APPS = [
     'content', 
     'circles',
     'extensions',
+    'notifications',
     # allauth and dj-rest-auth
     'allauth',
     'allauth.account',
@@ -129,8 +130,98 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',  # ← Fixed
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'minsoto.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'minsoto.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
 }
 
+# Upper bound for the ?page_size= query parameter on list endpoints
+PAGINATION_MAX_PAGE_SIZE = 100
+
+# --- Cache ---
+# Local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared
+# backend (e.g. Redis or Memcached) when running several workers. The
+# trending lists need one even with a single worker: `manage.py
+# compact_trends` stores them from its own process, and refuses to run
+# against local memory, where the API would never see them
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'minsoto'),
+    }
+}
+
+# How long a user's connection adjacency stays cached (signals also invalidate it)
+CONNECTION_GRAPH_CACHE_TIMEOUT = 60 * 60
+
+# Cached ProfileDetailView responses; saves bump a version so this is only a backstop
+PROFILE_CACHE_TIMEOUT = 60 * 60 * 24
+
+# --- Connection Suggestions ---
+# Stored per user by `manage.py refresh_suggestions`, which should be
+# scheduled (e.g. hourly from cron); the API only reads the stored rows
+SUGGESTIONS_LIMIT = 20
+
+# --- Feed Configuration ---
+# Authors with more connections than this skip fan-out-on-write; their posts
+# are pulled into their connections' feeds at read time instead
+FEED_FANOUT_THRESHOLD = 1000
+# Recent posts copied into each side's feed when a new connection is made
+FEED_BACKFILL_SIZE = 200
+# Rounds of candidates a filtered feed page checks before it returns short
+# and lets the next page continue; each round reads twice as many as the last
+FEED_SCAN_ROUNDS = 4
+# Members of a circle share the first page of its timeline; new posts bump a
+# version, so this only bounds how stale like/comment counts get. 0 disables
+CIRCLE_FEED_CACHE_TIMEOUT = 30
+
+# --- Ranked ("for you") feed, see content/ranking.py ---
+# Candidates come from posts newer than this, at most this many per source
+RANKED_FEED_WINDOW_HOURS = 72
+RANKED_FEED_CANDIDATES = 500
+RANKED_FEED_HALF_LIFE_HOURS = 12
+RANKED_FEED_WEIGHTS = {'recency': 1.0, 'velocity': 0.5, 'connection': 0.8, 'interests': 0.6}
+# A user's ranking is rebuilt at most this often; cursors keep paging through
+# the ranking they started on for up to RANKED_FEED_SCROLL_TIMEOUT
+RANKED_FEED_CACHE_TIMEOUT = 60 * 2
+RANKED_FEED_SCROLL_TIMEOUT = 60 * 30
+
+# --- Like Buffer ---
+# When enabled, like toggles are coalesced in memory and flushed in batches
+# (see content/like_buffer.py) instead of hitting the Like table per click.
+# The buffer is per process: only enable it with a single worker
+LIKE_BUFFER_ENABLED = False
+LIKE_BUFFER_FLUSH_INTERVAL = 2  # seconds
+LIKE_BUFFER_MAX_PENDING = 500
+
+# --- Trending, see content/trends.py ---
+# Activity points are summed per post and interest into buckets of this many
+# seconds; buckets older than the window are ignored and then compacted away.
+# The top lists are only recomputed by `manage.py compact_trends`
+TRENDS_BUCKET_SECONDS = 60 * 60
+TRENDS_WINDOW_HOURS = 24
+TRENDS_HALF_LIFE_HOURS = 6
+TRENDS_POINTS = {'post': 1, 'like': 1, 'comment': 2}
+TRENDS_TOP_K = 50  # Entries kept in each top list
+TRENDS_FLUSH_INTERVAL = 10  # Seconds points stay in memory before being written
+TRENDS_MAX_PENDING = 1000
+
+# --- Habits ---
+# Calendar windows (in days) clients may request with ?days=; the first is the default
+HABIT_CALENDAR_WINDOWS = [30, 90, 365]
+
+# --- Notifications ---
+# In-process pub/sub is enough for one node; see notifications/broker.py for more
+NOTIFICATIONS_BROKER = os.getenv('NOTIFICATIONS_BROKER', 'notifications.broker.InProcessBroker')
+NOTIFICATIONS_HEARTBEAT_INTERVAL = 15  # Seconds between keepalives on an idle stream
+NOTIFICATIONS_QUEUE_SIZE = 100  # Events buffered per stream before new ones are dropped
+NOTIFICATIONS_RETRY_MS = 5000  # EventSource reconnect delay
+NOTIFICATIONS_TICKET_TIMEOUT = 30  # Seconds a stream ticket can wait before being redeemed
+NOTIFICATIONS_STREAM_MAX_AGE = 60 * 60  # Streams close after this and reconnect with a new ticket
+
 JWT_AUTH_COOKIE = 'jwt-auth'
 JWT_AUTH_REFRESH_COOKIE = 'jwt-refresh'
 
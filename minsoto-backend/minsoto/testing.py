@@ -0,0 +1,35 @@
+# minsoto/testing.py
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from users.models import CustomUser
+
+# A small and a large page: a list's query count must not depend on its size
+PAGE_SIZES = (2, 20)
+
+
+def make_user(name, **fields):
+    return CustomUser.objects.create_user(email=f'{name}@example.com', username=name, password='x', **fields)
+
+
+class APITestCase(TestCase):
+    """Starts each test with an empty cache and a client signed in as
+    `self.viewer`, which subclasses create in setUpTestData()"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.viewer)
+
+    def assertPageQueries(self, url, expected):
+        """Fetch `url` at each of PAGE_SIZES and require `expected` queries
+        and a full page both times. `url` already has a query string."""
+        for page_size in PAGE_SIZES:
+            page_url = f'{url}&page_size={page_size}'
+            # Warm the caches (validator versions, adjacency, interest index) first
+            self.client.get(page_url)
+            with self.assertNumQueries(expected):
+                response = self.client.get(page_url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), page_size)
@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenRefreshView
-from users.views import SetUsernameView, GoogleLogin, MyProfileUpdateView, ProfileDetailView
+from users.views import SetUsernameView, GoogleLogin, MyProfileUpdateView, ProfileDetailView, search_users
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,9 +13,11 @@ urlpatterns = [
     path('api/auth/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/profiles/me/', MyProfileUpdateView.as_view(), name='my-profile-update'),
     path('api/profiles/<str:username>/', ProfileDetailView.as_view(), name='profile-detail'),  # ← FIXED
+    path('api/users/search/', search_users, name='search-users'),
     path('api/connections/', include('connections.urls')),
     path('api/content/', include('content.urls')),      # ← ADD
     path('api/circles/', include('circles.urls')),      # ← ADD
+    path('api/notifications/', include('notifications.urls')),
 ]
 
 
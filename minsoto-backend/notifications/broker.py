@@ -0,0 +1,97 @@
+# notifications/broker.py
+import asyncio
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class Subscription:
+    """One open stream's queue of events, bound to the event loop that reads it"""
+
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=settings.NOTIFICATIONS_QUEUE_SIZE)
+
+    def deliver(self, event):
+        # Publishers run in worker threads; hand the event to the stream's loop
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass  # A client this far behind will re-fetch when it reconnects
+
+    async def get(self, timeout):
+        """Next event, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Pub/sub between the publishers and open streams of one process.
+
+    Enough for a single node. For several, subclass it: make publish() send
+    the event to a shared bus (Redis, Postgres LISTEN/NOTIFY, ...) and have
+    each process call deliver_local() for what it receives from the bus.
+    Select the class with the NOTIFICATIONS_BROKER setting.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)  # user_id -> {Subscription}
+
+    def subscribe(self, user_id):
+        """Open a subscription; must be called from the stream's event loop"""
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_ids, event):
+        """Send an encoded event to every open stream of the given users"""
+        self.deliver_local(user_ids, event)
+
+    def deliver_local(self, user_ids, event):
+        with self._lock:
+            targets = [
+                subscription
+                for user_id in user_ids
+                for subscription in self._subscriptions.get(user_id, ())
+            ]
+        for subscription in targets:
+            subscription.deliver(event)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.NOTIFICATIONS_BROKER)()
+    return _broker
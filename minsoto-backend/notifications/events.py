@@ -0,0 +1,16 @@
+# notifications/events.py
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from .broker import get_broker
+
+
+def notify(user_ids, event_type, data):
+    """Push an event to the users' open streams once the current transaction
+    commits, so clients never re-fetch before the change is visible"""
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    # Encoded once here, however many streams receive it
+    event = json.dumps({'type': event_type, 'data': data}, cls=DjangoJSONEncoder)
+    transaction.on_commit(lambda: get_broker().publish(user_ids, event))
@@ -0,0 +1,119 @@
+# notifications/management/commands/loadtest_streams.py
+import asyncio
+import json
+import time
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = ('Open many idle notification streams against a running server and report '
+            'how many one worker keeps alive. Each connection gets its own single-use ticket '
+            'from the ticket endpoint first, as the frontend does. Run the server with a single '
+            'ASGI worker, e.g. `uvicorn minsoto.asgi:application --workers 1`.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000/api/notifications/stream/')
+        parser.add_argument('--ticket-url', help='Ticket endpoint; defaults to ticket/ next to --url')
+        parser.add_argument('--token', required=True, help='Access token to request tickets with')
+        parser.add_argument('--connections', type=int, default=1000)
+        parser.add_argument('--ramp', type=int, default=200, help='New connections opened per second')
+        parser.add_argument('--hold', type=int, default=60,
+                            help='Seconds to hold the connections open once ramped up')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        ticket_url = urlsplit(options['ticket_url'] or urljoin(options['url'], '../ticket/'))
+        if url.scheme != 'http' or ticket_url.scheme != 'http':
+            raise CommandError('Only plain http:// URLs are supported')
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.path = url.path
+        self.ticket_address = (ticket_url.hostname, ticket_url.port or 80)
+        self.ticket_path = ticket_url.path
+        self.token = options['token']
+        self.stats = {'open': 0, 'peak': 0, 'failed': 0, 'dropped': 0, 'keepalives': 0}
+
+        asyncio.run(self.run(options['connections'], options['ramp'], options['hold']))
+
+    async def run(self, connections, ramp, hold):
+        started = time.monotonic()
+        tasks = []
+        for i in range(connections):
+            tasks.append(asyncio.create_task(self.hold_stream()))
+            if (i + 1) % ramp == 0:
+                await asyncio.sleep(1)
+                self.report(started)
+
+        deadline = time.monotonic() + hold
+        while time.monotonic() < deadline:
+            await asyncio.sleep(5)
+            self.report(started)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.stdout.write(self.style.SUCCESS(
+            f"Peak: {self.stats['peak']} concurrent streams held, "
+            f"{self.stats['failed']} failed to open, {self.stats['dropped']} dropped"
+        ))
+
+    async def fetch_ticket(self):
+        """POST to the ticket endpoint and return the ticket"""
+        host, port = self.ticket_address
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(
+                f'POST {self.ticket_path} HTTP/1.1\r\nHost: {host}\r\n'
+                f'Authorization: Bearer {self.token}\r\nAccept: application/json\r\n'
+                f'Content-Length: 0\r\nConnection: close\r\n\r\n'.encode()
+            )
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        status = head.split(b'\r\n', 1)[0]
+        if b' 200 ' not in status:
+            raise ConnectionError(f'ticket: {status.decode(errors="replace")}')
+        try:
+            return json.loads(body)['ticket']
+        except (ValueError, KeyError) as e:
+            raise ConnectionError(f'ticket: unexpected response {body[:100]!r}') from e
+
+    async def hold_stream(self):
+        try:
+            ticket = await self.fetch_ticket()
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            writer.write(
+                f"GET {self.path}?{urlencode({'ticket': ticket})} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f'Accept: text/event-stream\r\n\r\n'.encode()
+            )
+            await writer.drain()
+            status = await reader.readline()
+            if b' 200 ' not in status:
+                raise ConnectionError(status.decode(errors='replace').strip())
+        except (OSError, ConnectionError):
+            self.stats['failed'] += 1
+            return
+
+        self.stats['open'] += 1
+        self.stats['peak'] = max(self.stats['peak'], self.stats['open'])
+        try:
+            while line := await reader.readline():
+                if line.startswith(b': keepalive'):
+                    self.stats['keepalives'] += 1
+            self.stats['dropped'] += 1
+        except OSError:
+            self.stats['dropped'] += 1
+        finally:
+            self.stats['open'] -= 1
+            writer.close()
+
+    def report(self, started):
+        self.stdout.write(
+            f"{time.monotonic() - started:6.1f}s  open={self.stats['open']} "
+            f"failed={self.stats['failed']} dropped={self.stats['dropped']} "
+            f"keepalives={self.stats['keepalives']}"
+        )
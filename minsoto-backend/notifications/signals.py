@@ -0,0 +1,41 @@
+# notifications/signals.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from circles.models import CircleMembership
+from connections.graph import get_adjacency
+from connections.models import ConnectionRequest
+from content.feed import FEED_VISIBILITIES
+from content.models import Post
+from .events import notify
+
+@receiver(post_save, sender=ConnectionRequest)
+def push_connection_request(sender, instance, created, **kwargs):
+    if created:
+        notify([instance.receiver_id], 'connection_request', {
+            'id': instance.id,
+            'sender_id': instance.sender_id,
+            'request_type': instance.request_type,
+        })
+
+@receiver(post_save, sender=Post)
+def push_new_post(sender, instance, created, **kwargs):
+    """Tell connected users with a stream open that their feed has a new post"""
+    if created and instance.visibility in FEED_VISIBILITIES:
+        notify(_post_readers(instance), 'post', {
+            'id': instance.id,
+            'author_id': instance.author_id,
+        })
+
+def _post_readers(post):
+    """Connections of the author who can see the post, see content.visibility"""
+    adjacency = get_adjacency(post.author_id)
+    if post.visibility == 'friends':
+        return [user_id for user_id, connection_type in adjacency.items() if connection_type == 'friend']
+    if post.visibility == 'circle':
+        circles = [post.circle_id] if post.circle_id else CircleMembership.objects.filter(
+            user_id=post.author_id, is_active=True
+        ).values('circle_id')
+        return list(CircleMembership.objects.filter(
+            circle_id__in=circles, user_id__in=list(adjacency), is_active=True
+        ).values_list('user_id', flat=True).distinct())
+    return list(adjacency)
@@ -0,0 +1,30 @@
+# notifications/tickets.py
+import secrets
+from django.conf import settings
+from django.core.cache import cache
+
+
+def _ticket_key(ticket):
+    return f'notifications:ticket:{ticket}'
+
+
+def issue_ticket(user_id):
+    """A random single-use ticket opening one event stream for the user.
+
+    EventSource cannot send an Authorization header, and a JWT in the query
+    string ends up in server and proxy logs for its whole lifetime; a
+    ticket is useless once redeemed or NOTIFICATIONS_TICKET_TIMEOUT old.
+    """
+    ticket = secrets.token_urlsafe(32)
+    cache.set(_ticket_key(ticket), user_id, settings.NOTIFICATIONS_TICKET_TIMEOUT)
+    return ticket
+
+
+async def aredeem_ticket(ticket):
+    """The ticket's user id, or None if it is unknown, expired or used"""
+    key = _ticket_key(ticket)
+    user_id = await cache.aget(key)
+    # Only the request that manages to delete it may use it
+    if user_id is None or not await cache.adelete(key):
+        return None
+    return user_id
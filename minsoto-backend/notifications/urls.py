@@ -0,0 +1,8 @@
+# notifications/urls.py
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('ticket/', views.stream_ticket, name='notification-ticket'),
+    path('stream/', views.event_stream, name='notification-stream'),
+]
@@ -0,0 +1,58 @@
+# notifications/views.py
+import time
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from users.models import CustomUser
+from .broker import get_broker
+from .tickets import aredeem_ticket, issue_ticket
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def stream_ticket(request):
+    """A short-lived, single-use ticket for opening event_stream"""
+    return Response({
+        'ticket': issue_ticket(request.user.id),
+        'expires_in': settings.NOTIFICATIONS_TICKET_TIMEOUT,
+    })
+
+
+async def event_stream(request):
+    """Server-sent events for the signed-in user, one JSON object per
+    message: {"type": ..., "data": {...}}.
+
+    Replaces polling the request inbox and the feed. EventSource cannot set
+    headers, so the client first gets a ticket from stream_ticket and opens
+    the stream with ?ticket=. The stream ends after
+    NOTIFICATIONS_STREAM_MAX_AGE, and the client reconnects with a new
+    ticket, which re-checks the user.
+    """
+    user_id = await aredeem_ticket(request.GET.get('ticket', ''))
+    if user_id is None or not await CustomUser.objects.filter(pk=user_id, is_active=True).aexists():
+        return JsonResponse({'detail': 'Invalid or expired stream ticket.'}, status=401)
+
+    response = StreamingHttpResponse(
+        _stream(user_id, expires_at=time.time() + settings.NOTIFICATIONS_STREAM_MAX_AGE),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Stop nginx from buffering the stream
+    return response
+
+
+async def _stream(user_id, expires_at):
+    subscription = get_broker().subscribe(user_id)
+    try:
+        yield f'retry: {settings.NOTIFICATIONS_RETRY_MS}\n\n'
+        while (remaining := expires_at - time.time()) > 0:
+            event = await subscription.get(timeout=min(settings.NOTIFICATIONS_HEARTBEAT_INTERVAL, remaining))
+            if event is None:
+                # Comment line: keeps proxies from timing the connection out
+                yield ': keepalive\n\n'
+            else:
+                yield f'data: {event}\n\n'
+    finally:
+        subscription.close()
@@ -0,0 +1,41 @@
+# users/cache.py
+from django.conf import settings
+from django.core.cache import cache
+from minsoto.conditional import bump_version, get_version
+
+
+def _version_key(user_id):
+    return f'profiles:version:{user_id}'
+
+
+def _response_key(username):
+    return f'profiles:detail:{username}'
+
+
+def get_profile_version(user_id):
+    """Current version counter for the user's public profile"""
+    return get_version(_version_key(user_id))
+
+
+def bump_profile_version(user_id):
+    bump_version(_version_key(user_id))
+
+
+def get_cached_profile(username):
+    """(data, etag) for a cached profile response that is still current, else None"""
+    entry = cache.get(_response_key(username))
+    if entry is None or entry['version'] != get_profile_version(entry['user_id']):
+        return None
+    return entry['data'], profile_etag(entry['user_id'], entry['version'])
+
+
+def cache_profile(username, user_id, version, data):
+    cache.set(_response_key(username), {
+        'user_id': user_id,
+        'version': version,
+        'data': data,
+    }, settings.PROFILE_CACHE_TIMEOUT)
+
+
+def profile_etag(user_id, version):
+    return f'"profile-{user_id}-{version}"'
@@ -0,0 +1,101 @@
+# users/management/commands/benchmark_user_search.py
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from users.models import CustomUser
+from users.search import search_users
+
+SYLLABLES = ['an', 'ar', 'be', 'cha', 'da', 'el', 'fi', 'ga', 'ha', 'is', 'ja', 'ka', 'li',
+             'ma', 'na', 'or', 'pa', 'ra', 'sa', 'ta', 'ul', 'va', 'ya', 'za']
+
+
+class Command(BaseCommand):
+    help = ('Time users.search.search_users as the user table grows, for prefix, infix, '
+            'email and missing queries, and show whether PostgreSQL uses the trigram GIN '
+            'indexes from users migration 0005 or scans the table. Works on throwaway '
+            'rows inside a transaction that is rolled back.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000',
+                            help='Comma-separated user counts to measure at')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        self.random = random.Random(options['seed'])
+        self.repeat = options['repeat']
+        self.run = uuid.uuid4().hex[:8]
+
+        self.stdout.write(f"{'users':>9} {'kind':<16} {'query':<18} {'ms':>8} {'hits':>5}  plan")
+        with transaction.atomic():
+            created = 0
+            for size in sizes:
+                sample = self.make_users(created, size - created)
+                created = size
+                if connection.vendor == 'postgresql':
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'ANALYZE {CustomUser._meta.db_table}')
+                for label, query in self.queries(sample):
+                    self.measure(size, label, query)
+            transaction.set_rollback(True)
+
+    def make_name(self):
+        return ''.join(self.random.choice(SYLLABLES) for _ in range(self.random.randint(2, 4))).capitalize()
+
+    def make_users(self, start, count):
+        users = []
+        for i in range(start, start + count):
+            first, last = self.make_name(), self.make_name()
+            users.append(CustomUser(
+                username=f'{first.lower()}{self.random.randrange(1000)}-{self.run}-{i}',
+                email=f'{first.lower()}.{last.lower()}-{self.run}-{i}@example.invalid',
+                first_name=first,
+                last_name=last,
+            ))
+        CustomUser.objects.bulk_create(users, batch_size=5000)
+        return self.random.choice(users)
+
+    def queries(self, user):
+        """(label, query) pairs taken from an existing user, covering the
+        ranking's prefix match, the infix trigram path and a query nothing
+        matches"""
+        first, last = user.first_name.lower(), user.last_name.lower()
+        return [
+            ('username prefix', first[:4]),
+            ('last name infix', last[1:5]),
+            ('email', f'{first}.{last}'),
+            ('two letters', first[:2]),  # Shorter than a trigram
+            ('no match', 'qxzqxz'),
+        ]
+
+    def measure(self, size, label, query):
+        queryset = search_users(query)
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            hits = len(list(queryset.all()))
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f'{size:9,d} {label:<16} {query!r:<18} {statistics.median(timings):8.2f} {hits:5d}  '
+            f'{self.plan(queryset)}'
+        )
+
+    def plan(self, queryset):
+        """Which access path the search takes on the user table"""
+        if connection.vendor != 'postgresql':
+            return f'(EXPLAIN summary needs PostgreSQL, running on {connection.vendor})'
+        table = CustomUser._meta.db_table
+        scans = [
+            line.strip(' ->').split('  (')[0]
+            for line in queryset.explain().splitlines()
+            if ('Scan' in line and f' on {table}' in line) or '_trgm' in line
+        ]
+        if any(scan.startswith('Seq Scan') for scan in scans):
+            return self.style.ERROR('; '.join(scans))
+        return '; '.join(scans)
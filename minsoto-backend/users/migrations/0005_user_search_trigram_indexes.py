@@ -0,0 +1,35 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# icontains compiles to UPPER(col::text) LIKE UPPER('%q%') on PostgreSQL,
+# so the trigram indexes are built over the same expression.
+SEARCH_COLUMNS = ['username', 'first_name', 'last_name', 'email']
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS users_customuser_{column}_trgm '
+            f'ON users_customuser USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS users_customuser_{column}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_profile_interests_profile_show_circles_publicly_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -15,23 +15,17 @@ class CustomUser(AbstractUser):
     def get_connections(self, connection_type=None):
         """Get all connections for this user"""
         from connections.models import Connection
-        connections = Connection.objects.filter(
-            models.Q(user1=self) | models.Q(user2=self)
-        )
         if connection_type:
-            connections = connections.filter(connection_type=connection_type)
-        return connections
+            return Connection.objects.filter(edges__user=self, edges__connection_type=connection_type)
+        return Connection.objects.filter(edges__user=self)
     
     def get_connection_with(self, other_user):
         """Get connection with specific user if exists"""
+        from connections.graph import are_connected
         from connections.models import Connection
-        try:
-            return Connection.objects.get(
-                models.Q(user1=self, user2=other_user) | 
-                models.Q(user1=other_user, user2=self)
-            )
-        except Connection.DoesNotExist:
+        if not are_connected(self.id, other_user.id):
             return None
+        return Connection.objects.filter(**Connection.canonical_pair(self.id, other_user.id)).first()
 
 class Profile(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='profile')
@@ -76,14 +70,15 @@ class Profile(models.Model):
             return False
         
         # Check connection level
-        connection = self.user.get_connection_with(viewer)
-        if not connection:
+        from connections.graph import connection_type_between
+        connection_type = connection_type_between(self.user_id, viewer.id)
+        if not connection_type:
             return False
         
         if self.profile_visibility == 'connections':
             return True
         
         if self.profile_visibility == 'friends':
-            return connection.connection_type == 'friend'
+            return connection_type == 'friend'
         
         return False
@@ -0,0 +1,38 @@
+# users/projections.py
+from django.core.exceptions import ObjectDoesNotExist
+from rest_framework import serializers
+
+
+def project_profile(profile):
+    return {
+        'bio': profile.bio,
+        'profile_picture_url': profile.profile_picture_url,
+        'theme_color': profile.theme_color,
+        'widget_layout': profile.widget_layout,
+    }
+
+
+def project_public_user(user):
+    """PublicUserSerializer's output, read straight off the instance"""
+    try:
+        profile = project_profile(user.profile)
+    except ObjectDoesNotExist:
+        profile = None
+    return {
+        'id': user.id,
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'profile': profile,
+    }
+
+
+class PublicUserProjection(serializers.BaseSerializer):
+    """Read-only stand-in for PublicUserSerializer.
+
+    Projections skip the per-field machinery of nested ModelSerializers,
+    which dominates CPU on list pages; the output is identical.
+    """
+
+    def to_representation(self, user):
+        return project_public_user(user)
@@ -0,0 +1,44 @@
+# users/search.py
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from .models import CustomUser
+
+# Columns covered by the pg_trgm indexes from migration 0005
+SEARCH_FIELDS = ['username', 'first_name', 'last_name', 'email']
+
+
+def search_users(query, exclude_user=None, limit=10):
+    """Rank users matching `query` anywhere in their name, username or email.
+
+    Prefix matches on username come first. On PostgreSQL the icontains
+    filters are served by trigram GIN indexes and ties are broken by
+    trigram similarity; other databases (SQLite in tests) fall back to
+    ordering by username.
+    """
+    matches = Q()
+    for field in SEARCH_FIELDS:
+        matches |= Q(**{f'{field}__icontains': query})
+
+    queryset = CustomUser.objects.filter(matches).select_related('profile')
+    if exclude_user is not None:
+        queryset = queryset.exclude(id=exclude_user.id)
+
+    queryset = queryset.annotate(
+        prefix_match=Case(
+            When(username__istartswith=query, then=Value(2)),
+            When(Q(first_name__istartswith=query) | Q(last_name__istartswith=query), then=Value(1)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
+        from django.db.models.functions import Greatest
+        queryset = queryset.annotate(
+            similarity=Greatest(*(TrigramSimilarity(field, query) for field in SEARCH_FIELDS[:3]))
+        ).order_by('-prefix_match', '-similarity', 'username')
+    else:
+        queryset = queryset.order_by('-prefix_match', 'username')
+
+    return queryset[:limit]
@@ -1,5 +1,6 @@
 # users/signals.py
 from django.core.mail import send_mail
+from django.db import transaction
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
@@ -8,6 +9,7 @@ from django.conf import settings
 # CORRECT IMPORT: pre_social_login is from allauth, not django
 from allauth.socialaccount.signals import pre_social_login
 from allauth.socialaccount.models import SocialAccount
+from .cache import bump_profile_version
 from .models import CustomUser, Profile
 
 User = get_user_model()
@@ -36,6 +38,17 @@ def link_to_existing_user(sender, request, sociallogin, **kwargs):
         except Exception as e:
             print(f"Error linking social account: {str(e)}")
 
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Profile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    """Retire cached ProfileDetailView responses for this user.
+    
+    Bumped once the save commits: bumping earlier would let a reader take
+    the new version, load the old row and cache it as current.
+    """
+    user_id = instance.pk if sender is CustomUser else instance.user_id
+    transaction.on_commit(lambda: bump_profile_version(user_id))
+
 @receiver(post_save, sender=CustomUser)
 def handle_new_user_creation(sender, instance, created, **kwargs):
     """
@@ -7,13 +7,18 @@ from .models import CustomUser
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
-from .serializers import PublicUserSerializer, ProfileSerializer
+from .projections import PublicUserProjection, project_public_user
+from .serializers import ProfileSerializer
 from rest_framework import generics
 from .models import Profile
 from django.db import IntegrityError
 import logging
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from minsoto.conditional import ConditionalGetMixin
+from . import cache as profile_cache
+from . import search as user_search
 
 
 logger = logging.getLogger(__name__)
@@ -77,16 +82,42 @@ class SetUsernameView(APIView):
 
 # --- THIS VIEW FETCHES A PROFILE BY USERNAME ---
 class ProfileDetailView(generics.RetrieveAPIView):
-    queryset = CustomUser.objects.all()
-    serializer_class = PublicUserSerializer
+    queryset = CustomUser.objects.select_related('profile')
+    serializer_class = PublicUserProjection
     lookup_field = 'username' # Fetch user by username instead of ID
     permission_classes = [] # Allow any user (even unauthenticated) to view profiles
+    authentication_classes = [] # The response is the same for everyone, so skip the user lookup
+    
+    def retrieve(self, request, *args, **kwargs):
+        # Cached responses are keyed on username and checked against the
+        # user's profile version, so hits and 304s never touch the database
+        username = kwargs[self.lookup_field]
+        cached = profile_cache.get_cached_profile(username)
+        if cached is None:
+            # Read the version before the row: a save landing in between
+            # then leaves the entry under a version that is already stale
+            user_id = get_object_or_404(self.get_queryset().values_list('id', flat=True), username=username)
+            version = profile_cache.get_profile_version(user_id)
+            user = get_object_or_404(self.get_queryset(), pk=user_id)
+            data = self.get_serializer(user).data
+            profile_cache.cache_profile(username, user.id, version, data)
+            etag = profile_cache.profile_etag(user.id, version)
+        else:
+            data, etag = cached
+        
+        response = get_conditional_response(request, etag=etag, response=Response(data))
+        response['ETag'] = etag
+        return response
 
 # --- THIS VIEW LETS A LOGGED-IN USER UPDATE THEIR OWN PROFILE ---
-class MyProfileUpdateView(generics.RetrieveUpdateAPIView):
+class MyProfileUpdateView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated] # Only logged-in users can access
+    
+    def get_validator_versions(self):
+        # Bumped by every Profile save, see users/signals.py
+        return [profile_cache.get_profile_version(self.request.user.id)]
 
     def get_object(self):
         # This ensures users can only update their own profile
@@ -100,12 +131,7 @@ def search_users(request):
     if not query or len(query) < 2:
         return Response([])
     
-    users = CustomUser.objects.filter(
-        Q(username__icontains=query) | 
-        Q(first_name__icontains=query) | 
-        Q(last_name__icontains=query) |
-        Q(email__icontains=query)
-    ).exclude(id=request.user.id)[:10]  # Limit to 10 results
+    # Index-backed and ranked, see users/search.py
+    users = user_search.search_users(query, exclude_user=request.user, limit=10)
     
-    serializer = PublicUserSerializer(users, many=True, context={'request': request})
-    return Response(serializer.data)
+    return Response([project_public_user(user) for user in users])
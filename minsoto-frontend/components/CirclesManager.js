@@ -1,6 +1,6 @@
 // components/CirclesManager.js
 import { useState, useEffect } from 'react';
-import apiClient from '../lib/api';
+import apiClient, { fetchAllPages } from '../lib/api';
 import { useAuth } from '../context/AuthContext';
 
 const CirclesManager = () => {
@@ -22,8 +22,7 @@ const CirclesManager = () => {
 
     const fetchCircles = async () => {
         try {
-            const response = await apiClient.get('/circles/my-circles/');
-            setCircles(response.data);
+            setCircles(await fetchAllPages('/circles/my-circles/'));
         } catch (error) {
             console.error('Error fetching circles:', error);
         }
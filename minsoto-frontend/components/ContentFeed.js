@@ -5,6 +5,8 @@ import apiClient from '../lib/api';
 
 const ContentFeed = ({ feedType = 'global' }) => {
     const [posts, setPosts] = useState([]);
+    const [nextPage, setNextPage] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [loading, setLoading] = useState(true);
     const [filter, setFilter] = useState('all');
     const { user } = useAuth();
@@ -21,7 +23,8 @@ const ContentFeed = ({ feedType = 'global' }) => {
             });
             
             const response = await apiClient.get(`/content/feed/?${params}`);
-            setPosts(response.data);
+            setPosts(response.data.results);
+            setNextPage(response.data.next);
         } catch (error) {
             console.error('Error fetching posts:', error);
         } finally {
@@ -29,6 +32,20 @@ const ContentFeed = ({ feedType = 'global' }) => {
         }
     };
 
+    // A page can come back short, even empty, and still have a next one
+    const loadMore = async () => {
+        try {
+            setLoadingMore(true);
+            const response = await apiClient.get(nextPage);
+            setPosts(current => current.concat(response.data.results));
+            setNextPage(response.data.next);
+        } catch (error) {
+            console.error('Error fetching more posts:', error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleLike = async (postId) => {
         try {
             await apiClient.post(`/content/posts/${postId}/like/`);
@@ -135,6 +152,16 @@ const ContentFeed = ({ feedType = 'global' }) => {
                     </div>
                 ))}
             </div>
+
+            {nextPage && (
+                <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    className="w-full px-4 py-2 rounded bg-gray-200 hover:bg-gray-300 disabled:opacity-50"
+                >
+                    {loadingMore ? 'Loading...' : 'Load more'}
+                </button>
+            )}
         </div>
     );
 };
@@ -1,9 +1,15 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useAuth } from '../context/AuthContext';
-import apiClient from '../lib/api';
+import apiClient, { fetchAllPages } from '../lib/api';
+import { useNotifications } from '../lib/hooks/useNotifications';
+
+// New posts often arrive in bursts; wait this long for the burst to end
+const NEW_POST_REFETCH_DELAY_MS = 2000;
 
 const EnhancedContentFeed = ({ feedType = 'global' }) => {
   const [posts, setPosts] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState('all');
   const [interests, setInterests] = useState([]);
@@ -15,12 +21,30 @@ const EnhancedContentFeed = ({ feedType = 'global' }) => {
   });
   const [showCreatePost, setShowCreatePost] = useState(false);
   const { user } = useAuth();
+  const refetchTimer = useRef(null);
 
   useEffect(() => {
     fetchPosts();
     fetchInterests();
   }, [feedType, filter]);
 
+  useEffect(() => () => clearTimeout(refetchTimer.current), []);
+
+  // Likes on our posts carry the new count, so only that post changes;
+  // new posts from connections refetch the feed once per burst
+  useNotifications(['post', 'like'], (event) => {
+    if (event.type === 'like') {
+      updatePost(event.data.post_id, { likes_count: event.data.likes_count });
+      return;
+    }
+    clearTimeout(refetchTimer.current);
+    refetchTimer.current = setTimeout(fetchPosts, NEW_POST_REFETCH_DELAY_MS);
+  });
+
+  const updatePost = (postId, changes) => {
+    setPosts(current => current.map(post => (post.id === postId ? { ...post, ...changes } : post)));
+  };
+
   const fetchPosts = async () => {
     try {
       const params = new URLSearchParams({
@@ -28,7 +52,8 @@ const EnhancedContentFeed = ({ feedType = 'global' }) => {
         filter: filter
       });
       const response = await apiClient.get(`/content/feed/?${params}`);
-      setPosts(response.data);
+      setPosts(response.data.results);
+      setNextPage(response.data.next);
     } catch (error) {
       console.error('Error fetching posts:', error);
     } finally {
@@ -36,10 +61,23 @@ const EnhancedContentFeed = ({ feedType = 'global' }) => {
     }
   };
 
+  // A page can come back short, even empty, and still have a next one
+  const loadMore = async () => {
+    try {
+      setLoadingMore(true);
+      const response = await apiClient.get(nextPage);
+      setPosts(current => current.concat(response.data.results));
+      setNextPage(response.data.next);
+    } catch (error) {
+      console.error('Error fetching more posts:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const fetchInterests = async () => {
     try {
-      const response = await apiClient.get('/connections/interests/');
-      setInterests(response.data);
+      setInterests(await fetchAllPages('/connections/interests/'));
     } catch (error) {
       console.error('Error fetching interests:', error);
     }
@@ -64,8 +102,8 @@ const EnhancedContentFeed = ({ feedType = 'global' }) => {
 
   const handleLike = async (postId) => {
     try {
-      await apiClient.post(`/content/posts/${postId}/like/`);
-      fetchPosts();
+      const response = await apiClient.post(`/content/posts/${postId}/like/`);
+      updatePost(postId, { is_liked: response.data.liked, likes_count: response.data.likes_count });
     } catch (error) {
       console.error('Error liking post:', error);
     }
@@ -220,6 +258,16 @@ const EnhancedContentFeed = ({ feedType = 'global' }) => {
           </div>
         </div>
       ))}
+
+      {nextPage && (
+        <button
+          onClick={loadMore}
+          disabled={loadingMore}
+          className="w-full bg-gray-200 px-4 py-2 rounded hover:bg-gray-300 disabled:opacity-50"
+        >
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
     </div>
   );
 };
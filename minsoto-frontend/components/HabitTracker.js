@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import apiClient from '../lib/api';
+import apiClient, { fetchAllPages } from '../lib/api';
 
 const HabitTracker = () => {
   const [habits, setHabits] = useState([]);
@@ -16,8 +16,7 @@ const HabitTracker = () => {
 
   const fetchHabits = async () => {
     try {
-      const response = await apiClient.get('/circles/habits/');
-      setHabits(response.data);
+      setHabits(await fetchAllPages('/circles/habits/'));
     } catch (error) {
       console.error('Error fetching habits:', error);
     }
@@ -62,4 +62,17 @@ apiClient.interceptors.response.use(
   }
 );
 
+// List endpoints return one page at a time ({ next, results }); this follows
+// `next` for lists the UI shows in full, such as interests or habits
+export const fetchAllPages = async (url) => {
+  let results = [];
+  let next = url;
+  while (next) {
+    const response = await apiClient.get(next);
+    results = results.concat(response.data.results);
+    next = response.data.next;
+  }
+  return results;
+};
+
 export default apiClient;
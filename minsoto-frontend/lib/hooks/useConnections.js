@@ -1,6 +1,7 @@
 // lib/hooks/useConnections.js
 import { useState, useEffect } from 'react';
-import apiClient from '../api';
+import apiClient, { fetchAllPages } from '../api';
+import { useNotifications } from './useNotifications';
 
 export const useConnections = () => {
   const [connections, setConnections] = useState([]);
@@ -11,13 +12,13 @@ export const useConnections = () => {
   const fetchConnections = async () => {
     try {
       setLoading(true);
-      const [connectionsRes, requestsRes] = await Promise.all([
-        apiClient.get('/connections/my-connections/'),
-        apiClient.get('/connections/requests/')
+      const [allConnections, allRequests] = await Promise.all([
+        fetchAllPages('/connections/my-connections/'),
+        fetchAllPages('/connections/requests/')
       ]);
       
-      setConnections(connectionsRes.data);
-      setRequests(requestsRes.data);
+      setConnections(allConnections);
+      setRequests(allRequests);
       setError(null);
     } catch (err) {
       setError('Failed to fetch connections');
@@ -63,6 +64,9 @@ export const useConnections = () => {
     fetchConnections();
   }, []);
 
+  // Pushed instead of polled, see notifications/ in the backend
+  useNotifications(['connection_request', 'connection_response'], () => fetchConnections());
+
   return {
     connections,
     requests,
@@ -1,6 +1,6 @@
 // lib/hooks/useHabits.js
 import { useState, useEffect } from 'react';
-import apiClient from '../api';
+import apiClient, { fetchAllPages } from '../api';
 
 export const useHabits = () => {
   const [habits, setHabits] = useState([]);
@@ -10,8 +10,7 @@ export const useHabits = () => {
   const fetchHabits = async () => {
     try {
       setLoading(true);
-      const response = await apiClient.get('/circles/habits/');
-      setHabits(response.data);
+      setHabits(await fetchAllPages('/circles/habits/'));
       setError(null);
     } catch (err) {
       setError('Failed to fetch habits');
@@ -53,6 +52,21 @@ export const useHabits = () => {
     }
   };
 
+  const bulkCheckIn = async (entries) => {
+    try {
+      // entries: [{ habit_id, date, completed, notes }]
+      const response = await apiClient.post('/circles/habits/check-in/', { entries });
+      
+      const updated = Object.fromEntries(response.data.habits.map(habit => [habit.id, habit]));
+      setHabits(prev => prev.map(habit => updated[habit.id] || habit));
+      
+      return response.data;
+    } catch (err) {
+      console.error('Error checking in habits:', err);
+      throw err;
+    }
+  };
+
   const updateHabit = async (habitId, habitData) => {
     try {
       const response = await apiClient.patch(`/circles/habits/${habitId}/`, habitData);
@@ -87,6 +101,7 @@ export const useHabits = () => {
     fetchHabits,
     createHabit,
     markHabitComplete,
+    bulkCheckIn,
     updateHabit,
     deleteHabit
   };
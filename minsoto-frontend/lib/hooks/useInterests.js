@@ -1,6 +1,6 @@
 // lib/hooks/useInterests.js
 import { useState, useEffect } from 'react';
-import apiClient from '../api';
+import apiClient, { fetchAllPages } from '../api';
 
 export const useInterests = () => {
   const [interests, setInterests] = useState([]);
@@ -10,8 +10,7 @@ export const useInterests = () => {
   const fetchInterests = async () => {
     try {
       setLoading(true);
-      const response = await apiClient.get('/connections/interests/');
-      setInterests(response.data);
+      setInterests(await fetchAllPages('/connections/interests/'));
       setError(null);
     } catch (err) {
       setError('Failed to fetch interests');
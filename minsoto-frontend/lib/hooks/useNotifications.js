@@ -0,0 +1,80 @@
+// lib/hooks/useNotifications.js
+import { useEffect, useRef } from 'react';
+import apiClient from '../api';
+
+// One EventSource per tab, shared by every component listening
+const listeners = new Set();
+let source = null;
+let connecting = false;
+let reconnectTimer = null;
+
+const RECONNECT_DELAY_MS = 5000;
+
+const scheduleReconnect = () => {
+  clearTimeout(reconnectTimer);
+  reconnectTimer = setTimeout(() => listeners.size && connect(), RECONNECT_DELAY_MS);
+};
+
+// EventSource cannot send the Authorization header, so the stream is opened
+// with a short-lived single-use ticket instead of the access token
+const connect = async () => {
+  if (source || connecting || !localStorage.getItem('accessToken')) return;
+
+  connecting = true;
+  let ticket;
+  try {
+    // apiClient refreshes an expired access token on the way
+    const response = await apiClient.post('/notifications/ticket/');
+    ticket = response.data.ticket;
+  } catch (error) {
+    console.error('Error fetching stream ticket:', error);
+    scheduleReconnect();
+    return;
+  } finally {
+    connecting = false;
+  }
+  if (!listeners.size || source) return;
+
+  const stream = new EventSource(`${apiClient.defaults.baseURL}/notifications/stream/?ticket=${encodeURIComponent(ticket)}`);
+  source = stream;
+  stream.onmessage = (message) => {
+    const event = JSON.parse(message.data);
+    listeners.forEach(listener => listener(event));
+  };
+  stream.onerror = () => {
+    // The ticket was used up when the stream opened, so EventSource's own
+    // retry would be rejected; reconnect with a fresh ticket instead
+    stream.close();
+    if (source === stream) {
+      source = null;
+      scheduleReconnect();
+    }
+  };
+};
+
+const disconnect = () => {
+  clearTimeout(reconnectTimer);
+  if (source) {
+    source.close();
+    source = null;
+  }
+};
+
+// Calls onEvent({ type, data }) for pushed events whose type is in `types`
+export const useNotifications = (types, onEvent) => {
+  const handlerRef = useRef(onEvent);
+  handlerRef.current = onEvent;
+
+  useEffect(() => {
+    const listener = (event) => {
+      if (types.includes(event.type)) handlerRef.current(event);
+    };
+    listeners.add(listener);
+    connect();
+
+    return () => {
+      listeners.delete(listener);
+      if (listeners.size === 0) disconnect();
+    };
+  }, [types.join(',')]);
+};